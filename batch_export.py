@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Export a folder of .vtf worksheets to plain formats in parallel
+
+Each worker process loads one worksheet, writes every requested format and
+moves on, so at most one grid per worker is in memory. Runs without a
+display, mixer or screen reader.
+
+    python batch_export.py homework/ --output exported/ --formats txt,csv
+"""
+
+import argparse
+import csv
+import io
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+import vtf_format
+
+
+def export_txt(grid, cursor):
+    # Same text as Ctrl+E in the app
+    return "\n".join(vtf_format.grid_to_text_lines(grid)).encode("utf-8")
+
+
+def export_csv(grid, cursor):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for line in vtf_format.grid_to_text_lines(grid):
+        writer.writerow(list(line))
+    return buffer.getvalue().encode("utf-8")
+
+
+def export_json(grid, cursor):
+    # Version 1 JSON, readable by older releases
+    return vtf_format.encode_v1(grid, cursor)
+
+
+EXPORTERS = {
+    "txt": export_txt,
+    "csv": export_csv,
+    "json": export_json,
+}
+
+
+def find_worksheets(folder, recursive=False):
+    """Yield .vtf paths lazily so huge folders are never listed in full"""
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.is_dir() and recursive:
+                yield from find_worksheets(entry.path, recursive)
+            elif entry.is_file() and entry.name.lower().endswith(".vtf"):
+                yield entry.path
+
+
+def export_one(job):
+    """Worker: load one worksheet and write each format next to the output base.
+    Under output_dir, subfolders of folder are recreated so names never collide."""
+    path, folder, output_dir, formats = job
+    try:
+        grid, cursor = vtf_format.read_vtf(path)
+        directory = os.path.dirname(path)
+        if output_dir:
+            directory = os.path.normpath(os.path.join(output_dir, os.path.relpath(directory, folder)))
+            os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, os.path.splitext(os.path.basename(path))[0])
+        written = 0
+        for name in formats:
+            data = EXPORTERS[name](grid, cursor)
+            with open(f"{base}.{name}", "wb") as f:
+                f.write(data)
+            written += len(data)
+        return path, grid.size, written, None
+    except Exception as e:
+        return path, 0, 0, str(e)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export .vtf worksheets to plain formats")
+    parser.add_argument("folder", help="folder containing .vtf files")
+    parser.add_argument("--output", help="folder for exported files, keeping subfolders "
+                                         "(defaults to next to each .vtf)")
+    parser.add_argument("--formats", default="txt", help=f"comma-separated: {', '.join(EXPORTERS)}")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--recursive", action="store_true", help="include subfolders")
+    args = parser.parse_args(argv)
+
+    formats = [name.strip() for name in args.formats.split(",") if name.strip()]
+    unknown = [name for name in formats if name not in EXPORTERS]
+    if unknown:
+        parser.error(f"unknown format: {', '.join(unknown)}")
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+
+    jobs = ((path, args.folder, args.output, formats) for path in find_worksheets(args.folder, args.recursive))
+    exported = failed = cells = written = 0
+    start = time.perf_counter()
+    with Pool(args.workers) as pool:
+        for path, size, nbytes, error in pool.imap_unordered(export_one, jobs, chunksize=8):
+            if error:
+                failed += 1
+                print(f"Failed: {path}: {error}", file=sys.stderr)
+            else:
+                exported += 1
+                cells += size
+                written += nbytes
+    elapsed = time.perf_counter() - start
+
+    rate = exported / elapsed if elapsed else 0.0
+    print(f"Exported {exported} worksheets ({failed} failed) in {elapsed:.2f} s "
+          f"with {args.workers} workers: {rate:.1f} files/s, "
+          f"{cells / elapsed / 1e6 if elapsed else 0:.2f} M cells/s, {written / 1e6:.2f} MB written")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    exit(main())
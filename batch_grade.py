@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Grade a folder of saved worksheets against a tutorial in parallel
+
+Each .vtf file is one student's homework (the file name is the student).
+Every challenge of the chosen tutorial is looked up on the worksheet with
+the same answer-finding logic as Ctrl+Enter in Tutorial Mode. Needs no
+display, mixer or screen reader.
+
+    python batch_grade.py homework/ --tutorial "Two Digit Addition" --report grades.csv
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+import vtf_format
+from batch_export import find_worksheets
+from tutorial_system import TutorialLibrary
+
+
+_tutorial = None
+
+
+def find_tutorial(library, name):
+    """Look a tutorial up by its 1-based number or its title"""
+    tutorials = library.get_all_tutorials()
+    if name.isdigit():
+        return library.get_tutorial(int(name) - 1)
+    for tutorial in tutorials:
+        if tutorial.title.lower() == name.strip().lower():
+            return tutorial
+    return None
+
+
+def _init_worker(name):
+    global _tutorial
+    _tutorial = find_tutorial(TutorialLibrary(), name)
+
+
+def grade_one(path):
+    """Worker: which challenges of the tutorial are answered on this worksheet"""
+    student = os.path.splitext(os.path.basename(path))[0]
+    try:
+        grid, _ = vtf_format.read_vtf(path)
+    except Exception as e:
+        return {"student": student, "file": path, "error": str(e)}
+    rows = vtf_format.grid_to_row_strings(grid)
+    answers = [challenge.find_in_rows(rows) is not None for challenge in _tutorial.challenges]
+    return {
+        "student": student,
+        "file": path,
+        "correct": sum(answers),
+        "total": len(answers),
+        "answers": answers,
+    }
+
+
+def write_report(results, path):
+    if path.lower().endswith(".json"):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        return
+    challenge_count = max((r["total"] for r in results if "total" in r), default=0)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["student", "file", "correct", "total"]
+                        + [f"challenge {i + 1}" for i in range(challenge_count)] + ["error"])
+        for r in results:
+            if "error" in r:
+                writer.writerow([r["student"], r["file"], "", ""] + [""] * challenge_count + [r["error"]])
+            else:
+                writer.writerow([r["student"], r["file"], r["correct"], r["total"]]
+                                + ["yes" if a else "no" for a in r["answers"]] + [""])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Grade .vtf worksheets against a tutorial")
+    parser.add_argument("folder", nargs="?", help="folder containing .vtf files")
+    parser.add_argument("--tutorial", help="tutorial number (1-9) or title")
+    parser.add_argument("--report", default="grades.csv", help="report file (.csv or .json)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--recursive", action="store_true", help="include subfolders")
+    parser.add_argument("--list", action="store_true", help="list the tutorials and exit")
+    args = parser.parse_args(argv)
+
+    library = TutorialLibrary()
+    if args.list:
+        for i, tutorial in enumerate(library.get_all_tutorials(), 1):
+            print(f"{i}. {tutorial.title} ({tutorial.difficulty})")
+        return 0
+    if not args.folder or not args.tutorial:
+        parser.error("a folder and --tutorial are required")
+    tutorial = find_tutorial(library, args.tutorial)
+    if tutorial is None:
+        parser.error(f"no tutorial named {args.tutorial!r}; use --list")
+
+    start = time.perf_counter()
+    with Pool(args.workers, initializer=_init_worker, initargs=(args.tutorial,)) as pool:
+        results = list(pool.imap_unordered(grade_one, find_worksheets(args.folder, args.recursive), chunksize=16))
+    elapsed = time.perf_counter() - start
+    results.sort(key=lambda r: (r["student"], r["file"]))
+    write_report(results, args.report)
+
+    failed = [r for r in results if "error" in r]
+    for r in failed:
+        print(f"Failed: {r['file']}: {r['error']}", file=sys.stderr)
+    print(f"Graded {len(results) - len(failed)} worksheets against '{tutorial.title}' "
+          f"in {elapsed:.2f} s ({len(failed)} failed); report written to {args.report}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    exit(main())
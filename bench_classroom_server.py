@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Benchmark: how many classroom sessions one core can serve
+
+Starts classroom_server.py in a subprocess pinned to one CPU, then opens an
+increasing number of scripted client sessions that type at a steady rate.
+Reports keystroke round-trip latency per session count and the largest
+count whose p99 stays under the target.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import pygame
+
+# One scripted exercise: type an expression, evaluate it, look around, erase
+SCRIPT = (
+    [(ord(ch), ch) for ch in "12+34"]
+    + [("ctrl-down",), (pygame.K_RETURN, "\r"), ("ctrl-up",)]
+    + [(pygame.K_LEFT, ""), (pygame.K_LEFT, ""), (pygame.K_DOWN, ""), (pygame.K_UP, "")]
+    + [(pygame.K_BACKSPACE, "\b")]
+)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_client(port, keys_per_second, duration, latencies, student):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(json.dumps({"type": "hello", "student": student, "menu": False}).encode() + b"\n")
+    await writer.drain()
+    await reader.readline()
+
+    interval = 1.0 / keys_per_second
+    # Stagger sessions so they do not all type in lock-step
+    await asyncio.sleep(random.random() * interval)
+    deadline = time.perf_counter() + duration
+    seq = 0
+    step = 0
+    while time.perf_counter() < deadline:
+        entry = SCRIPT[step % len(SCRIPT)]
+        step += 1
+        seq += 1
+        if entry[0] == "ctrl-down":
+            message = {"type": "keydown", "seq": seq, "key": pygame.K_LCTRL, "unicode": ""}
+        elif entry[0] == "ctrl-up":
+            message = {"type": "keyup", "seq": seq, "key": pygame.K_LCTRL}
+        else:
+            message = {"type": "keydown", "seq": seq, "key": entry[0], "unicode": entry[1]}
+        sent = time.perf_counter()
+        writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+        await writer.drain()
+        await reader.readline()
+        latencies.append((time.perf_counter() - sent) * 1000)
+        await asyncio.sleep(max(0.0, interval - (time.perf_counter() - sent)))
+
+    writer.close()
+
+
+async def measure(port, sessions, keys_per_second, duration):
+    latencies = []
+    await asyncio.gather(*[
+        run_client(port, keys_per_second, duration, latencies, f"bench{i}")
+        for i in range(sessions)
+    ])
+    return latencies
+
+
+def start_server(db_path):
+    command = [sys.executable, "classroom_server.py", "--port", "0", "--db", db_path]
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, text=True, env=env,
+                              cwd=os.path.dirname(os.path.abspath(__file__)))
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(server.pid, {min(os.sched_getaffinity(0))})
+    line = server.stdout.readline()
+    if not line.startswith("Listening on"):
+        server.kill()
+        raise RuntimeError(f"Server did not start: {line!r}")
+    return server, int(line.rsplit(":", 1)[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", default="10,30,60,120,240", help="comma-separated session counts")
+    parser.add_argument("--rate", type=float, default=5.0, help="keystrokes per second per session")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per step")
+    parser.add_argument("--target-ms", type=float, default=20.0, help="p99 latency target")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server, port = start_server(os.path.join(tmp, "progress.db"))
+        results = []
+        try:
+            print(f"{'Sessions':>8} {'Keys':>7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+            for count in [int(n) for n in args.sessions.split(",")]:
+                latencies = asyncio.run(measure(port, count, args.rate, args.duration))
+                row = {
+                    "sessions": count,
+                    "keystrokes": len(latencies),
+                    "p50_ms": percentile(latencies, 50),
+                    "p99_ms": percentile(latencies, 99),
+                    "max_ms": max(latencies),
+                }
+                results.append(row)
+                print(f"{count:>8} {row['keystrokes']:>7} {row['p50_ms']:>8.2f} {row['p99_ms']:>8.2f} {row['max_ms']:>8.2f}")
+        finally:
+            server.terminate()
+            server.wait()
+
+    within = [r["sessions"] for r in results if r["p99_ms"] < args.target_ms]
+    if within:
+        print(f"\nUp to {max(within)} sessions on one core with p99 under {args.target_ms:.0f} ms")
+    else:
+        print(f"\nNo session count met the {args.target_ms:.0f} ms p99 target")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"target_ms": args.target_ms, "rate": args.rate, "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
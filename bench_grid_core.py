@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""Benchmark: the grid core operations across grid sizes and fill densities
+
+Times draw, move, snap_to_content, move_to_next_content_row, read_content_stack,
+evaluate_row, check_tutorial_answer, _apply_loaded_state, save and load on
+grids from 18x25 up to 1000x1000. Runs under the SDL dummy drivers, so no
+window or sound card is needed. draw renders to an off-screen surface the
+size of a typical screen; every cell is still visited.
+
+Results can be saved as a baseline and later runs compared against it; any
+operation slower than the baseline by more than the tolerance is listed and
+the script exits with status 1.
+
+    python bench_grid_core.py --save-baseline bench_grid_core_baseline.json
+    python bench_grid_core.py
+
+The stored bench_grid_core_baseline.json is used by default when present.
+"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+
+import pygame
+
+import vtf_format
+from bench_vtf_format import make_worksheet
+from progress_store import ProgressStore
+from tutorial_system import TutorialLibrary
+from virtual_taylor_frame import VirtualTaylorFrame
+
+
+SIZES = [(18, 25), (100, 100), (250, 250), (1000, 1000)]
+DENSITIES = [0.05, 0.3, 0.8]
+VIEWPORT = (1920, 1080)
+TIME_BUDGET = 1.0  # seconds spent repeating one measurement at most
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_grid_core_baseline.json")
+
+
+def make_frame(rows, cols, progress):
+    frame = VirtualTaylorFrame(rows, cols, headless=True, output=lambda kind, value: None,
+                               progress=progress)
+    frame.screen = pygame.Surface((min(cols * frame.cell_size, VIEWPORT[0]),
+                                   min(rows * frame.cell_size, VIEWPORT[1])))
+    frame.font = pygame.font.Font(None, 36)
+    return frame
+
+
+def operations(frame, grid, folder):
+    """(name, setup, run) for every measured operation on this grid"""
+    rows, cols = grid.shape
+    middle = rows // 2
+    content_rows = [y for y in range(middle, rows) if grid[y].tolist() != [' '] * cols]
+    content_row = content_rows[0] if content_rows else middle
+    tutorial = TutorialLibrary().get_tutorial(3)
+    save_base = os.path.join(folder, "bench")
+
+    def at(x, y):
+        def setup():
+            frame.model.move_to(x, y)
+        return setup
+
+    def setup_expression():
+        # Through the model, so the row caches evaluate_row reads are kept current
+        frame.model.paste(["12 + 34".ljust(cols)[:cols]], 0, middle)
+        frame.model.move_to(0, middle)
+
+    def setup_tutorial():
+        frame.current_tutorial = tutorial
+        frame.awaiting_tutorial_answer = True
+        challenge = tutorial.get_current_challenge()
+        challenge.attempts = 0
+        challenge.hints_used = 0
+
+    def save():
+        frame._save_to_path(save_base)
+
+    def load():
+        frame._load_from_path(save_base)
+
+    return [
+        ("draw", at(0, 0), frame.draw),
+        ("move", at(0, 0), lambda: frame.move(1, 0)),
+        ("snap_to_content", at(cols // 2, 0), lambda: frame.snap_to_content(0, 1)),
+        ("move_to_next_content_row", at(0, 0), lambda: frame.move_to_next_content_row(1)),
+        ("read_content_stack", at(0, content_row), frame.read_content_stack),
+        ("evaluate_row", setup_expression, frame.evaluate_row),
+        ("check_tutorial_answer", setup_tutorial, frame.check_tutorial_answer),
+        ("apply_loaded_state", None, lambda: frame._apply_loaded_state(grid.copy(), (0, 0))),
+        ("save", None, save),
+        ("load", None, load),
+    ]
+
+
+def measure(setup, run, repeat):
+    """Best time in milliseconds over up to `repeat` runs within the time budget"""
+    best = float("inf")
+    spent = 0.0
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        spent += elapsed
+        if spent > TIME_BUDGET:
+            break
+    return best * 1000
+
+
+def calibrate():
+    """Time a fixed workload so baselines from a slower or busier machine still compare"""
+    grid = make_worksheet(200, 200, 0.3)
+
+    def workload():
+        total = 0
+        for y in range(grid.shape[0]):
+            total += len("".join(grid[y]).strip())
+        return total
+
+    return measure(None, workload, 20)
+
+
+def result_key(result):
+    return result["op"], result["rows"], result["cols"], result["density"]
+
+
+def compare(results, baseline, tolerance, min_ms, scale=1.0):
+    """Return the results that are slower than the baseline allows
+
+    Baseline times are multiplied by scale, the ratio of this machine's
+    calibration time to the baseline's.
+    """
+    previous = {result_key(r): r["ms"] for r in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        before = previous.get(result_key(result))
+        if before is None:
+            continue
+        before *= scale
+        if result["ms"] > before * (1 + tolerance) and result["ms"] - before > min_ms:
+            regressions.append((result, before))
+    return regressions
+
+
+def parse_sizes(text):
+    return [tuple(int(n) for n in size.split("x")) for size in text.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=parse_sizes, default=SIZES, help="e.g. 18x25,100x100")
+    parser.add_argument("--densities", type=lambda t: [float(d) for d in t.split(",")], default=DENSITIES)
+    parser.add_argument("--ops", help="comma-separated operations to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE if os.path.exists(DEFAULT_BASELINE) else None,
+                        help="fail if slower than the results in this file")
+    parser.add_argument("--save-baseline", help="write results as a new baseline")
+    parser.add_argument("--tolerance", type=float, default=1.0, help="allowed slowdown as a fraction")
+    parser.add_argument("--min-ms", type=float, default=0.05, help="ignore slowdowns smaller than this")
+    args = parser.parse_args(argv)
+
+    pygame.display.init()
+    pygame.font.init()
+    selected = set(args.ops.split(",")) if args.ops else None
+    progress = ProgressStore(":memory:")
+    results = []
+    header = f"{'Grid':>10} {'Fill':>5} {'Operation':>26} {'ms':>10}"
+    print(header)
+    print("-" * len(header))
+    with tempfile.TemporaryDirectory() as folder:
+        for rows, cols in args.sizes:
+            for density in args.densities:
+                grid = make_worksheet(rows, cols, density)
+                frame = make_frame(rows, cols, progress)
+                for name, setup, run in operations(frame, grid, folder):
+                    if selected and name not in selected:
+                        continue
+                    frame._apply_loaded_state(grid.copy(), (0, 0))
+                    ms = measure(setup, run, args.repeat)
+                    results.append({"op": name, "rows": rows, "cols": cols, "density": density, "ms": ms})
+                    print(f"{rows:>4}x{cols:<5} {density:>5.2f} {name:>26} {ms:>10.3f}")
+                frame.io_worker.shutdown(wait=True)
+    progress.close()
+
+    calibration = calibrate()
+    report = {"python": sys.version.split()[0], "calibration_ms": calibration, "results": results}
+    for path in (args.json, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        scale = calibration / baseline["calibration_ms"] if baseline.get("calibration_ms") else 1.0
+        regressions = compare(results, baseline, args.tolerance, args.min_ms, scale)
+        if regressions:
+            print(f"\nREGRESSIONS against {args.baseline} "
+                  f"(tolerance {args.tolerance:.0%}, machine speed scale {scale:.2f}):")
+            for result, before in regressions:
+                print(f"  {result['op']} {result['rows']}x{result['cols']} fill {result['density']}: "
+                      f"{before:.3f} ms -> {result['ms']:.3f} ms")
+            return 1
+        print(f"\nNo regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Benchmark: mirror traffic and publisher time per edit across grid sizes
+
+Types single characters into worksheets from 18x25 up to 1000x1000 with a
+viewer connected, flushing after each one as the UI loop does, and reports
+bytes sent and publisher time per edit next to the size of one snapshot.
+No window or sound card is needed.
+"""
+
+import argparse
+import json
+import threading
+import time
+
+from bench_vtf_format import make_worksheet
+from grid_model import GridModel
+from mirror import MirrorPublisher, connect, encode_message, snapshot_message
+
+
+SIZES = [(18, 25), (100, 100), (250, 250), (500, 500), (1000, 1000)]
+
+
+def run(rows, cols, edits):
+    model = GridModel(rows, cols)
+    model.load(make_worksheet(rows, cols, 0.3), (0, 0))
+    publisher = MirrorPublisher(model, port=0)
+    publisher.flush()
+    sock, lines = connect(*publisher.address)
+    received = []
+    reader = threading.Thread(target=lambda: received.extend(lines), daemon=True)
+    reader.start()
+    while publisher.viewer_count < 1:
+        time.sleep(0.001)
+
+    start = time.perf_counter()
+    for i in range(edits):
+        model.move_to(i % cols, (i // cols) % rows)
+        model.write_at_cursor(str(i % 10))
+        publisher.flush()
+    elapsed = time.perf_counter() - start
+    publisher.close()
+    reader.join()
+    sock.close()
+
+    snapshot_bytes = len(encode_message(snapshot_message(model.grid, (0, 0))))
+    delta_bytes = sum(len(line) for line in received[1:-1])
+    return {"rows": rows, "cols": cols, "edits": edits, "snapshot_bytes": snapshot_bytes,
+            "bytes_per_edit": delta_bytes / edits, "us_per_edit": elapsed / edits * 1e6}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--edits", type=int, default=2000)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    results = []
+    header = f"{'Size':>10} {'Snapshot B':>11} {'B/edit':>8} {'us/edit':>8}"
+    print(header)
+    print("-" * len(header))
+    for rows, cols in SIZES:
+        result = run(rows, cols, args.edits)
+        results.append(result)
+        print(f"{rows:>4}x{cols:<5} {result['snapshot_bytes']:>11} {result['bytes_per_edit']:>8.1f} "
+              f"{result['us_per_edit']:>8.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"edits": args.edits, "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Benchmark: repeated grow/shrink cycles of a content-preserving resize
+
+Each cycle grows a worksheet one step at a time from its start size to the
+largest size and shrinks it back. "copy" reallocates the grid and copies the
+overlapping block on every resize; "model" is GridModel.resize, which grows
+inside a spare-capacity buffer and only reallocates now and then. Both are
+checked to keep the same content. No window or sound card is needed.
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+import vtf_format
+from bench_vtf_format import make_worksheet
+from grid_model import GridModel
+
+
+STARTS = [(18, 25), (100, 100), (250, 250)]
+
+
+def copy_resize(grid, rows, cols):
+    """Resize by allocating a new grid and copying what fits"""
+    resized = vtf_format.new_grid(rows, cols)
+    keep_rows, keep_cols = min(rows, grid.shape[0]), min(cols, grid.shape[1])
+    resized[:keep_rows, :keep_cols] = grid[:keep_rows, :keep_cols]
+    return resized
+
+
+def cycle_sizes(rows, cols, steps, step_rows, step_cols):
+    grow = [(rows + i * step_rows, cols + i * step_cols) for i in range(1, steps + 1)]
+    return grow + grow[-2::-1] + [(rows, cols)]
+
+
+def run(start, steps, cycles, step_rows, step_cols):
+    rows, cols = start
+    sizes = cycle_sizes(rows, cols, steps, step_rows, step_cols) * cycles
+    worksheet = make_worksheet(rows, cols, 0.3)
+
+    grid = worksheet.copy()
+    timings = {"copy": [], "model": []}
+    for size in sizes:
+        began = time.perf_counter()
+        grid = copy_resize(grid, *size)
+        timings["copy"].append(time.perf_counter() - began)
+
+    model = GridModel(rows, cols)
+    model.load(worksheet.copy(), (0, 0))
+    for size in sizes:
+        began = time.perf_counter()
+        model.resize(*size)
+        timings["model"].append(time.perf_counter() - began)
+
+    assert np.array_equal(grid, model.grid) and np.array_equal(model.grid, worksheet), "Content was lost"
+    return {name: summarize(times) for name, times in timings.items()}, len(sizes)
+
+
+def summarize(times):
+    times = sorted(times)
+    return {
+        "total_ms": sum(times) * 1000,
+        "mean_us": sum(times) / len(times) * 1e6,
+        "p99_us": times[min(len(times) - 1, int(0.99 * len(times)))] * 1e6,
+        "max_us": times[-1] * 1e6,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=100, help="resizes on the way up in each cycle")
+    parser.add_argument("--step", default="2x2", help="rows x cols added per step")
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args(argv)
+    step_rows, step_cols = (int(n) for n in args.step.split("x"))
+
+    results = []
+    header = f"{'Start':>10} {'Method':>6} {'Resizes':>8} {'Total ms':>10} {'Mean us':>9} {'p99 us':>9} {'Max us':>9}"
+    print(header)
+    print("-" * len(header))
+    for start in STARTS:
+        summary, count = run(start, args.steps, args.cycles, step_rows, step_cols)
+        for method, stats in summary.items():
+            results.append({"rows": start[0], "cols": start[1], "method": method, "resizes": count, **stats})
+            print(f"{start[0]:>4}x{start[1]:<5} {method:>6} {count:>8} {stats['total_ms']:>10.1f} "
+                  f"{stats['mean_us']:>9.1f} {stats['p99_us']:>9.1f} {stats['max_us']:>9.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"steps": args.steps, "step": args.step, "cycles": args.cycles, "results": results},
+                      f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Benchmark: time to hand one utterance to each speech backend
+
+This is the time speak() holds up the UI thread, not how long the words
+take to be heard. "subprocess" writes to a running speech program and
+"spawn" starts a new one per utterance, as calling spd-say or espeak for
+each line would. By default the speech program is a silent stand-in that
+reads and discards lines; --engine uses the real one found on the PATH.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+import speech
+
+
+SILENT_ENGINE = [sys.executable, "-c", "import sys\nfor line in sys.stdin: pass"]
+UTTERANCES = ["12", "plus", "left paren", "equals 42", "Page 2 of 5, Fractions", "Not found"]
+
+
+def spawn_per_utterance(command):
+    """speak() as one short-lived process per utterance"""
+    class Spawn:
+        name = "spawn"
+
+        def speak(self, text):
+            process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                                       stderr=subprocess.DEVNULL, text=True)
+            process.stdin.write(text + "\n")
+            process.stdin.close()
+            self.last = process
+
+        def close(self):
+            self.last.wait()
+
+    return Spawn()
+
+
+def time_backend(backend, count):
+    times = []
+    for i in range(count):
+        text = UTTERANCES[i % len(UTTERANCES)]
+        start = time.perf_counter()
+        backend.speak(text)
+        times.append(time.perf_counter() - start)
+    backend.close()
+    times.sort()
+    return {
+        "mean_us": sum(times) / len(times) * 1e6,
+        "p99_us": times[min(len(times) - 1, int(0.99 * len(times)))] * 1e6,
+        "max_us": times[-1] * 1e6,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=2000, help="utterances per backend")
+    parser.add_argument("--spawn-count", type=int, default=50, help="utterances for the spawn baseline")
+    parser.add_argument("--engine", action="store_true", help="use the installed speech program; it will talk")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    command = speech.find_command() if args.engine else SILENT_ENGINE
+    if command is None:
+        print("No speech program found; install speech-dispatcher or espeak-ng")
+        return 1
+    backends = [
+        ("null", speech.NullBackend, args.count),
+        ("recording", speech.RecordingBackend, args.count),
+        ("subprocess", lambda: speech.SubprocessBackend(command), args.count),
+        ("spawn", lambda: spawn_per_utterance(command), args.spawn_count),
+    ]
+    if speech.tolk is not None and args.engine:
+        backends.append(("tolk", speech.TolkBackend, args.count))
+
+    results = []
+    header = f"{'Backend':>11} {'Utterances':>10} {'Mean us':>9} {'p99 us':>9} {'Max us':>9}"
+    print("Speech program: " + (" ".join(command) if args.engine else "silent stand-in"))
+    print(header)
+    print("-" * len(header))
+    for name, make, count in backends:
+        stats = time_backend(make(), count)
+        results.append({"backend": name, "utterances": count, **stats})
+        print(f"{name:>11} {count:>10} {stats['mean_us']:>9.1f} {stats['p99_us']:>9.1f} {stats['max_us']:>9.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"command": command, "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Benchmark: time from launch to the first spoken words
+
+Starts the app in a fresh Python process under the SDL dummy drivers,
+opens the main menu as `python virtual_taylor_frame.py` does and stops at
+the first speech. Each launch is timed from process start, so interpreter
+start-up and every import are included, and so is starting the speech
+backend the app would use (--speech). Where that backend starts instantly,
+e.g. no screen reader is installed, --backend-delay adds the load time of
+a real one. Exits with status 1 when the median is above the target.
+
+    python bench_startup.py --speech auto --backend-delay 150
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import speech
+
+
+TARGET_MS = 400
+
+CHILD = r"""
+import os, sys, time
+start = time.perf_counter()
+import speech
+import virtual_taylor_frame
+imported = time.perf_counter()
+name, delay = sys.argv[1], float(sys.argv[2]) / 1000
+create_backend = speech.create_backend_or_fallback
+
+def create_timed_backend(name):
+    time.sleep(delay)  # stands in for a screen reader that is slow to load
+    backend = create_backend(name)
+    speak = backend.speak
+
+    def first_speech(text):
+        speak(text)
+        spoken = time.perf_counter()
+        print(f"{backend.name} {(imported - start) * 1000:.1f} {(spoken - start) * 1000:.1f}", flush=True)
+        os._exit(0)
+
+    backend.speak = first_speech
+    return backend
+
+speech.create_backend_or_fallback = create_timed_backend
+frame = virtual_taylor_frame.VirtualTaylorFrame(18, 25, speech_name=name)
+frame.show_main_menu()
+os._exit(1)
+"""
+
+
+def launch(home, name="auto", delay_ms=0):
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", HOME=home,
+               USERPROFILE=home, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", CHILD, name, str(delay_ms)], env=env, capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    total = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"Startup failed:\n{result.stdout}{result.stderr}")
+    backend, import_ms, speech_ms = result.stdout.split()[-3:]
+    return {"backend": backend, "import_ms": float(import_ms), "in_process_speech_ms": float(speech_ms),
+            "first_speech_ms": total}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--target", type=float, default=TARGET_MS, help="median time to first speech (ms)")
+    parser.add_argument("--speech", choices=speech.BACKEND_NAMES, default="auto",
+                        help="speech backend to start, as in the app")
+    parser.add_argument("--backend-delay", type=float, default=0, metavar="MS",
+                        help="extra time the speech backend takes to start")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    import tempfile
+    with tempfile.TemporaryDirectory() as home:
+        runs = [launch(home, args.speech, args.backend_delay) for _ in range(args.runs)]
+
+    summary = {key: statistics.median(run[key] for run in runs) for key in runs[0] if key != "backend"}
+    print(f"Speech backend: {runs[0]['backend']}"
+          + (f", {args.backend_delay:.0f} ms added to its start" if args.backend_delay else ""))
+    print(f"Median over {args.runs} launches: imports {summary['import_ms']:.0f} ms, "
+          f"first speech {summary['in_process_speech_ms']:.0f} ms after Python started, "
+          f"{summary['first_speech_ms']:.0f} ms after launch (target {args.target:.0f} ms)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"target_ms": args.target, "backend": runs[0]["backend"], "median": summary, "runs": runs},
+                      f, indent=2)
+    return 0 if summary["first_speech_ms"] <= args.target else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Benchmark: .vtf version 1 JSON against version 2 binary
+
+Compares file size, save time and load time on grids from 18x25 up to
+1000x1000, filled with stacked arithmetic at a given density. The
+"v1 legacy" column reloads JSON with the old per-character loop and
+"v1 stream" uses the chunked reader behind read_vtf.
+"""
+
+import argparse
+import io
+import json
+import random
+import time
+
+import numpy as np
+
+import vtf_format
+
+
+SIZES = [(18, 25), (100, 100), (250, 250), (500, 500), (1000, 1000)]
+
+
+def make_worksheet(rows, cols, density, seed=1):
+    """A grid where roughly `density` of the rows hold an expression"""
+    rng = random.Random(seed)
+    grid = vtf_format.new_grid(rows, cols)
+    for y in range(rows):
+        if rng.random() < density:
+            text = f"{rng.randint(1, 999)} + {rng.randint(1, 999)} = {rng.randint(1, 1998)}"
+            x = rng.randint(0, max(0, cols - len(text)))
+            row = text[:cols - x]
+            grid[y, x:x + len(row)] = list(row)
+    return grid
+
+
+def legacy_load_v1(blob):
+    """The loader used before version 2: json.loads plus one cell at a time"""
+    data = json.loads(blob)
+    rows, cols = int(data["rows"]), int(data["cols"])
+    new_grid = np.full((rows, cols), ' ', dtype=str)
+    for y, row_str in enumerate(data["grid"][:rows]):
+        for x, ch in enumerate(row_str[:cols]):
+            new_grid[y][x] = ch
+    return new_grid
+
+
+def best_time(func, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--density", type=float, default=0.3, help="fraction of rows with content")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    results = []
+    header = f"{'Grid':>10} {'Format':>10} {'Bytes':>10} {'Save ms':>9} {'Load ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for rows, cols in SIZES:
+        grid = make_worksheet(rows, cols, args.density)
+        cursor = (0, 0)
+        cases = [
+            ("v1 legacy", lambda: vtf_format.encode_v1(grid, cursor), legacy_load_v1),
+            ("v1", lambda: vtf_format.encode_v1(grid, cursor), vtf_format.decode),
+            ("v1 stream", lambda: vtf_format.encode_v1(grid, cursor),
+             lambda blob: vtf_format.read_v1_stream(io.BytesIO(blob))),
+            ("v2", lambda: vtf_format.encode_v2(grid, cursor, compress=False), vtf_format.decode),
+            ("v2 zlib", lambda: vtf_format.encode_v2(grid, cursor, compress=True), vtf_format.decode),
+        ]
+        for name, save, load in cases:
+            save_ms, blob = best_time(save, args.repeat)
+            load_ms, loaded = best_time(lambda: load(blob), args.repeat)
+            loaded_grid = loaded[0] if isinstance(loaded, tuple) else loaded
+            assert np.array_equal(loaded_grid, grid), f"{name} did not round-trip"
+            row = {"rows": rows, "cols": cols, "format": name, "bytes": len(blob),
+                   "save_ms": save_ms, "load_ms": load_ms}
+            results.append(row)
+            print(f"{rows:>4}x{cols:<5} {name:>10} {len(blob):>10} {save_ms:>9.2f} {load_ms:>9.2f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"density": args.density, "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Benchmark: opening workbooks of many pages against loading one page
+
+Each page is a worksheet of the given size. "open" reads a workbook's
+table of contents and shows its first page; "vtf" loads the same page from
+a .vtf file. Page switches are timed for pages still in the cache and for
+pages read back from the file. No window or sound card is needed.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import vtf_format
+from bench_vtf_format import best_time, make_worksheet
+from workbook import Workbook
+
+
+PAGE_COUNTS = [1, 50, 500]
+
+
+def make_workbook(path, pages, rows, cols):
+    workbook = Workbook.from_grid("Page 1", make_worksheet(rows, cols, 0.3, seed=1), (0, 0))
+    for n in range(2, pages + 1):
+        workbook.add_page(f"Page {n}", make_worksheet(rows, cols, 0.3, seed=n), (0, 0))
+    workbook.save(path)
+
+
+def open_first_page(path):
+    workbook = Workbook.open(path)
+    workbook.read(workbook.active)
+    return workbook
+
+
+def time_switches(path, pages, repeat):
+    """Mean ms to show a page that is cached, and one that is not"""
+    workbook = open_first_page(path)
+    near = [0, min(1, pages - 1)] * repeat
+    start = time.perf_counter()
+    for index in near:
+        workbook.read(index)
+    cached = (time.perf_counter() - start) / len(near) * 1000
+    far = [(i * 7) % pages for i in range(repeat * 2)]
+    start = time.perf_counter()
+    for index in far:
+        workbook.read(index)
+    uncached = (time.perf_counter() - start) / len(far) * 1000
+    return cached, uncached
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--cols", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    results = []
+    header = f"{'Pages':>6} {'File KB':>9} {'vtf ms':>8} {'open ms':>8} {'cached ms':>10} {'uncached ms':>12}"
+    print(header)
+    print("-" * len(header))
+    with tempfile.TemporaryDirectory() as folder:
+        vtf_path = os.path.join(folder, "page.vtf")
+        vtf_format.write_vtf(vtf_path, make_worksheet(args.rows, args.cols, 0.3, seed=1), (0, 0))
+        vtf_ms, _ = best_time(lambda: vtf_format.read_vtf(vtf_path), args.repeat)
+        for pages in PAGE_COUNTS:
+            path = os.path.join(folder, f"book{pages}.vtw")
+            make_workbook(path, pages, args.rows, args.cols)
+            open_ms, _ = best_time(lambda: open_first_page(path), args.repeat)
+            cached_ms, uncached_ms = time_switches(path, pages, args.repeat)
+            size_kb = os.path.getsize(path) / 1024
+            results.append({"pages": pages, "file_kb": size_kb, "vtf_ms": vtf_ms, "open_ms": open_ms,
+                            "cached_ms": cached_ms, "uncached_ms": uncached_ms})
+            print(f"{pages:>6} {size_kb:>9.1f} {vtf_ms:>8.3f} {open_ms:>8.3f} {cached_ms:>10.4f} {uncached_ms:>12.3f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"rows": args.rows, "cols": args.cols, "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
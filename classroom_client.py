@@ -0,0 +1,97 @@
+# Thin client for the classroom server
+# Forwards key events to a session on the server and plays back the speech
+# and sound cues it sends. Needs pygame for the keyboard and mixer only.
+
+import argparse
+import json
+import os
+import queue
+import socket
+import sys
+import threading
+
+import pygame
+
+import speech
+from classroom_server import DEFAULT_PORT
+
+
+def resource_path(relative_path):
+    try:
+        base_path = sys._MEIPASS
+    except AttributeError:
+        base_path = os.path.abspath(".")
+    return os.path.join(base_path, relative_path)
+
+
+def receive_loop(sock_file, replies):
+    for line in sock_file:
+        replies.put(json.loads(line))
+    replies.put(None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Connect to a Virtual Taylor Frame classroom server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--student", default=os.environ.get("VTF_STUDENT", "student"))
+    parser.add_argument("--speech", choices=speech.BACKEND_NAMES, default="auto")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.mixer.init()
+    screen = pygame.display.set_mode((480, 120))
+    pygame.display.set_caption("Virtual Taylor Frame - Classroom")
+    font = pygame.font.Font(None, 28)
+    sounds = {name: pygame.mixer.Sound(resource_path(f"{name}.wav")) for name in ("empty", "content", "move")}
+    voice = speech.create_backend_or_fallback(args.speech)
+
+    sock = socket.create_connection((args.host, args.port))
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock_file = sock.makefile("rb")
+    replies = queue.Queue()
+    threading.Thread(target=receive_loop, args=(sock_file, replies), daemon=True).start()
+
+    def send(message):
+        sock.sendall(json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n")
+
+    send({"type": "hello", "student": args.student})
+    seq = 0
+    running = True
+    while running:
+        for event in pygame.event.get():
+            seq += 1
+            if event.type == pygame.QUIT:
+                send({"type": "quit", "seq": seq})
+            elif event.type == pygame.KEYDOWN:
+                send({"type": "keydown", "seq": seq, "key": event.key, "mod": event.mod, "unicode": event.unicode})
+            elif event.type == pygame.KEYUP:
+                send({"type": "keyup", "seq": seq, "key": event.key, "mod": event.mod})
+
+        while True:
+            try:
+                reply = replies.get_nowait()
+            except queue.Empty:
+                break
+            if reply is None or reply.get("closed"):
+                running = False
+            for kind, value in (reply or {}).get("cues", []):
+                if kind == "sound" and value in sounds:
+                    sounds[value].play()
+                elif kind == "speech":
+                    voice.speak(value)
+
+        screen.fill((255, 255, 255))
+        text = font.render(f"Connected to {args.host}:{args.port} as {args.student}", True, (0, 0, 0))
+        screen.blit(text, (20, 45))
+        pygame.display.flip()
+        pygame.time.wait(5)
+
+    sock.close()
+    voice.close()
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,189 @@
+# Classroom server for Virtual Taylor Frame
+# Hosts many headless frames in one process. Thin clients send key events and
+# receive speech and sound cues as newline-delimited JSON over TCP.
+# Sessions cannot save, load, export or paste files: those would use the
+# server's disk, as the server's user.
+#
+# Client -> server:
+#   {"type": "hello", "student": "amina", "rows": 18, "cols": 25, "menu": true}
+#   {"type": "keydown", "seq": 7, "key": 13, "mod": 64, "unicode": "\r"}
+#   {"type": "keyup", "seq": 8, "key": 1073742048, "mod": 0}
+#   ("mod" may be left out; modifiers then follow the Ctrl/Alt/Shift key
+#   presses the client sends)
+#   {"type": "quit", "seq": 9}
+# Server -> client, one line per message received:
+#   {"seq": 7, "cues": [["speech", "equals 5"], ["sound", "content"]]}
+#   "closed": true is added once the student has exited the program.
+
+import argparse
+import asyncio
+import json
+import traceback
+
+import pygame
+
+import keymap
+from progress_store import ProgressStore
+from virtual_taylor_frame import VirtualTaylorFrame
+
+
+DEFAULT_PORT = 8765
+MAX_ROWS = 200
+MAX_COLS = 200
+
+EVENT_TYPES = {
+    "keydown": pygame.KEYDOWN,
+    "keyup": pygame.KEYUP,
+    "quit": pygame.QUIT,
+}
+
+
+class Session:
+    """One student's headless frame and the cues produced by the last event"""
+
+    __slots__ = ("frame", "cues", "held")
+
+    def __init__(self, rows, cols, student, progress, show_menu=True):
+        self.cues = []
+        self.held = 0  # modifiers held down, for messages without "mod"
+        # Students must not reach the server's files, and disk work would
+        # hold up every session sharing the event loop
+        self.frame = VirtualTaylorFrame(rows, cols, headless=True, output=self._output,
+                                        progress=progress, student=student, file_access=False)
+        if show_menu:
+            self.frame.show_main_menu()
+
+    def _output(self, kind, value):
+        self.cues.append((kind, value))
+
+    @property
+    def closed(self):
+        return self.frame.screens.top is None
+
+    def handle(self, message):
+        """Feed one client message to the frame as a pygame event"""
+        event_type = EVENT_TYPES.get(message.get("type"))
+        if event_type is None:
+            return
+        if event_type == pygame.QUIT:
+            event = pygame.event.Event(event_type)
+        else:
+            key = int(message.get("key", 0))
+            self.held = keymap.track_modifiers(self.held, event_type, key)
+            event = pygame.event.Event(
+                event_type,
+                key=key,
+                mod=int(message.get("mod", self.held)),
+                unicode=str(message.get("unicode", ""))
+            )
+        self.frame.handle_event(event)
+
+    def take_cues(self):
+        cues, self.cues = self.cues, []
+        return cues
+
+    def close(self):
+        """Release the frame's worker thread and speech; the progress store is shared"""
+        frame = self.frame
+        frame.stop_mirror()
+        if frame.profiler.enabled:
+            frame.profiler.stop()
+        frame.io_worker.shutdown(wait=False)
+        frame.speech_backend.close()
+
+
+class ClassroomServer:
+    """asyncio TCP server with one Session per connected client"""
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, rows=18, cols=25, progress=None):
+        self.host = host
+        self.port = port
+        self.rows = rows
+        self.cols = cols
+        self.progress = progress or ProgressStore()
+        self.sessions = set()
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.server
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    def close(self):
+        if self.server is not None:
+            self.server.close()
+
+    async def _send(self, writer, reply):
+        writer.write(json.dumps(reply, separators=(",", ":")).encode("utf-8") + b"\n")
+        await writer.drain()
+
+    async def _handle_client(self, reader, writer):
+        session = None
+        try:
+            hello = json.loads(await reader.readline() or b"{}")
+            if hello.get("type") != "hello":
+                return
+            rows = min(max(int(hello.get("rows", self.rows)), 1), MAX_ROWS)
+            cols = min(max(int(hello.get("cols", self.cols)), 1), MAX_COLS)
+            session = Session(rows, cols, str(hello.get("student", "student")), self.progress,
+                              show_menu=bool(hello.get("menu", True)))
+            self.sessions.add(session)
+            await self._send(writer, {"seq": 0, "cues": session.take_cues()})
+
+            while not session.closed:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                try:
+                    session.handle(message)
+                except Exception as e:
+                    print(f"Session error: {e}")
+                    print(traceback.format_exc())
+                reply = {"seq": message.get("seq"), "cues": session.take_cues()}
+                if session.closed:
+                    reply["closed"] = True
+                await self._send(writer, reply)
+        except (ConnectionError, ValueError) as e:
+            print(f"Client error: {e}")
+        finally:
+            if session is not None:
+                self.sessions.discard(session)
+                session.close()
+            writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host Virtual Taylor Frame sessions for thin clients")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="0 picks a free port")
+    parser.add_argument("--rows", type=int, default=18)
+    parser.add_argument("--cols", type=int, default=25)
+    parser.add_argument("--db", help="progress database (defaults to the user's progress.db)")
+    args = parser.parse_args()
+
+    progress = ProgressStore(args.db)
+    server = ClassroomServer(args.host, args.port, args.rows, args.cols, progress)
+
+    async def serve():
+        await server.start()
+        print(f"Listening on {server.host}:{server.port}", flush=True)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        progress.close()
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
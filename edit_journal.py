@@ -0,0 +1,165 @@
+# Crash-safe autosave for Virtual Taylor Frame
+# Every grid edit is appended to a journal as a fixed-size record by a
+# background writer. The journal is periodically compacted into a .vtf
+# snapshot written to a temporary file and atomically renamed into place,
+# after which the journal starts again empty. Recovery loads the snapshot
+# and replays the journal on top of it; the owner takes a first snapshot as
+# soon as the journal is opened so there is always one to replay onto.
+
+import os
+import queue
+import struct
+import threading
+import time
+
+import numpy as np
+
+import vtf_format
+
+
+KIND_CELL = 1
+KIND_CLEAR = 2
+RECORD = struct.Struct("<BIII")  # kind, y, x, character code
+RECORD_DTYPE = np.dtype([("kind", "u1"), ("y", "<u4"), ("x", "<u4"), ("code", "<u4")])
+
+
+class EditJournal:
+    """Append-only edit log plus snapshot for one autosave slot"""
+
+    _STOP = object()
+
+    def __init__(self, snapshot_path, compact_every=512, compact_interval=30.0):
+        self.snapshot_path = snapshot_path
+        self.journal_path = snapshot_path + ".journal"
+        self.compact_every = compact_every
+        self.compact_interval = compact_interval
+        self.records_since_snapshot = 0
+        self.last_snapshot_time = time.monotonic()
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="journal-writer", daemon=True)
+        self._writer.start()
+
+    def record_cell(self, y, x, value):
+        """Log a single cell change"""
+        self._queue.put(RECORD.pack(KIND_CELL, y, x, ord(value) if value else 0))
+        self.records_since_snapshot += 1
+
+    def record_cells(self, ys, xs, codes):
+        """Log many cell changes as one write"""
+        records = np.empty(len(ys), dtype=RECORD_DTYPE)
+        records["kind"] = KIND_CELL
+        records["y"] = ys
+        records["x"] = xs
+        records["code"] = codes
+        self._queue.put(records.tobytes())
+        self.records_since_snapshot += len(records)
+
+    def record_clear(self):
+        """Log that every cell was blanked"""
+        self._queue.put(RECORD.pack(KIND_CLEAR, 0, 0, 0))
+        self.records_since_snapshot += 1
+
+    def needs_compaction(self):
+        if not self.records_since_snapshot:
+            return False
+        return (self.records_since_snapshot >= self.compact_every
+                or time.monotonic() - self.last_snapshot_time >= self.compact_interval)
+
+    def snapshot(self, grid, cursor):
+        """Replace the snapshot with the current grid and empty the journal"""
+        self._queue.put(("snapshot", vtf_format.encode_v2(grid, cursor)))
+        self.records_since_snapshot = 0
+        self.last_snapshot_time = time.monotonic()
+
+    def flush(self):
+        """Block until everything queued so far is on disk"""
+        self._queue.join()
+
+    def close(self):
+        if self._writer.is_alive():
+            self._queue.put(self._STOP)
+            self._writer.join()
+
+    def _write_snapshot(self, blob):
+        temp_path = self.snapshot_path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.snapshot_path)
+
+    def _write_loop(self):
+        directory = os.path.dirname(self.snapshot_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        journal = open(self.journal_path, "ab")
+        running = True
+        while running:
+            items = [self._queue.get()]
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                for item in items:
+                    if item is self._STOP:
+                        running = False
+                    elif isinstance(item, tuple):
+                        journal.flush()
+                        self._write_snapshot(item[1])
+                        journal.seek(0)
+                        journal.truncate()
+                    else:
+                        journal.write(item)
+                journal.flush()
+            except OSError as e:
+                print(f"Autosave error: {e}")
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+        journal.close()
+
+    def recover(self, shape=None):
+        """Return (grid, cursor) for the last session, or None if there is none.
+
+        A session that crashed before its first snapshot left only a journal;
+        it is replayed onto a blank grid of shape (rows, cols) when given.
+        """
+        try:
+            with open(self.journal_path, "rb") as f:
+                data = f.read()
+        except OSError:
+            data = b""
+        # A crash can leave a partial record at the end; it is ignored
+        count = len(data) // RECORD.size
+        try:
+            grid, cursor = vtf_format.read_vtf(self.snapshot_path)
+        except (OSError, vtf_format.VtfFormatError):
+            if not count or shape is None:
+                return None
+            grid, cursor = vtf_format.new_grid(*shape), (0, 0)
+        records = np.frombuffer(data, dtype=RECORD_DTYPE, count=count)
+        if count:
+            grid = apply_records(grid, records)
+        return grid, cursor
+
+
+def apply_records(grid, records):
+    """Replay journal records onto a copy of grid"""
+    grid = grid.copy()
+    clears = np.flatnonzero(records["kind"] == KIND_CLEAR)
+    if clears.size:
+        grid[:] = ' '
+        records = records[clears[-1] + 1:]
+    cells = records[records["kind"] == KIND_CELL]
+    rows, cols = grid.shape
+    inside = (cells["y"] < rows) & (cells["x"] < cols)
+    cells = cells[inside]
+    # Later records for the same cell win, so keep only the last write per cell
+    flat_index = cells["y"].astype(np.int64) * cols + cells["x"]
+    _, last = np.unique(flat_index[::-1], return_index=True)
+    last = len(flat_index) - 1 - last
+    codes = grid.reshape(-1).view(np.uint32)
+    codes[flat_index[last]] = cells["code"][last]
+    return grid
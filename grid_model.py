@@ -0,0 +1,582 @@
+# Grid model for Virtual Taylor Frame
+# Grid contents, the cursor, undo history and every editing and navigation
+# operation, with no pygame, window or audio. Changes are announced to
+# subscribers as listener(event, *args); the frame turns them into autosave
+# records, window updates, sounds and speech.
+
+import math
+import string
+import sys
+
+import numpy as np
+
+import vtf_format
+from undo_history import UndoHistory
+
+
+# Change events
+CELL_CHANGED = "cell"        # y, x, value
+CELLS_CHANGED = "cells"      # ys, xs, codes (arrays)
+GRID_CLEARED = "clear"       # every cell is blank
+GRID_REPLACED = "replaced"   # new size or loaded contents
+CURSOR_MOVED = "cursor"      # x, y
+
+# Results of evaluate_row
+EVAL_WRITTEN = "written"
+EVAL_INVALID = "invalid"
+EVAL_ERROR = "error"
+EVAL_NO_SPACE = "no space"
+
+SHRINK_BUFFER_RATIO = 4  # reallocate when the buffer is this many times the grid
+REBUILD_RATIO = 4  # a cached view is rebuilt whole once more than 1/4 of its rows changed
+
+ALLOWED_IN_EXPRESSIONS = frozenset(string.digits + " .+-*/()^" + string.ascii_letters)
+MATH_CONTEXT = {k: v for k, v in math.__dict__.items() if not k.startswith("__")}
+
+
+def text_to_lines(text):
+    """Split pasted text into grid lines: tabs become spaces, other control
+    characters become blanks and trailing blank lines are dropped"""
+    lines = []
+    for line in text.expandtabs(4).splitlines():
+        lines.append("".join(ch if ch.isprintable() else " " for ch in line).rstrip())
+    while lines and not lines[-1]:
+        lines.pop()
+    return lines
+
+
+class Cursor:
+    """Integer cursor position"""
+
+    __slots__ = ("x", "y")
+
+    def __init__(self, x=0, y=0):
+        self.x = x
+        self.y = y
+
+    def __iter__(self):
+        yield self.x
+        yield self.y
+
+    def __eq__(self, other):
+        return tuple(self) == tuple(other)
+
+    def __repr__(self):
+        return f"Cursor({self.x}, {self.y})"
+
+
+class GridModel:
+    """Grid state plus the editing and navigation operations on it"""
+
+    __slots__ = ("grid", "rows", "cols", "cursor", "anchor", "history", "undoable", "version",
+                 "_buffer", "_listeners",
+                 "_row_versions", "_row_text", "_rows_version", "_lines", "_lines_version",
+                 "_row_filled", "_row_filled_version",
+                 "_column_versions", "_column_text", "_column_filled", "_column_filled_version")
+
+    def __init__(self, rows, cols, history=None):
+        self.rows = rows
+        self.cols = cols
+        # grid is the top-left rows x cols view of a buffer that may be larger,
+        # so growing the grid usually needs no new allocation or copy
+        self._buffer = self.grid = vtf_format.new_grid(rows, cols)
+        self.cursor = Cursor()
+        self.anchor = None  # (x, y) where the selection started, or None
+        self.history = history if history is not None else UndoHistory()
+        self.undoable = True  # False if the last edit was too large to keep in history
+        self._listeners = []
+        # Cached views of the rows and columns. version counts changes to the
+        # grid; each row and column records the version that last changed it,
+        # so a view built at some version only has to redo what changed since.
+        self.version = 0
+        self._row_text = []  # per row: its text, or None until read after a change
+        self._rows_version = -1  # version at which every _row_text entry was filled
+        self._lines = None  # text_lines() as of _lines_version
+        self._lines_version = -1
+        self._row_filled = None  # row_filled() as of _row_filled_version
+        self._row_filled_version = -1
+        self._column_text = {}  # x -> column x as a string, for columns read since they changed
+        self._column_filled = None  # column_filled() as of _column_filled_version
+        self._column_filled_version = -1
+        self._touch_all()
+
+    def subscribe(self, listener):
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self._listeners.remove(listener)
+
+    def _emit(self, event, *args):
+        for listener in self._listeners:
+            listener(event, *args)
+
+    def _touch(self, ys, xs):
+        """Mark the rows and columns of the cells about to change; every
+        cell-changing method calls this or _touch_all"""
+        self.version += 1
+        if len(ys) == 1:
+            rows, columns = [int(ys[0])], [int(xs[0])]
+        else:
+            rows, columns = np.unique(ys).tolist(), np.unique(xs).tolist()
+        self._row_versions[rows] = self.version
+        self._column_versions[columns] = self.version
+        row_text = self._row_text
+        for y in rows:
+            row_text[y] = None
+        for x in columns:
+            self._column_text.pop(x, None)
+
+    def _touch_all(self):
+        """Mark every row and column, after the grid was replaced or cleared"""
+        self.version += 1
+        self._row_versions = np.full(self.rows, self.version, dtype=np.int64)
+        self._column_versions = np.full(self.cols, self.version, dtype=np.int64)
+        self._row_text = [None] * self.rows
+        self._column_text.clear()
+
+    # Reading
+
+    @property
+    def capacity(self):
+        """(rows, cols) the grid can grow to without reallocating"""
+        return self._buffer.shape
+
+    @property
+    def nbytes(self):
+        return self._buffer.nbytes
+
+    @property
+    def cache_nbytes(self):
+        """Bytes held by the cached row and column views and their versions"""
+        arrays = (self._row_versions, self._column_versions, self._row_filled, self._column_filled)
+        total = sum(array.nbytes for array in arrays if array is not None)
+        texts = {id(text): text for texts in (self._row_text, self._lines or (), self._column_text.values())
+                 for text in texts if text is not None}
+        return total + sum(sys.getsizeof(text) for text in texts.values())
+
+    def cells_outside(self, rows, cols):
+        """How many filled cells a resize to rows x cols would remove"""
+        filled = self.grid != ' '
+        return int(filled.sum() - filled[:rows, :cols].sum())
+
+    def cell(self, x, y):
+        return self.grid[y, x]
+
+    def cell_at_cursor(self):
+        return self.grid[self.cursor.y, self.cursor.x]
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.cols and 0 <= y < self.rows
+
+    def row_version(self, y):
+        """The version at which row y last changed"""
+        return int(self._row_versions[y])
+
+    def changed_rows(self, since):
+        """Indices of the rows changed after version `since`"""
+        return np.flatnonzero(self._row_versions > since)
+
+    def row_text(self, y):
+        """Row y as one string, trailing spaces included; built once per change to the row"""
+        text = self._row_text[y]
+        if text is None:
+            text = str(np.ascontiguousarray(self.grid[y]).view(f'<U{self.cols}')[0])
+            self._row_text[y] = text
+        return text
+
+    def row_strings(self):
+        """Every row as row_text() gives it"""
+        if self._rows_version != self.version:
+            missing = [y for y, text in enumerate(self._row_text) if text is None]
+            if len(missing) * REBUILD_RATIO > self.rows:
+                self._row_text = vtf_format.grid_to_row_strings(self.grid)
+            else:
+                for y in missing:
+                    self.row_text(y)
+            self._rows_version = self.version
+        return list(self._row_text)
+
+    def text_lines(self):
+        """Every row with trailing spaces removed, as written to .txt files"""
+        if self._lines_version != self.version:
+            changed = self.changed_rows(self._lines_version)
+            if self._lines is None or len(self._lines) != self.rows or len(changed) * REBUILD_RATIO > self.rows:
+                self._lines = [row.rstrip() for row in self.row_strings()]
+            else:
+                for y in changed.tolist():
+                    self._lines[y] = self.row_text(y).rstrip()
+            self._lines_version = self.version
+        return list(self._lines)
+
+    def row_filled(self):
+        """Whether each row holds any content; only rows changed since the last call are checked again"""
+        if self._row_filled_version != self.version:
+            changed = self.changed_rows(self._row_filled_version)
+            if self._row_filled is None or len(self._row_filled) != self.rows:
+                self._row_filled = (self.grid != ' ').any(axis=1)
+            elif changed.size:
+                self._row_filled[changed] = (self.grid[changed] != ' ').any(axis=1)
+            self._row_filled_version = self.version
+        return self._row_filled
+
+    def column_text(self, x):
+        """Column x top to bottom as one string, trailing spaces included"""
+        text = self._column_text.get(x)
+        if text is None:
+            text = str(np.ascontiguousarray(self.grid[:, x]).view(f'<U{self.rows}')[0])
+            self._column_text[x] = text
+        return text
+
+    def column_filled(self):
+        """Whether each column holds any content; only columns changed since the last call are checked again"""
+        if self._column_filled_version != self.version:
+            if self._column_filled is None or len(self._column_filled) != self.cols:
+                self._column_filled = (self.grid != ' ').any(axis=0)
+            else:
+                changed = np.flatnonzero(self._column_versions > self._column_filled_version)
+                if changed.size:
+                    self._column_filled[changed] = (self.grid[:, changed] != ' ').any(axis=0)
+            self._column_filled_version = self.version
+        return self._column_filled
+
+    def first_run(self, y):
+        """The first run of non-blank cells in row y"""
+        filled = np.flatnonzero(self.grid[y] != ' ')
+        if not filled.size:
+            return ""
+        start = filled[0]
+        gaps = np.flatnonzero(np.diff(filled) != 1)
+        end = filled[gaps[0]] if gaps.size else filled[-1]
+        return "".join(self.grid[y, start:end + 1])
+
+    def next_content_row(self, y, direction):
+        """Nearest row after y (direction 1) or before it (-1) holding content, or None"""
+        filled = self.row_filled()
+        if direction > 0:
+            hits = np.flatnonzero(filled[y + 1:])
+            return y + 1 + int(hits[0]) if hits.size else None
+        hits = np.flatnonzero(filled[:max(y, 0)])
+        return int(hits[-1]) if hits.size else None
+
+    def next_content_column(self, x, direction):
+        """Nearest column after x (direction 1) or before it (-1) holding content, or None"""
+        filled = self.column_filled()
+        if direction > 0:
+            hits = np.flatnonzero(filled[x + 1:])
+            return x + 1 + int(hits[0]) if hits.size else None
+        hits = np.flatnonzero(filled[:max(x, 0)])
+        return int(hits[-1]) if hits.size else None
+
+    # Navigation
+
+    def move_to(self, x, y):
+        """Place the cursor; returns False if the position is off the grid"""
+        if not self.in_bounds(x, y):
+            return False
+        self.cursor.x = x
+        self.cursor.y = y
+        self._emit(CURSOR_MOVED, x, y)
+        return True
+
+    def move(self, dx, dy):
+        return self.move_to(self.cursor.x + dx, self.cursor.y + dy)
+
+    def snap(self, dx, dy):
+        """Move in a direction to the next filled cell; True if one was found.
+
+        With nothing in the way the cursor stops at the edge of the grid.
+        """
+        x, y = self.cursor.x, self.cursor.y
+        if dx:
+            line = self.grid[y, x + 1:] if dx > 0 else self.grid[y, :x][::-1]
+        else:
+            line = self.grid[y + 1:, x] if dy > 0 else self.grid[:y, x][::-1]
+        if not line.size:
+            return False
+        hits = np.flatnonzero(line != ' ')
+        steps = int(hits[0]) + 1 if hits.size else line.size
+        self.move_to(x + dx * steps, y + dy * steps)
+        return bool(hits.size)
+
+    def move_to_next_content_row(self, direction):
+        """Jump to the start of the next row with content; returns its index or None"""
+        y = self.next_content_row(self.cursor.y, direction)
+        if y is not None:
+            self.move_to(0, y)
+        return y
+
+    def move_to_next_content_column(self, direction):
+        """Jump to the top of the next column with content; returns its index or None"""
+        x = self.next_content_column(self.cursor.x, direction)
+        if x is not None:
+            self.move_to(x, 0)
+        return x
+
+    def move_to_edge(self, dx, dy):
+        """Move to the edge of the grid in each direction that is not zero"""
+        x, y = self.cursor.x, self.cursor.y
+        if dx:
+            x = 0 if dx < 0 else self.cols - 1
+        if dy:
+            y = 0 if dy < 0 else self.rows - 1
+        self.move_to(x, y)
+
+    def move_to_next_stack(self):
+        """Two rows down, lined up with the first filled cell of the current row"""
+        filled = np.flatnonzero(self.grid[self.cursor.y] != ' ')
+        start_x = int(filled[0]) if filled.size else 0
+        self.move_to(start_x, min(self.cursor.y + 2, self.rows - 1))
+
+    # Editing
+
+    def set_cell(self, y, x, value):
+        """Change one cell; every edit to the grid goes through here or set_cells"""
+        self.history.record_cell(y, x, self.grid[y, x], value)
+        self._touch((y,), (x,))
+        self.grid[y, x] = value
+        self._emit(CELL_CHANGED, y, x, value)
+
+    def set_cells(self, ys, xs, codes, record=True):
+        """Change many cells at once from arrays of positions and character codes"""
+        codes = np.asarray(codes, dtype=np.uint32)
+        if record:
+            olds = self.grid[ys, xs].view(np.uint32)
+            self.undoable = self.history.record(ys, xs, olds, codes)
+        self._touch(ys, xs)
+        self.grid[ys, xs] = codes.view('<U1')
+        self._emit(CELLS_CHANGED, ys, xs, codes)
+
+    def write_at_cursor(self, value):
+        self.set_cell(self.cursor.y, self.cursor.x, value)
+
+    def erase_at_cursor(self):
+        """Blank the cell under the cursor; False if it was already blank"""
+        if self.cell_at_cursor() == ' ':
+            return False
+        self.set_cell(self.cursor.y, self.cursor.x, ' ')
+        return True
+
+    def clear(self):
+        """Blank every cell as one undoable edit; False if too large to undo"""
+        ys, xs = np.nonzero(self.grid != ' ')
+        self.undoable = self.history.record(ys, xs, self.grid[ys, xs].view(np.uint32),
+                                            np.full(len(ys), ord(' ')))
+        self._touch_all()
+        self.grid[...] = ' '
+        self._emit(GRID_CLEARED)
+        return self.undoable
+
+    def undo(self):
+        """Revert the last edit; returns the (ys, xs, codes) written or None"""
+        return self._apply_history_step(self.history.undo())
+
+    def redo(self):
+        return self._apply_history_step(self.history.redo())
+
+    def _apply_history_step(self, step):
+        if step is None:
+            return None
+        ys, xs, codes = step
+        self.set_cells(ys, xs, codes, record=False)
+        if len(ys) == 1:
+            self.move_to(int(xs[0]), int(ys[0]))
+        return step
+
+    def replace_area(self, area, block):
+        """Overwrite an area, a (row slice, column slice) pair with explicit
+        bounds, with a block of the same shape in one slice assignment.
+
+        Only the cells that differ are recorded and announced, as one edit.
+        Returns how many cells changed; undoable tells whether it can be undone.
+        """
+        old = self.grid[area]
+        changed = old != block
+        ys, xs = np.nonzero(changed)
+        self.undoable = True
+        if not ys.size:
+            return 0
+        ys += area[0].start
+        xs += area[1].start
+        codes = np.ascontiguousarray(block[changed], dtype='<U1').view(np.uint32)
+        self.undoable = self.history.record(ys, xs, old[changed].view(np.uint32), codes)
+        self._touch(ys, xs)
+        self.grid[area] = block
+        self._emit(CELLS_CHANGED, ys, xs, codes)
+        return int(ys.size)
+
+    def set_block(self, y, x, block):
+        """Overwrite the rectangle at (x, y) with a 2-D block of characters;
+        the block must fit on the grid"""
+        height, width = block.shape
+        return self.replace_area((slice(y, y + height), slice(x, x + width)), block)
+
+    def put_block(self, y, x, block):
+        """Write as much of a block as fits with its corner at (x, y); returns
+        the (rows, cols) written"""
+        height = max(min(block.shape[0], self.rows - y), 0)
+        width = max(min(block.shape[1], self.cols - x), 0)
+        if height and width:
+            self.set_block(y, x, block[:height, :width])
+        return height, width
+
+    # Selection and regions
+
+    def start_selection(self):
+        self.anchor = (self.cursor.x, self.cursor.y)
+
+    def end_selection(self):
+        self.anchor = None
+
+    def selection(self):
+        """The area between the anchor and the cursor, or None without a selection"""
+        if self.anchor is None:
+            return None
+        ax, ay = self.anchor
+        x, y = self.cursor.x, self.cursor.y
+        return slice(min(ay, y), max(ay, y) + 1), slice(min(ax, x), max(ax, x) + 1)
+
+    def copy_area(self, area):
+        return self.grid[area].copy()
+
+    def fill_area(self, area, value):
+        """Set every cell of an area to value; returns how many changed"""
+        rows, cols = area
+        return self.replace_area(area, np.full((rows.stop - rows.start, cols.stop - cols.start), value,
+                                               dtype='<U1'))
+
+    def insert_rows(self, y, count=1):
+        """Shift rows y and below down by count, leaving blank rows at y.
+
+        Returns False, changing nothing, if content would be pushed off the grid.
+        """
+        count = min(count, self.rows - y)
+        if count <= 0 or (self.grid[self.rows - count:] != ' ').any():
+            return False
+        area = (slice(y, self.rows), slice(0, self.cols))
+        block = np.full((self.rows - y, self.cols), ' ', dtype='<U1')
+        block[count:] = self.grid[y:self.rows - count]
+        self.replace_area(area, block)
+        return True
+
+    def delete_rows(self, y, count=1):
+        """Remove count rows at y, shifting the rows below up"""
+        count = min(count, self.rows - y)
+        area = (slice(y, self.rows), slice(0, self.cols))
+        block = np.full((self.rows - y, self.cols), ' ', dtype='<U1')
+        block[:self.rows - y - count] = self.grid[y + count:]
+        self.replace_area(area, block)
+
+    def insert_columns(self, x, count=1):
+        """Shift columns x and to the right over by count; False if content
+        would be pushed off the grid"""
+        count = min(count, self.cols - x)
+        if count <= 0 or (self.grid[:, self.cols - count:] != ' ').any():
+            return False
+        area = (slice(0, self.rows), slice(x, self.cols))
+        block = np.full((self.rows, self.cols - x), ' ', dtype='<U1')
+        block[:, count:] = self.grid[:, x:self.cols - count]
+        self.replace_area(area, block)
+        return True
+
+    def delete_columns(self, x, count=1):
+        """Remove count columns at x, shifting the columns to the right left"""
+        count = min(count, self.cols - x)
+        area = (slice(0, self.rows), slice(x, self.cols))
+        block = np.full((self.rows, self.cols - x), ' ', dtype='<U1')
+        block[:, :self.cols - x - count] = self.grid[:, x + count:]
+        self.replace_area(area, block)
+
+    def paste(self, lines, x=None, y=None):
+        """Write text lines as a block with its top-left corner at (x, y), the
+        cursor by default, clipped to the grid.
+
+        Returns (rows, cols, clipped): the size of the block written and
+        whether any of the text did not fit.
+        """
+        x = self.cursor.x if x is None else x
+        y = self.cursor.y if y is None else y
+        width = max((len(line) for line in lines), default=0)
+        height = min(len(lines), self.rows - y)
+        fitted = min(width, self.cols - x)
+        if height <= 0 or fitted <= 0:
+            return 0, 0, bool(lines)
+        self.set_block(y, x, vtf_format.lines_to_grid(lines, height, fitted))
+        return height, fitted, height < len(lines) or fitted < width
+
+    def evaluate_row(self, y):
+        """Evaluate row y as an expression and write " = result" after it.
+
+        Returns (outcome, result) where outcome is one of the EVAL_ constants.
+        """
+        row_content = self.row_text(y).strip()
+        if not set(row_content) <= ALLOWED_IN_EXPRESSIONS:
+            return EVAL_INVALID, None
+        try:
+            result = eval(row_content.replace("^", "**"), {"__builtins__": None}, MATH_CONTEXT)
+        except Exception as e:
+            return EVAL_ERROR, e
+        if isinstance(result, float) and result.is_integer():
+            result = int(result)
+
+        result_str = f" = {result}"
+        start_x = len(self.row_text(y).rstrip(' ')) or 1
+        if start_x + len(result_str) >= self.cols:
+            return EVAL_NO_SPACE, result
+        xs = np.arange(start_x, start_x + len(result_str))
+        self.set_cells(np.full(len(xs), y), xs, [ord(char) for char in result_str])
+        return EVAL_WRITTEN, result
+
+    # Whole-grid changes
+
+    def load(self, grid, cursor):
+        """Replace the grid and cursor, e.g. after loading a file"""
+        self._buffer = self.grid = grid
+        self.rows, self.cols = grid.shape
+        self._touch_all()
+        x, y = vtf_format.clamp_cursor(cursor, self.rows, self.cols)
+        self.cursor.x, self.cursor.y = int(x), int(y)
+        self.anchor = None
+        self.history.clear()
+        self._emit(GRID_REPLACED)
+
+    def resize(self, rows, cols):
+        """Change the grid size, keeping whatever content still fits.
+
+        Growing within the buffer only takes a larger view of it. Past the
+        buffer, a new one is allocated with room to spare (half as much again
+        in each direction that grew) and the old content is copied over in
+        one slice, so repeated growth costs amortised O(1) per added cell.
+        Shrinking blanks the cells that fall off the grid; the undo history
+        is dropped then, since it may refer to them.
+        """
+        if rows < 1 or cols < 1:
+            raise ValueError(f"Grid size must be at least 1 by 1, not {rows} by {cols}")
+        if rows < self.rows or cols < self.cols:
+            self.grid[rows:] = ' '
+            self.grid[:, cols:] = ' '
+            self.history.clear()
+
+        capacity_rows, capacity_cols = self._buffer.shape
+        if rows > capacity_rows or cols > capacity_cols:
+            if rows > capacity_rows:
+                capacity_rows = max(rows, capacity_rows + capacity_rows // 2)
+            if cols > capacity_cols:
+                capacity_cols = max(cols, capacity_cols + capacity_cols // 2)
+            self._reallocate(capacity_rows, capacity_cols)
+        elif capacity_rows * capacity_cols > SHRINK_BUFFER_RATIO * rows * cols:
+            # Give memory back once the grid is much smaller than its buffer
+            self._reallocate(rows, cols)
+
+        self.grid = self._buffer[:rows, :cols]
+        self.rows, self.cols = rows, cols
+        self._touch_all()
+        self.cursor.x = min(self.cursor.x, cols - 1)
+        self.cursor.y = min(self.cursor.y, rows - 1)
+        self.anchor = None
+        self._emit(GRID_REPLACED)
+
+    def _reallocate(self, capacity_rows, capacity_cols):
+        buffer = vtf_format.new_grid(capacity_rows, capacity_cols)
+        keep_rows, keep_cols = min(self.rows, capacity_rows), min(self.cols, capacity_cols)
+        buffer[:keep_rows, :keep_cols] = self.grid[:keep_rows, :keep_cols]
+        self._buffer = buffer
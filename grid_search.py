@@ -0,0 +1,81 @@
+# Find for Virtual Taylor Frame
+# Searches run over the model's cached row strings, which are rebuilt only
+# for rows edited since they were last read, so after the first query a
+# search is a regular expression scan over ready-made strings.
+
+import re
+
+
+class FindError(ValueError):
+    """Raised for a query that cannot be searched for"""
+
+
+def compile_query(query):
+    """A plain substring, or a regular expression when the query starts with "/" """
+    if query.startswith("/") and len(query) > 1:
+        try:
+            pattern = re.compile(query[1:])
+        except re.error as e:
+            raise FindError(f"Invalid pattern: {e}") from None
+    else:
+        pattern = re.compile(re.escape(query))
+    if not query or pattern.fullmatch(""):
+        raise FindError("The search must match at least one character")
+    return pattern
+
+
+class GridSearch:
+    """Find matches of the current query before or after a position"""
+
+    def __init__(self, model):
+        self.model = model
+        self.query = ""
+        self.pattern = None
+
+    def set_query(self, query):
+        self.pattern = compile_query(query)
+        self.query = query
+
+    def find(self, x, y, direction=1, include_start=False):
+        """The next match after (x, y), or before it for direction -1, wrapping
+        around the grid.
+
+        Returns (x, y, text, wrapped) or None when nothing matches.
+        """
+        rows = self.model.row_strings()
+        search = self.pattern.search
+        if direction > 0:
+            match = search(rows[y], x if include_start else x + 1)
+            if match:
+                return match.start(), y, match.group(), False
+            for row in range(y + 1, len(rows)):
+                match = search(rows[row])
+                if match:
+                    return match.start(), row, match.group(), False
+            for row in range(0, y + 1):
+                match = search(rows[row])
+                if match:
+                    return match.start(), row, match.group(), True
+            return None
+
+        match = self._last_match(rows[y], x + 1 if include_start else x)
+        if match:
+            return match.start(), y, match.group(), False
+        for row in range(y - 1, -1, -1):
+            match = self._last_match(rows[row])
+            if match:
+                return match.start(), row, match.group(), False
+        for row in range(len(rows) - 1, y - 1, -1):
+            match = self._last_match(rows[row])
+            if match:
+                return match.start(), row, match.group(), True
+        return None
+
+    def _last_match(self, text, before=None):
+        """The last match starting before the given column"""
+        last = None
+        for match in self.pattern.finditer(text):
+            if before is not None and match.start() >= before:
+                break
+            last = match
+        return last
@@ -0,0 +1,239 @@
+# Keymap for Virtual Taylor Frame
+# Grid keys are looked up as (key, modifier mask) -> command name in one dict.
+# Commands are frame methods with fixed arguments, so anything that can name
+# a command (key bindings, scripts, benchmarks) can run it with
+# frame.run_command(name). Bindings can be changed in keymap.json in the user
+# data folder, e.g. {"ctrl+q": "exit", "f4": null}.
+
+import json
+
+import pygame
+
+
+CTRL = 1
+ALT = 2
+SHIFT = 4
+MODIFIER_NAMES = {"ctrl": CTRL, "alt": ALT, "shift": SHIFT}
+
+# Key names as used in bindings: the pygame constant without "K_", lower case
+KEY_CODES = {name[2:].lower(): value for name, value in vars(pygame).items() if name.startswith("K_")}
+KEY_NAMES = {value: name for name, value in sorted(KEY_CODES.items(), reverse=True)}
+
+# Modifier keys and the pygame modifier bit each one holds down
+MODIFIER_KEYS = {
+    pygame.K_LCTRL: pygame.KMOD_LCTRL, pygame.K_RCTRL: pygame.KMOD_RCTRL,
+    pygame.K_LALT: pygame.KMOD_LALT, pygame.K_RALT: pygame.KMOD_RALT,
+    pygame.K_LSHIFT: pygame.KMOD_LSHIFT, pygame.K_RSHIFT: pygame.KMOD_RSHIFT,
+}
+
+# Command name -> (frame method, arguments)
+COMMANDS = {
+    "help": ("show_help", ()),
+    "toggle_auto_shift": ("toggle_auto_shift", ()),
+    "toggle_smart_delete": ("toggle_smart_delete", ()),
+    "toggle_fast_move": ("toggle_fast_move", ()),
+    "resize": ("prompt_grid_resize", ()),
+    "hint": ("offer_hint", ()),
+    "read_row": ("speak_current_row", ()),
+    "read_column": ("speak_current_column", ()),
+    "evaluate": ("evaluate_or_check_answer", ()),
+    "next_stack": ("move_down_to_next_stack", ()),
+    "move_up": ("move", (0, -1)),
+    "move_down": ("move", (0, 1)),
+    "move_left": ("move", (-1, 0)),
+    "move_right": ("move", (1, 0)),
+    "snap_up": ("snap_to_content", (0, -1)),
+    "snap_down": ("snap_to_content", (0, 1)),
+    "snap_left": ("snap_to_content", (-1, 0)),
+    "snap_right": ("snap_to_content", (1, 0)),
+    "previous_content_row": ("move_to_next_content_row", (-1,)),
+    "next_content_row": ("move_to_next_content_row", (1,)),
+    "previous_content_column": ("move_to_next_content_column", (-1,)),
+    "next_content_column": ("move_to_next_content_column", (1,)),
+    "row_start": ("move_to_edge", (-1, 0)),
+    "row_end": ("move_to_edge", (1, 0)),
+    "grid_start": ("move_to_edge", (-1, -1)),
+    "grid_end": ("move_to_edge", (1, 1)),
+    "column_top": ("move_to_edge", (0, -1)),
+    "column_bottom": ("move_to_edge", (0, 1)),
+    "save": ("save_state", ()),
+    "load": ("load_state", ()),
+    "export": ("export_text", ()),
+    "paste": ("paste_clipboard", ()),
+    "paste_file": ("prompt_paste_file", ()),
+    "toggle_selection": ("toggle_selection", ()),
+    "copy": ("copy_selection", ()),
+    "cut": ("cut_selection", ()),
+    "paste_selection": ("paste_selection", ()),
+    "fill_selection": ("prompt_fill_selection", ()),
+    "clear_selection": ("clear_selection", ()),
+    "insert_rows": ("insert_rows", ()),
+    "delete_rows": ("delete_rows", ()),
+    "insert_columns": ("insert_columns", ()),
+    "delete_columns": ("delete_columns", ()),
+    "find": ("start_find", ()),
+    "find_next": ("find_next", ()),
+    "find_previous": ("find_previous", ()),
+    "previous_page": ("switch_page", (-1,)),
+    "next_page": ("switch_page", (1,)),
+    "new_page": ("prompt_new_page", ()),
+    "undo": ("undo", ()),
+    "redo": ("redo", ()),
+    "delete": ("delete_value", ()),
+    "clear_grid": ("clear_grid", ()),
+    "exit": ("confirm_exit", ()),
+}
+
+DEFAULT_BINDINGS = {
+    "f1": "help",
+    "f2": "toggle_auto_shift",
+    "f3": "toggle_smart_delete",
+    "f4": "toggle_fast_move",
+    "f5": "resize",
+    "f6": "hint",
+    "alt+l": "read_row",
+    "alt+c": "read_column",
+    "ctrl+return": "evaluate",
+    "return": "next_stack",
+    "shift+down": "next_stack",
+    "up": "move_up",
+    "down": "move_down",
+    "left": "move_left",
+    "right": "move_right",
+    "ctrl+up": "snap_up",
+    "ctrl+down": "snap_down",
+    "ctrl+left": "snap_left",
+    "ctrl+right": "snap_right",
+    "alt+up": "previous_content_row",
+    "alt+down": "next_content_row",
+    "alt+left": "previous_content_column",
+    "alt+right": "next_content_column",
+    "home": "row_start",
+    "end": "row_end",
+    "ctrl+home": "grid_start",
+    "ctrl+end": "grid_end",
+    "ctrl+pageup": "column_top",
+    "ctrl+pagedown": "column_bottom",
+    "ctrl+s": "save",
+    "ctrl+o": "load",
+    "ctrl+e": "export",
+    "ctrl+shift+v": "paste",
+    "ctrl+shift+i": "paste_file",
+    "f7": "toggle_selection",
+    "ctrl+c": "copy",
+    "ctrl+x": "cut",
+    "ctrl+v": "paste_selection",
+    "ctrl+shift+f": "fill_selection",
+    "delete": "clear_selection",
+    "ctrl+insert": "insert_rows",
+    "ctrl+delete": "delete_rows",
+    "ctrl+shift+insert": "insert_columns",
+    "ctrl+shift+delete": "delete_columns",
+    "ctrl+f": "find",
+    "ctrl+g": "find_next",
+    "ctrl+shift+g": "find_previous",
+    "alt+pageup": "previous_page",
+    "alt+pagedown": "next_page",
+    "alt+insert": "new_page",
+    "ctrl+z": "undo",
+    "ctrl+y": "redo",
+    "backspace": "delete",
+    "ctrl+backspace": "clear_grid",
+    "escape": "exit",
+}
+
+
+class KeymapError(ValueError):
+    """Raised for a binding or command name that cannot be understood"""
+
+
+def modifier_mask(mod):
+    """CTRL/ALT/SHIFT bits from a pygame modifier state such as event.mod"""
+    mask = 0
+    if mod & pygame.KMOD_CTRL:
+        mask |= CTRL
+    if mod & pygame.KMOD_ALT:
+        mask |= ALT
+    if mod & pygame.KMOD_SHIFT:
+        mask |= SHIFT
+    return mask
+
+
+def track_modifiers(held, event_type, key):
+    """pygame modifier state after a key event, for senders that only report
+    modifier key presses"""
+    bit = MODIFIER_KEYS.get(key, 0)
+    if event_type == pygame.KEYDOWN:
+        return held | bit
+    if event_type == pygame.KEYUP:
+        return held & ~bit
+    return held
+
+
+def is_text_input(event, mask):
+    """True for a key that types one printable character"""
+    unicode = event.unicode
+    return not mask & (CTRL | ALT) and len(unicode) == 1 and unicode.isprintable()
+
+
+def parse_binding(text):
+    """"ctrl+shift+v" -> (key code, modifier mask)"""
+    *modifiers, key_name = text.lower().replace(" ", "").split("+")
+    mask = 0
+    for name in modifiers:
+        if name not in MODIFIER_NAMES:
+            raise KeymapError(f"Unknown modifier {name!r} in {text!r}")
+        mask |= MODIFIER_NAMES[name]
+    if key_name not in KEY_CODES:
+        raise KeymapError(f"Unknown key {key_name!r} in {text!r}")
+    return KEY_CODES[key_name], mask
+
+
+def format_binding(key, mask):
+    names = [name for name, bit in MODIFIER_NAMES.items() if mask & bit]
+    return "+".join(names + [KEY_NAMES.get(key, str(key))])
+
+
+class KeyMap:
+    """(key, modifier mask) -> command name"""
+
+    def __init__(self, bindings=None):
+        self.table = {}
+        for text, command in (DEFAULT_BINDINGS if bindings is None else bindings).items():
+            self.bind(text, command)
+
+    def bind(self, text, command):
+        """Bind a key to a command; a command of None removes the binding"""
+        key = parse_binding(text)
+        if command is None:
+            self.table.pop(key, None)
+            return
+        if command not in COMMANDS:
+            raise KeymapError(f"Unknown command {command!r} for {text!r}")
+        self.table[key] = command
+
+    def lookup(self, key, mask):
+        """The command for a key press; Shift is ignored by keys without a Shift binding"""
+        command = self.table.get((key, mask))
+        if command is None and mask & SHIFT:
+            command = self.table.get((key, mask & ~SHIFT))
+        return command
+
+    def bindings(self):
+        """{"ctrl+z": "undo", ...} for every current binding"""
+        return {format_binding(key, mask): command for (key, mask), command in self.table.items()}
+
+    @classmethod
+    def load(cls, path):
+        """Default bindings with the changes from a JSON file, if it exists"""
+        keymap = cls()
+        try:
+            with open(path, encoding="utf-8") as f:
+                changes = json.load(f)
+        except FileNotFoundError:
+            return keymap
+        if not isinstance(changes, dict):
+            raise KeymapError(f"{path} should hold an object of key: command pairs")
+        for text, command in changes.items():
+            keymap.bind(text, command)
+        return keymap
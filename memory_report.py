@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""Memory report for Virtual Taylor Frame
+
+Explicit accounting of the large structures a frame owns (grid and its
+cached views, display surface, sounds, tutorial catalog, undo history,
+workbook pages, mirror backlog, profiler buffers, screens)
+plus, when tracemalloc is running, the lines that allocated the most Python
+memory. F12 in the app speaks a summary and saves the full report; this
+script prints the report for a headless frame.
+
+    python memory_report.py --rows 500 --cols 500
+    python virtual_taylor_frame.py --trace-memory
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+import numpy as np
+
+
+def deep_sizeof(obj, exclude=()):
+    """Approximate bytes reachable from obj, not following anything in exclude"""
+    seen = {id(o) for o in exclude}
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        if isinstance(item, np.ndarray):
+            total += item.nbytes + sys.getsizeof(np.empty(0))
+            continue
+        total += sys.getsizeof(item)
+        if isinstance(item, (str, bytes, bytearray, int, float, bool, type(None))):
+            continue
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        if hasattr(item, "__dict__") and not isinstance(item, type):
+            stack.append(vars(item))
+        for name in getattr(type(item), "__slots__", ()):
+            if hasattr(item, name):
+                stack.append(getattr(item, name))
+    return total
+
+
+def surface_bytes(surface):
+    """Pixel memory of a pygame surface"""
+    if surface is None:
+        return 0
+    width, height = surface.get_size()
+    return width * height * surface.get_bytesize()
+
+
+def sound_bytes(sound):
+    """Sample memory of a loaded pygame sound; headless frames use plain names"""
+    if sound is None or isinstance(sound, str):
+        return 0
+    import pygame
+    settings = pygame.mixer.get_init()
+    if not settings:
+        return 0
+    frequency, sample_format, channels = settings
+    return int(sound.get_length() * frequency * channels * abs(sample_format) // 8)
+
+
+def process_rss():
+    """Resident memory of this process in bytes, or None where unknown"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class Counters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage",
+                    "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage",
+                    "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")
+            ]
+
+        counters = Counters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+    return None
+
+
+def account(frame):
+    """Bytes held by each major part of a frame"""
+    profiler = frame.profiler
+    profiler_bytes = sum(a.nbytes for a in (profiler.name_ids, profiler.starts, profiler.durations)
+                         if a is not None)
+    return {
+        "grid": frame.model.nbytes,
+        "grid caches": frame.model.cache_nbytes,
+        "display surface": surface_bytes(frame.screen),
+        "sounds": sum(sound_bytes(s) for s in (frame.empty_sound, frame.content_sound, frame.move_sound)),
+        "tutorial library": deep_sizeof(frame._tutorial_library) if frame._tutorial_library else 0,
+        "undo history": frame.history.nbytes,
+        "workbook pages": frame.workbook.nbytes if frame.workbook is not None else 0,
+        "mirror": (frame.mirror.backlog_bytes + deep_sizeof(frame.mirror._pending)
+                   if frame.mirror is not None else 0),
+        "profiler buffers": profiler_bytes,
+        "screens": deep_sizeof(frame.screens, exclude=(frame,)),
+        "pending UI callbacks": frame._ui_callbacks.qsize() * sys.getsizeof(lambda: None),
+    }
+
+
+def memory_report(frame, top=10):
+    """Explicit accounting plus tracemalloc statistics when tracing is on"""
+    gc.collect()
+    components = account(frame)
+    report = {
+        "components": components,
+        "accounted": sum(components.values()),
+        "process_rss": process_rss(),
+        "tracemalloc": None,
+    }
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+        ])
+        report["tracemalloc"] = {
+            "current": current,
+            "peak": peak,
+            "top": [
+                {"where": str(stat.traceback), "bytes": stat.size, "count": stat.count}
+                for stat in snapshot.statistics("lineno")[:top]
+            ],
+        }
+    return report
+
+
+def megabytes(n):
+    return f"{n / (1024 * 1024):.2f} MB"
+
+
+def format_report(report):
+    lines = ["Memory report", ""]
+    for name, size in sorted(report["components"].items(), key=lambda item: -item[1]):
+        lines.append(f"  {name:<22} {megabytes(size):>12}")
+    lines.append(f"  {'accounted total':<22} {megabytes(report['accounted']):>12}")
+    if report["process_rss"] is not None:
+        lines.append(f"  {'process resident':<22} {megabytes(report['process_rss']):>12}")
+    traced = report["tracemalloc"]
+    if traced is None:
+        lines += ["", "tracemalloc is off; start with --trace-memory for allocation sites"]
+    else:
+        lines += ["", f"tracemalloc: {megabytes(traced['current'])} now, {megabytes(traced['peak'])} peak"]
+        for stat in traced["top"]:
+            lines.append(f"  {megabytes(stat['bytes']):>10} {stat['count']:>8} blocks  {stat['where']}")
+    return "\n".join(lines)
+
+
+def spoken_summary(report):
+    """A short sentence for the screen reader"""
+    components = report["components"]
+    largest = max(components, key=components.get)
+    text = f"Memory accounted: {megabytes(report['accounted'])}. Largest: {largest}, {megabytes(components[largest])}."
+    if report["process_rss"] is not None:
+        text += f" Process total: {megabytes(report['process_rss'])}."
+    return text
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print a memory report for a headless frame")
+    parser.add_argument("--rows", type=int, default=18)
+    parser.add_argument("--cols", type=int, default=25)
+    parser.add_argument("--load", help="load this .vtf file first")
+    parser.add_argument("--top", type=int, default=10, help="allocation sites to list")
+    parser.add_argument("--json", help="write the report to this file")
+    args = parser.parse_args(argv)
+
+    tracemalloc.start()
+    from progress_store import ProgressStore
+    from virtual_taylor_frame import VirtualTaylorFrame
+    import vtf_format
+
+    progress = ProgressStore(":memory:")
+    frame = VirtualTaylorFrame(args.rows, args.cols, headless=True, progress=progress)
+    if args.load:
+        frame._apply_loaded_state(*vtf_format.read_vtf(args.load))
+    report = memory_report(frame, args.top)
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    frame.io_worker.shutdown(wait=True)
+    progress.close()
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
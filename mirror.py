@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""Mirror a student's grid live on a teacher's machine
+
+The student app publishes what changes on its grid, where the cursor is and
+what is spoken, as newline-delimited JSON over TCP:
+
+    python virtual_taylor_frame.py --mirror 8766 --mirror-host 0.0.0.0
+    python mirror.py --host 192.168.1.20 --port 8766
+
+Publisher -> viewer:
+    {"type": "snapshot", "vtf": "<base64 .vtf version 2 blob>"}
+    {"type": "cells", "y": [0, 0], "x": [3, 4], "text": "12"}
+    {"type": "clear"}
+    {"type": "cursor", "x": 4, "y": 0}
+    {"type": "speech", "text": "equals 5"}
+    {"type": "end"}
+
+Edits are collected on the UI thread and sent once per frame, so the cost
+follows the number of cells changed, not the size of the grid. A snapshot
+is sent when the grid is replaced (load, resize, page switch). Every
+SNAPSHOT_CELLS changed cells one is also taken but only kept, not sent: a
+viewer that joins late gets the latest snapshot, the edits since and the
+cursor. Sockets are only touched on the publisher's own threads.
+"""
+
+import argparse
+import base64
+import json
+import queue
+import socket
+import threading
+
+import numpy as np
+
+import grid_model
+import vtf_format
+from grid_model import GridModel
+
+
+DEFAULT_PORT = 8766
+SNAPSHOT_CELLS = 4096  # changed cells between snapshots kept for late joiners
+SEND_TIMEOUT = 5  # seconds before a viewer that stopped reading is dropped
+
+
+def encode_message(message):
+    return json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def snapshot_message(grid, cursor):
+    return {"type": "snapshot", "vtf": base64.b64encode(vtf_format.encode_v2(grid, cursor)).decode("ascii")}
+
+
+class MirrorPublisher:
+    """Sends a model's changes and the frame's speech to every connected viewer"""
+
+    def __init__(self, model, host="127.0.0.1", port=DEFAULT_PORT, snapshot_cells=SNAPSHOT_CELLS):
+        self.model = model
+        self.snapshot_cells = snapshot_cells
+        self._pending = []  # messages since the last flush, UI thread only
+        self._snapshot_due = True
+        self._cells_since_snapshot = 0
+        self._outbox = queue.Queue()
+        self.viewer_count = 0  # updated by the sender thread
+        self.backlog_bytes = 0  # snapshot and edits kept for late joiners, also by the sender
+        self._listener = socket.create_server((host, port))
+        self.address = self._listener.getsockname()[:2]
+        model.subscribe(self._on_change)
+        self._threads = [
+            threading.Thread(target=self._accept_loop, name="vtf-mirror-accept", daemon=True),
+            threading.Thread(target=self._send_loop, name="vtf-mirror-send", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _on_change(self, event, *args):
+        if event == grid_model.CELL_CHANGED:
+            y, x, value = args
+            self._add_cells([int(y)], [int(x)], str(value))
+        elif event == grid_model.CELLS_CHANGED:
+            ys, xs, codes = args
+            self._add_cells(np.asarray(ys).tolist(), np.asarray(xs).tolist(),
+                            np.asarray(codes, dtype='<u4').tobytes().decode("utf-32-le"))
+        elif event == grid_model.GRID_CLEARED:
+            self._pending.append({"type": "clear"})
+            self._cells_since_snapshot += 1
+        elif event == grid_model.GRID_REPLACED:
+            # The snapshot taken at the next flush covers every earlier edit
+            self._pending = [m for m in self._pending if m["type"] not in ("cells", "clear")]
+            self._snapshot_due = True
+        elif event == grid_model.CURSOR_MOVED:
+            x, y = args
+            if self._pending and self._pending[-1]["type"] == "cursor":
+                self._pending.pop()
+            self._pending.append({"type": "cursor", "x": int(x), "y": int(y)})
+
+    def _add_cells(self, ys, xs, text):
+        last = self._pending[-1] if self._pending else None
+        if last is not None and last["type"] == "cells":
+            last["y"] += ys
+            last["x"] += xs
+            last["text"] += text
+        else:
+            self._pending.append({"type": "cells", "y": ys, "x": xs, "text": text})
+        self._cells_since_snapshot += len(ys)
+
+    def speech(self, text):
+        self._pending.append({"type": "speech", "text": text})
+
+    def flush(self):
+        """Hand this frame's changes to the sender; call on the UI thread"""
+        if self._snapshot_due:
+            self._send_snapshot()
+        if self._pending:
+            for message in self._pending:
+                self._outbox.put(("delta", message))
+            self._pending = []
+        if self._cells_since_snapshot >= self.snapshot_cells:
+            # Viewers already have these edits; only late joiners need it
+            self._send_snapshot(broadcast=False)
+
+    def _send_snapshot(self, broadcast=True):
+        message = snapshot_message(self.model.grid, tuple(self.model.cursor))
+        self._outbox.put(("snapshot" if broadcast else "checkpoint", message))
+        self._snapshot_due = False
+        self._cells_since_snapshot = 0
+
+    def close(self):
+        """Tell viewers the session ended and stop the publisher's threads"""
+        self.model.unsubscribe(self._on_change)
+        self.flush()
+        self._outbox.put(("end", {"type": "end"}))
+        try:
+            self._listener.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._listener.close()
+        for thread in self._threads:
+            thread.join()
+
+    def _accept_loop(self):
+        while True:
+            try:
+                conn, _ = self._listener.accept()
+            except OSError:
+                return
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            conn.settimeout(SEND_TIMEOUT)
+            self._outbox.put(("join", conn))
+
+    def _send_loop(self):
+        viewers = []
+        snapshot = None  # encoded, with the edits and cursor since for late joiners
+        log = []
+        cursor = None
+        while True:
+            kind, item = self._outbox.get()
+            if kind == "join":
+                lines = [snapshot] if snapshot is not None else []
+                lines += log
+                if cursor is not None:
+                    lines.append(cursor)
+                if self._send(item, b"".join(lines)):
+                    viewers.append(item)
+                    self.viewer_count = len(viewers)
+                continue
+            line = encode_message(item)
+            if kind in ("snapshot", "checkpoint"):
+                snapshot, log, cursor = line, [], None
+                self.backlog_bytes = len(line)
+                if kind == "checkpoint":
+                    continue
+            elif item["type"] == "cursor":
+                cursor = line
+            elif item["type"] != "speech" and kind != "end":
+                log.append(line)
+                self.backlog_bytes += len(line)
+            viewers = [conn for conn in viewers if self._send(conn, line)]
+            self.viewer_count = len(viewers)
+            if kind == "end":
+                for conn in viewers:
+                    conn.close()
+                return
+
+    @staticmethod
+    def _send(conn, data):
+        try:
+            conn.sendall(data)
+            return True
+        except OSError:
+            conn.close()
+            return False
+
+
+class MirrorViewer:
+    """Rebuilds the student's grid from mirror messages"""
+
+    def __init__(self, on_speech=None):
+        self.model = GridModel(1, 1)
+        self.on_speech = on_speech
+        self.ended = False
+
+    def apply(self, message):
+        kind = message.get("type")
+        model = self.model
+        if kind == "snapshot":
+            grid, cursor = vtf_format.decode_v2(base64.b64decode(message["vtf"]))
+            model.load(grid, cursor)
+        elif kind == "cells":
+            codes = np.frombuffer(message["text"].encode("utf-32-le"), dtype='<u4')
+            model.set_cells(np.asarray(message["y"], dtype=np.intp), np.asarray(message["x"], dtype=np.intp),
+                            codes, record=False)
+        elif kind == "clear":
+            model.load(vtf_format.new_grid(model.rows, model.cols), tuple(model.cursor))
+        elif kind == "cursor":
+            model.move_to(message["x"], message["y"])
+        elif kind == "speech":
+            if self.on_speech is not None:
+                self.on_speech(message["text"])
+        elif kind == "end":
+            self.ended = True
+
+    def follow(self, lines):
+        """Apply messages from an iterable of JSON lines until the session ends"""
+        for line in lines:
+            self.apply(json.loads(line))
+            if self.ended:
+                break
+
+
+def connect(host, port):
+    sock = socket.create_connection((host, port))
+    return sock, sock.makefile("rb")
+
+
+def run_text(host, port):
+    """Print speech as it arrives and the final grid when the session ends"""
+    viewer = MirrorViewer(on_speech=lambda text: print(f"speech: {text}", flush=True))
+    sock, lines = connect(host, port)
+    print("connected", flush=True)
+    try:
+        viewer.follow(lines)
+    finally:
+        sock.close()
+    print(f"cursor: {viewer.model.cursor.x},{viewer.model.cursor.y}")
+    for row in viewer.model.row_strings():
+        print(f"row: {row}")
+    return 0
+
+
+def run_window(host, port):
+    import pygame
+
+    cell = 24
+    spoken = [""]
+    viewer = MirrorViewer(on_speech=lambda text: spoken.__setitem__(0, text))
+    sock, lines = connect(host, port)
+    messages = queue.Queue()
+
+    def receive():
+        for line in lines:
+            messages.put(json.loads(line))
+        messages.put({"type": "end"})
+
+    threading.Thread(target=receive, daemon=True).start()
+    pygame.init()
+    pygame.display.set_caption(f"Virtual Taylor Frame - Mirror of {host}:{port}")
+    font = pygame.font.SysFont("monospace", 20)
+    screen = None
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+        while True:
+            try:
+                viewer.apply(messages.get_nowait())
+            except queue.Empty:
+                break
+        model = viewer.model
+        size = (max(480, model.cols * cell), model.rows * cell + 40)
+        if screen is None or screen.get_size() != size:
+            screen = pygame.display.set_mode(size)
+        screen.fill((255, 255, 255))
+        pygame.draw.rect(screen, (255, 255, 0), (model.cursor.x * cell, model.cursor.y * cell, cell, cell))
+        for y in range(model.rows):
+            row = model.row_text(y).rstrip()
+            for x, char in enumerate(row):
+                if char != ' ':
+                    screen.blit(font.render(char, True, (0, 0, 0)), (x * cell + 6, y * cell + 2))
+        status = "Session ended" if viewer.ended else spoken[0]
+        screen.blit(font.render(status, True, (0, 0, 128)), (6, model.rows * cell + 10))
+        pygame.display.flip()
+        pygame.time.wait(15)
+    sock.close()
+    pygame.quit()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Follow a student's grid live")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--text", action="store_true",
+                        help="print speech and the final grid instead of opening a window")
+    args = parser.parse_args(argv)
+    if args.text:
+        return run_text(args.host, args.port)
+    return run_window(args.host, args.port)
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,151 @@
+# Frame profiler for Virtual Taylor Frame
+# While capture is on, named spans around each phase of the run() loop and
+# around selected handler methods are stored as (name, start, duration) in
+# fixed-size NumPy ring buffers. Handler methods are wrapped only while
+# capturing, so a disabled profiler adds nothing to those calls. Captures
+# export to the Chrome trace-event JSON format (chrome://tracing, Perfetto).
+
+import functools
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+
+DEFAULT_CAPACITY = 1 << 16  # spans kept; the oldest are overwritten
+
+
+class _NullSpan:
+    """Shared context manager used while the profiler is off"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter_ns() - self.start)
+        return False
+
+
+class Profiler:
+    """Ring buffer of timed spans for one thread"""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.enabled = False
+        self.names = []
+        self._name_ids = {}
+        self.name_ids = self.starts = self.durations = None
+        self.count = 0
+        self._target = None
+        self._wrapped = []
+        self.thread_id = threading.get_ident()
+
+    def span(self, name):
+        """Context manager timing the enclosed block while capturing"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name, start_ns, duration_ns):
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = self._name_ids[name] = len(self.names)
+            self.names.append(name)
+        slot = self.count % self.capacity
+        self.name_ids[slot] = name_id
+        self.starts[slot] = start_ns
+        self.durations[slot] = duration_ns
+        self.count += 1
+
+    def start(self, target=None, method_names=()):
+        """Begin a new capture, timing the named methods of target as well"""
+        if self.enabled:
+            return
+        # Fresh buffers, so an export of the previous capture can still read the old ones
+        self.name_ids = np.zeros(self.capacity, dtype=np.int32)
+        self.starts = np.zeros(self.capacity, dtype=np.int64)
+        self.durations = np.zeros(self.capacity, dtype=np.int64)
+        self.names = []
+        self._name_ids = {}
+        self.count = 0
+        self.thread_id = threading.get_ident()
+        self.enabled = True
+        if target is not None:
+            self._target = target
+            for name in method_names:
+                method = getattr(target, name)
+                setattr(target, name, self._wrap(name, method))
+                self._wrapped.append(name)
+
+    def stop(self):
+        """End the capture and restore the original methods"""
+        self.enabled = False
+        for name in self._wrapped:
+            # The wrapper is an instance attribute shadowing the class method
+            self._target.__dict__.pop(name, None)
+        self._wrapped = []
+        self._target = None
+
+    def _wrap(self, name, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.record(name, start, time.perf_counter_ns() - start)
+        return wrapper
+
+    def spans(self):
+        """Copy of the captured spans, oldest first: (names, name_ids, starts, durations)"""
+        if self.starts is None:
+            empty = np.zeros(0, dtype=np.int64)
+            return [], empty.astype(np.int32), empty, empty
+        if self.count <= self.capacity:
+            order = np.arange(self.count)
+        else:
+            order = (np.arange(self.capacity) + self.count) % self.capacity
+        return list(self.names), self.name_ids[order], self.starts[order], self.durations[order]
+
+    def to_chrome_trace(self):
+        return chrome_trace(self.spans(), self.thread_id)
+
+
+def chrome_trace(spans, thread_id=0):
+    """Chrome trace-event document for spans returned by Profiler.spans()"""
+    names, name_ids, starts, durations = spans
+    origin = int(starts.min()) if starts.size else 0
+    pid = os.getpid()
+    events = [
+        {"name": names[name_id], "ph": "X", "pid": pid, "tid": thread_id,
+         "ts": (start - origin) / 1000, "dur": duration / 1000}
+        for name_id, start, duration in zip(name_ids.tolist(), starts.tolist(), durations.tolist())
+    ]
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write_chrome_trace(path, spans, thread_id=0):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(chrome_trace(spans, thread_id), f)
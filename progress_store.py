@@ -0,0 +1,198 @@
+# Progress store for Virtual Taylor Frame
+# Keeps tutorial results per student in a local SQLite database so progress
+# survives restarts. Writes are queued and committed in batches by a
+# background thread; reads are small indexed queries made on demand.
+
+import argparse
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS challenge_results (
+    id INTEGER PRIMARY KEY,
+    student TEXT NOT NULL,
+    tutorial TEXT NOT NULL,
+    challenge INTEGER NOT NULL,
+    attempts INTEGER NOT NULL,
+    hints INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    completed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_student_tutorial
+    ON challenge_results (student, tutorial, challenge);
+CREATE TABLE IF NOT EXISTS tutorial_progress (
+    student TEXT NOT NULL,
+    tutorial TEXT NOT NULL,
+    next_challenge INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (student, tutorial)
+) WITHOUT ROWID;
+"""
+
+INSERT_RESULT = """
+INSERT INTO challenge_results (student, tutorial, challenge, attempts, hints, seconds, completed_at)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+UPSERT_PROGRESS = """
+INSERT INTO tutorial_progress (student, tutorial, next_challenge, total, updated_at)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (student, tutorial) DO UPDATE SET
+    next_challenge = excluded.next_challenge,
+    total = excluded.total,
+    updated_at = excluded.updated_at
+"""
+
+
+def default_db_path():
+    """Location of the progress database in the user's data folder"""
+    return os.path.join(os.path.expanduser("~"), ".virtual_taylor_frame", "progress.db")
+
+
+def connect(path):
+    """Open the database in WAL mode and make sure the schema exists"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class ProgressStore:
+    """Tutorial progress for every student on this machine"""
+
+    _STOP = object()
+
+    def __init__(self, path=None, batch_size=64, flush_interval=1.0):
+        self.path = path or default_db_path()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._conn = connect(self.path)
+        self._read_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="progress-writer", daemon=True)
+        self._writer.start()
+
+    def record_result(self, student, tutorial, challenge, attempts, hints, seconds):
+        """Queue the result of a solved challenge"""
+        self._queue.put((INSERT_RESULT, (student, tutorial, challenge, attempts, hints, seconds, time.time())))
+
+    def set_progress(self, student, tutorial, next_challenge, total):
+        """Queue the challenge a student should resume a tutorial at"""
+        self._queue.put((UPSERT_PROGRESS, (student, tutorial, next_challenge, total, time.time())))
+
+    def flush(self):
+        """Block until every queued write has been committed"""
+        self._queue.join()
+
+    def close(self):
+        """Commit pending writes and stop the writer thread"""
+        if self._writer.is_alive():
+            self._queue.put(self._STOP)
+            self._writer.join()
+        self._conn.close()
+
+    def _write_loop(self):
+        conn = connect(self.path)
+        running = True
+        while running:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = [item]
+            # Drain whatever else is waiting so it lands in the same transaction
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            writes = [entry for entry in batch if entry is not self._STOP]
+            running = len(writes) == len(batch)
+            try:
+                with conn:
+                    for sql, params in writes:
+                        conn.execute(sql, params)
+            except sqlite3.Error as e:
+                print(f"Progress store error: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        conn.close()
+
+    def _query(self, sql, params=()):
+        with self._read_lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def resume_point(self, student, tutorial):
+        """Index of the challenge to resume at; 0 for new or finished tutorials"""
+        rows = self._query(
+            "SELECT next_challenge, total FROM tutorial_progress WHERE student = ? AND tutorial = ?",
+            (student, tutorial)
+        )
+        if not rows:
+            return 0
+        next_challenge, total = rows[0]
+        return next_challenge if next_challenge < total else 0
+
+    def student_summary(self, student):
+        """Per-tutorial totals for one student"""
+        rows = self._query(
+            """
+            SELECT tutorial, COUNT(DISTINCT challenge), SUM(attempts), SUM(hints), SUM(seconds)
+            FROM challenge_results WHERE student = ?
+            GROUP BY tutorial ORDER BY tutorial
+            """,
+            (student,)
+        )
+        return [
+            {"tutorial": r[0], "solved": r[1], "attempts": r[2], "hints": r[3], "seconds": r[4]}
+            for r in rows
+        ]
+
+    def class_summary(self):
+        """Totals for every student, for the teacher"""
+        rows = self._query(
+            """
+            SELECT student, COUNT(DISTINCT tutorial || ':' || challenge), SUM(attempts), SUM(hints), SUM(seconds)
+            FROM challenge_results
+            GROUP BY student ORDER BY student
+            """
+        )
+        return [
+            {"student": r[0], "solved": r[1], "attempts": r[2], "hints": r[3], "seconds": r[4]}
+            for r in rows
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show tutorial progress recorded by Virtual Taylor Frame")
+    parser.add_argument("--db", default=default_db_path(), help="path to progress.db")
+    parser.add_argument("--student", help="show one student's tutorials instead of the class summary")
+    args = parser.parse_args()
+
+    store = ProgressStore(args.db)
+    try:
+        if args.student:
+            print(f"{'Tutorial':<30} {'Solved':>6} {'Tries':>6} {'Hints':>6} {'Minutes':>8}")
+            for row in store.student_summary(args.student):
+                print(f"{row['tutorial']:<30} {row['solved']:>6} {row['attempts']:>6} {row['hints']:>6} {row['seconds'] / 60:>8.1f}")
+        else:
+            print(f"{'Student':<20} {'Solved':>6} {'Tries':>6} {'Hints':>6} {'Minutes':>8}")
+            for row in store.class_summary():
+                print(f"{row['student']:<20} {row['solved']:>6} {row['attempts']:>6} {row['hints']:>6} {row['seconds'] / 60:>8.1f}")
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,359 @@
+# Screen manager for Virtual Taylor Frame
+# Every menu, prompt and the grid itself is a Screen on a stack driven by a
+# single event loop in VirtualTaylorFrame.run()
+
+import pygame
+
+
+class ScreenManager:
+    """Stack of screens; only the top screen receives events and draws"""
+
+    def __init__(self):
+        self.stack = []
+
+    @property
+    def top(self):
+        """The active screen, or None when the stack is empty"""
+        return self.stack[-1] if self.stack else None
+
+    def push(self, screen):
+        """Show a screen on top of the current one"""
+        self.stack.append(screen)
+        screen.on_enter()
+
+    def pop(self):
+        """Close the top screen and resume the one below it"""
+        screen = self.stack.pop() if self.stack else None
+        if self.stack:
+            self.stack[-1].on_resume()
+        return screen
+
+    def replace(self, screen):
+        """Swap the top screen for another without resuming the one below"""
+        if self.stack:
+            self.stack.pop()
+        self.push(screen)
+
+    def pop_to_root(self):
+        """Close everything above the bottom screen"""
+        if len(self.stack) > 1:
+            del self.stack[1:]
+            self.stack[0].on_resume()
+
+    def clear(self):
+        """Close every screen; the event loop stops when the stack is empty"""
+        self.stack.clear()
+
+
+class Screen:
+    """Base class for a screen handled by the ScreenManager"""
+
+    def __init__(self, frame):
+        self.frame = frame
+
+    def on_enter(self):
+        """Called once when the screen is pushed"""
+
+    def on_resume(self):
+        """Called when the screen above this one is popped"""
+
+    def handle_event(self, event):
+        """Handle a single pygame event"""
+
+    def update(self):
+        """Called once per loop iteration after events are handled"""
+
+    def draw(self):
+        """Render the screen; the loop flips the display afterwards"""
+
+
+class GridScreen(Screen):
+    """The main editing grid"""
+
+    def handle_event(self, event):
+        self.frame.handle_grid_event(event)
+
+    def update(self):
+        self.frame.update_fast_move()
+
+    def draw(self):
+        self.frame.draw()
+
+
+class MenuScreen(Screen):
+    """A vertical list of options navigated with Up/Down and Enter"""
+
+    title = ""
+    top_offset = 100
+    spacing = 40
+
+    def __init__(self, frame, options):
+        super().__init__(frame)
+        self.options = options
+        self.selected_index = 0
+
+    def intro_text(self):
+        """Text spoken when the menu first opens"""
+        return self.options[self.selected_index]
+
+    def option_text(self, index):
+        """Text spoken when an option is highlighted"""
+        return self.options[index]
+
+    def on_enter(self):
+        self.frame.speak(self.intro_text())
+
+    def on_resume(self):
+        self.frame.speak(self.option_text(self.selected_index))
+
+    def on_select(self, index):
+        """Handle Enter on the option at index"""
+
+    def on_cancel(self):
+        """Handle Escape"""
+        self.frame.screens.pop()
+
+    def on_quit(self):
+        """Handle the window being closed"""
+        self.frame.quit()
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.on_quit()
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_UP or event.key == pygame.K_DOWN:
+                step = 1 if event.key == pygame.K_DOWN else -1
+                self.selected_index = (self.selected_index + step) % len(self.options)
+                self.frame.play_sound(self.frame.move_sound)
+                self.frame.speak(self.option_text(self.selected_index))
+            elif event.key == pygame.K_RETURN:
+                self.on_select(self.selected_index)
+            elif event.key == pygame.K_ESCAPE:
+                self.on_cancel()
+
+    def draw(self):
+        frame = self.frame
+        frame.screen.fill((255, 255, 255))
+        title_surface = frame.font.render(self.title, True, (0, 0, 0))
+        frame.screen.blit(title_surface, (20, 40))
+
+        y_pos = self.top_offset
+        for i, option in enumerate(self.options):
+            color = (255, 0, 0) if i == self.selected_index else (0, 0, 0)
+            opt_surface = frame.font.render(option, True, color)
+            frame.screen.blit(opt_surface, (20, y_pos))
+            y_pos += self.spacing
+
+
+class MainMenuScreen(MenuScreen):
+    """Choose between Normal and Tutorial mode"""
+
+    title = "Virtual Taylor Frame - Main Menu"
+
+    def __init__(self, frame):
+        super().__init__(frame, ["Normal Mode", "Tutorial Mode", "Exit"])
+
+    def intro_text(self):
+        return f"Welcome to Virtual Taylor Frame. Select mode: {self.options[self.selected_index]}"
+
+    def on_select(self, index):
+        if index == 0:  # Normal Mode
+            if self.frame.restored_session:
+                self.frame.speak("Starting Normal Mode. Your previous work has been restored.")
+            else:
+                self.frame.speak("Starting Normal Mode")
+            self.frame.tutorial_mode = False
+            self.frame.screens.pop()
+        elif index == 1:  # Tutorial Mode
+            self.frame.speak("Entering Tutorial Mode")
+            self.frame.tutorial_mode = True
+            self.frame.screens.push(TutorialMenuScreen(self.frame))
+        else:  # Exit
+            self.frame.quit()
+
+    def on_cancel(self):
+        self.frame.quit()
+
+
+class TutorialMenuScreen(MenuScreen):
+    """Choose a tutorial difficulty"""
+
+    title = "Tutorial Mode - Select Difficulty"
+    difficulties = [("easy", "Easy"), ("medium", "Medium"), ("hard", "Hard")]
+
+    def __init__(self, frame):
+        super().__init__(frame, ["Easy Tutorials", "Medium Tutorials", "Hard Tutorials", "Back to Main Menu"])
+
+    def intro_text(self):
+        return f"Tutorial Menu. Select difficulty: {self.options[self.selected_index]}"
+
+    def on_select(self, index):
+        if index < len(self.difficulties):
+            difficulty, name = self.difficulties[index]
+            tutorials = self.frame.tutorial_library.get_all_tutorials()
+            indices = [i for i, t in enumerate(tutorials) if t.difficulty == difficulty]
+            self.frame.screens.push(TutorialListScreen(self.frame, indices, name))
+        else:  # Back
+            self.frame.screens.pop()
+
+
+class TutorialListScreen(MenuScreen):
+    """List the tutorials of one difficulty level"""
+
+    spacing = 35
+
+    def __init__(self, frame, tutorial_indices, difficulty_name):
+        tutorials = frame.tutorial_library.get_all_tutorials()
+        self.tutorial_list = [tutorials[i] for i in tutorial_indices]
+        options = [f"{i+1}. {t.title}" for i, t in enumerate(self.tutorial_list)]
+        options.append("Back")
+        super().__init__(frame, options)
+        self.difficulty_name = difficulty_name
+        self.title = f"{difficulty_name} Tutorials"
+
+    def intro_text(self):
+        return f"{self.difficulty_name} Tutorials. {self.options[self.selected_index]}"
+
+    def option_text(self, index):
+        if index < len(self.tutorial_list):
+            return f"{self.options[index]}. {self.tutorial_list[index].description}"
+        return self.options[index]
+
+    def on_select(self, index):
+        if index < len(self.tutorial_list):
+            self.frame.current_tutorial = self.tutorial_list[index]
+            self.frame.screens.pop_to_root()
+            self.frame.start_tutorial()
+        else:  # Back
+            self.frame.screens.pop()
+
+
+class ConfirmExitScreen(MenuScreen):
+    """Yes/No confirmation before leaving the program"""
+
+    title = "Do you want to exit?"
+
+    def __init__(self, frame):
+        super().__init__(frame, ["Yes", "No"])
+
+    def intro_text(self):
+        return f"Do you want to exit? {self.options[self.selected_index]}"
+
+    def on_select(self, index):
+        if index == 0:  # Yes
+            self.frame.quit()
+        else:  # No
+            self.on_cancel()
+
+    def on_cancel(self):
+        self.frame.speak("Returning to program")
+        self.frame.screens.pop()
+
+    def draw(self):
+        frame = self.frame
+        middle = (frame.rows * frame.cell_size) // 2
+        frame.screen.fill((255, 255, 255))
+        text_surface = frame.font.render(self.title, True, (0, 0, 0))
+        frame.screen.blit(text_surface, (20, middle - 40))
+
+        for i, option in enumerate(self.options):
+            color = (255, 0, 0) if i == self.selected_index else (0, 0, 0)
+            opt_surface = frame.font.render(option, True, color)
+            frame.screen.blit(opt_surface, (20, middle + i * 40))
+
+
+class ConfirmScreen(MenuScreen):
+    """Yes/No question; on_yes runs only if Yes is chosen"""
+
+    def __init__(self, frame, question, on_yes, cancel_speech="Canceled."):
+        super().__init__(frame, ["No", "Yes"])
+        self.title = question
+        self.on_yes = on_yes
+        self.cancel_speech = cancel_speech
+
+    def intro_text(self):
+        return f"{self.title} {self.options[self.selected_index]}"
+
+    def on_select(self, index):
+        if index == 1:  # Yes
+            self.frame.screens.pop()
+            self.on_yes()
+        else:
+            self.on_cancel()
+
+    def on_cancel(self):
+        self.frame.speak(self.cancel_speech)
+        self.frame.screens.pop()
+
+
+class TextInputScreen(Screen):
+    """Single-line text prompt; the result is delivered through callbacks
+
+    on_change, if given, receives the text after every edit; on_cancel runs
+    when Escape closes the prompt.
+    """
+
+    def __init__(self, frame, prompt_text, spoken_prompt, on_submit,
+                 allow_empty=False, cancel_speech="Canceled.", on_empty=None,
+                 on_change=None, on_cancel=None):
+        super().__init__(frame)
+        self.prompt_text = prompt_text
+        self.spoken_prompt = spoken_prompt
+        self.on_submit = on_submit
+        self.allow_empty = allow_empty
+        self.cancel_speech = cancel_speech
+        self.on_empty = on_empty
+        self.on_change = on_change
+        self.on_cancel = on_cancel
+        self.input_str = ""
+
+    def on_enter(self):
+        self.frame.speak(self.spoken_prompt)
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.frame.quit()
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                self.frame.speak(self.cancel_speech)
+                self.frame.screens.pop()
+                if self.on_cancel:
+                    self.on_cancel()
+            elif event.key == pygame.K_RETURN:
+                self.frame.screens.pop()
+                if self.input_str == "" and not self.allow_empty:
+                    if self.on_empty:
+                        self.on_empty()
+                else:
+                    self.on_submit(self.input_str.strip())
+            else:
+                before = self.input_str
+                if event.key == pygame.K_BACKSPACE:
+                    self.input_str = self.input_str[:-1]
+                else:
+                    self.input_str += event.unicode
+                if self.on_change and self.input_str != before:
+                    self.on_change(self.input_str)
+
+    def draw(self):
+        frame = self.frame
+        frame.screen.fill((255, 255, 255))
+        prompt_surface = frame.font.render(self.prompt_text + self.input_str, True, (0, 0, 0))
+        frame.screen.blit(prompt_surface, (20, (frame.rows * frame.cell_size) // 2))
+
+
+class FinishTutorialScreen(Screen):
+    """Congratulations message; any key returns to the main menu"""
+
+    def on_enter(self):
+        tutorial = self.frame.current_tutorial
+        self.frame.speak(f"Congratulations! You've completed {tutorial.title}. Press any key to return to the tutorial menu.")
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.frame.quit()
+        elif event.type == pygame.KEYDOWN:
+            self.frame.screens.replace(MainMenuScreen(self.frame))
+
+    def draw(self):
+        self.frame.draw()
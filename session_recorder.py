@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""Record keystroke sessions and replay them through a headless frame
+
+A recording starts with the grid and cursor at the moment recording began,
+followed by one fixed-size record per KEYDOWN, KEYUP or QUIT event with its
+modifier state and a monotonic timestamp. Replaying feeds the same events to
+the same handlers in a headless frame, at the recorded pace or as fast as
+possible, and captures every speech and sound cue.
+
+    python virtual_taylor_frame.py --record session.vtfk
+    python session_recorder.py session.vtfk --cues
+    python session_recorder.py session.vtfk --realtime --json timings.json
+    python session_recorder.py session.vtfk --trace trace.json
+
+File layout:
+
+    header  "<4sHHI": magic, version, flags, length of the grid blob
+    grid    a version 2 .vtf blob (grid and cursor)
+    events  "<BQiHI" each: kind, microseconds since start, key, mod,
+            unicode code point (0 when the event has none)
+"""
+
+import argparse
+import json
+import struct
+import time
+
+import pygame
+
+import vtf_format
+
+
+MAGIC = b"VTFK"
+VERSION = 1
+FLAG_MAIN_MENU = 1  # the main menu was open when recording started
+HEADER = struct.Struct("<4sHHI")
+RECORD = struct.Struct("<BQiHI")
+
+KIND_KEYDOWN = 1
+KIND_KEYUP = 2
+KIND_QUIT = 3
+EVENT_KINDS = {
+    pygame.KEYDOWN: KIND_KEYDOWN,
+    pygame.KEYUP: KIND_KEYUP,
+    pygame.QUIT: KIND_QUIT,
+}
+KIND_EVENTS = {kind: event_type for event_type, kind in EVENT_KINDS.items()}
+
+
+class SessionRecorder:
+    """Appends input events from the live event loop to a recording"""
+
+    def __init__(self, path, grid, cursor, main_menu=False):
+        self.path = path
+        self.file = open(path, "wb")
+        blob = vtf_format.encode_v2(grid, cursor)
+        flags = FLAG_MAIN_MENU if main_menu else 0
+        self.file.write(HEADER.pack(MAGIC, VERSION, flags, len(blob)))
+        self.file.write(blob)
+        self.start = time.monotonic_ns()
+        self.count = 0
+
+    def record(self, event):
+        """Store the event if it is one the replayer understands"""
+        kind = EVENT_KINDS.get(event.type)
+        if kind is None or self.file is None:
+            return
+        elapsed_us = (time.monotonic_ns() - self.start) // 1000
+        if kind == KIND_QUIT:
+            self.file.write(RECORD.pack(kind, elapsed_us, 0, 0, 0))
+        else:
+            unicode = getattr(event, "unicode", "")
+            code = ord(unicode[0]) if unicode else 0
+            self.file.write(RECORD.pack(kind, elapsed_us, event.key, event.mod & 0xFFFF, code))
+        self.count += 1
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def read_recording(path):
+    """Return (grid, cursor, flags, events) where events is a list of
+    (seconds, pygame event)"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        raise vtf_format.VtfFormatError("Truncated recording")
+    magic, version, flags, blob_size = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise vtf_format.VtfFormatError(f"Unsupported recording version {version}")
+    offset = HEADER.size + blob_size
+    grid, cursor = vtf_format.decode_v2(data[HEADER.size:offset])
+
+    events = []
+    # A crash can leave a partial record at the end; it is ignored
+    usable = offset + (len(data) - offset) // RECORD.size * RECORD.size
+    for kind, elapsed_us, key, mod, code in RECORD.iter_unpack(data[offset:usable]):
+        event_type = KIND_EVENTS.get(kind)
+        if event_type is None:
+            raise vtf_format.VtfFormatError(f"Unknown event kind {kind}")
+        if event_type == pygame.QUIT:
+            event = pygame.event.Event(event_type)
+        else:
+            event = pygame.event.Event(event_type, key=key, mod=mod, unicode=chr(code) if code else "")
+        events.append((elapsed_us / 1e6, event))
+    return grid, cursor, flags, events
+
+
+class ReplayResult:
+    """Cues produced by a replay and how long each event took to handle"""
+
+    def __init__(self):
+        self.cues = []  # (event index, kind, value)
+        self.timings = []  # seconds spent handling each event
+        self.elapsed = 0.0
+
+    def summary(self):
+        timings = sorted(self.timings)
+
+        def percentile(p):
+            if not timings:
+                return 0.0
+            return timings[min(len(timings) - 1, int(p * len(timings)))] * 1000
+
+        return {
+            "events": len(timings),
+            "cues": len(self.cues),
+            "elapsed_s": self.elapsed,
+            "p50_ms": percentile(0.50),
+            "p99_ms": percentile(0.99),
+            "max_ms": timings[-1] * 1000 if timings else 0.0,
+        }
+
+
+def replay(path, realtime=False, trace_path=None):
+    """Feed a recording through a new headless frame and return a ReplayResult
+
+    With trace_path, the replay is profiled and saved as a Chrome trace.
+    """
+    # Imported here so recordings can be read without loading the app
+    from profiler import write_chrome_trace
+    from progress_store import ProgressStore
+    from virtual_taylor_frame import PROFILED_METHODS, VirtualTaylorFrame
+
+    grid, cursor, flags, events = read_recording(path)
+    result = ReplayResult()
+    index = [0]
+
+    def output(kind, value):
+        result.cues.append((index[0], kind, value))
+
+    rows, cols = grid.shape
+    # A private in-memory store keeps replays away from real student progress
+    progress = ProgressStore(":memory:")
+    frame = VirtualTaylorFrame(rows, cols, headless=True, output=output, progress=progress)
+    # Fast move repeats by the recorded time, not the replay's
+    now = [0.0]
+    frame.clock = lambda: now[0]
+    frame._apply_loaded_state(grid, cursor)
+    if flags & FLAG_MAIN_MENU:
+        frame.show_main_menu()
+    if trace_path:
+        frame.profiler.start(frame, PROFILED_METHODS)
+
+    start = time.perf_counter()
+    for i, (at, event) in enumerate(events):
+        if frame.screens.top is None:
+            break
+        if realtime:
+            delay = at - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+        index[0] = i
+        now[0] = at
+        handled = time.perf_counter()
+        frame.handle_event(event)
+        frame.service_background_tasks()
+        if frame.screens.top is not None:
+            frame.screens.top.update()
+        result.timings.append(time.perf_counter() - handled)
+    result.elapsed = time.perf_counter() - start
+    if trace_path:
+        frame.profiler.stop()
+        write_chrome_trace(trace_path, frame.profiler.spans(), frame.profiler.thread_id)
+    frame.io_worker.shutdown(wait=True)
+    progress.close()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded keystroke session headlessly")
+    parser.add_argument("recording", help="file written by virtual_taylor_frame.py --record")
+    parser.add_argument("--realtime", action="store_true", help="keep the recorded pace")
+    parser.add_argument("--cues", action="store_true", help="print every speech and sound cue")
+    parser.add_argument("--json", help="write the timing summary to this file")
+    parser.add_argument("--trace", help="profile the replay and write a Chrome trace to this file")
+    args = parser.parse_args(argv)
+
+    result = replay(args.recording, realtime=args.realtime, trace_path=args.trace)
+    if args.cues:
+        for index, kind, value in result.cues:
+            print(f"{index:>6} {kind:>6} {value}")
+    summary = result.summary()
+    print(f"Replayed {summary['events']} events in {summary['elapsed_s']:.3f} s: "
+          f"p50 {summary['p50_ms']:.3f} ms, p99 {summary['p99_ms']:.3f} ms, "
+          f"max {summary['max_ms']:.3f} ms, {summary['cues']} cues")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
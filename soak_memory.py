@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Soak test: memory must stay flat over thousands of resize, load and tutorial cycles
+
+Runs a headless frame through repeated grid resizes, file loads and complete
+tutorials, and compares traced Python memory and the frame's own accounting
+after a warm-up with the same figures at the end. Exits with status 1 if
+either grew by more than the allowed amount.
+
+    python soak_memory.py --cycles 5000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import memory_report
+
+
+def run_cycle(frame, cycle, path):
+    """One resize, one load and one complete tutorial"""
+    frame._resize_from_input("60,80" if cycle % 2 else "18,25")
+    frame._load_from_path(path)
+
+    tutorials = frame.tutorial_library.get_all_tutorials()
+    frame.current_tutorial = tutorials[cycle % len(tutorials)]
+    frame.tutorial_mode = True
+    frame.start_tutorial()
+    while frame.awaiting_tutorial_answer:
+        challenge = frame.current_tutorial.get_current_challenge()
+        frame.clear_grid()
+        for x, ch in enumerate(challenge.answer[:frame.cols]):
+            frame.set_cell(0, x, ch)
+        frame.check_tutorial_answer()
+    frame.screens.pop_to_root()
+
+
+def measure(frame):
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0], memory_report.memory_report(frame)["accounted"]
+
+
+def soak(cycles=2000, warmup=50, limit=256 * 1024, verbose=True):
+    """Return (traced growth, accounted growth) in bytes; raises AssertionError past limit"""
+    from progress_store import ProgressStore
+    from virtual_taylor_frame import VirtualTaylorFrame
+    import vtf_format
+
+    progress = ProgressStore(":memory:")
+    frame = VirtualTaylorFrame(18, 25, headless=True, output=lambda kind, value: None, progress=progress)
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "worksheet.vtf")
+        grid = vtf_format.new_grid(40, 40)
+        grid[0, :7] = list("12 + 34")
+        vtf_format.write_vtf(path, grid, (0, 0))
+
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        try:
+            for cycle in range(warmup):
+                run_cycle(frame, cycle, path)
+            progress.flush()
+            traced_before, accounted_before = measure(frame)
+            start = time.perf_counter()
+            for cycle in range(warmup, warmup + cycles):
+                run_cycle(frame, cycle, path)
+            elapsed = time.perf_counter() - start
+            progress.flush()
+            traced_after, accounted_after = measure(frame)
+        finally:
+            if not was_tracing:
+                tracemalloc.stop()
+    frame.io_worker.shutdown(wait=True)
+    progress.close()
+
+    traced_growth = traced_after - traced_before
+    accounted_growth = accounted_after - accounted_before
+    if verbose:
+        print(f"{cycles} cycles in {elapsed:.1f} s; traced memory {traced_before} -> {traced_after} bytes "
+              f"({traced_growth:+d}), accounted {accounted_before} -> {accounted_after} bytes "
+              f"({accounted_growth:+d})")
+    assert traced_growth <= limit, f"Traced memory grew by {traced_growth} bytes"
+    assert accounted_growth <= limit, f"Accounted memory grew by {accounted_growth} bytes"
+    return traced_growth, accounted_growth
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--limit-kb", type=int, default=256, help="allowed growth in kilobytes")
+    args = parser.parse_args(argv)
+    try:
+        soak(args.cycles, args.warmup, args.limit_kb * 1024)
+    except AssertionError as e:
+        print(f"FAILED: {e}", file=sys.stderr)
+        return 1
+    print("Memory stayed flat")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,146 @@
+# Speech backends for Virtual Taylor Frame
+# Every backend has speak(text) and close(). speak() must return quickly: it
+# runs on the UI thread for each key press, so backends hand the text to a
+# screen reader or an already running speech process and never wait for the
+# words to be spoken.
+#
+#   tolk        cytolk, for the screen reader or SAPI on Windows
+#   subprocess  spd-say or espeak kept running, one line of text per utterance
+#   null        says nothing
+#   recording   keeps what would have been said in .spoken
+
+import shutil
+import subprocess
+
+try:
+    from cytolk import tolk
+except ImportError:  # cytolk is Windows-only
+    tolk = None
+
+
+# Engines that read one utterance per line from stdin, in order of preference
+SUBPROCESS_COMMANDS = [
+    ["spd-say", "--pipe-mode"],
+    ["espeak-ng"],
+    ["espeak"],
+]
+BACKEND_NAMES = ("auto", "tolk", "subprocess", "null")
+
+
+class SpeechError(RuntimeError):
+    """Raised when a requested speech backend cannot be used here"""
+
+
+class NullBackend:
+    name = "null"
+
+    def speak(self, text):
+        pass
+
+    def close(self):
+        pass
+
+
+class RecordingBackend:
+    """Keeps every utterance, for tests and scripted sessions"""
+    name = "recording"
+
+    def __init__(self):
+        self.spoken = []
+
+    def speak(self, text):
+        self.spoken.append(text)
+
+    def close(self):
+        pass
+
+
+class TolkBackend:
+    name = "tolk"
+
+    def __init__(self):
+        if tolk is None:
+            raise SpeechError("cytolk is not installed")
+        tolk.load()
+
+    def speak(self, text):
+        tolk.speak(text)
+
+    def close(self):
+        tolk.unload()
+
+
+class SubprocessBackend:
+    """A speech program started once and fed one line per utterance.
+
+    Starting a process per utterance costs milliseconds and can reorder
+    speech; writing a line to a running one costs microseconds. If the
+    program exits it is started again on the next utterance.
+    """
+    name = "subprocess"
+
+    def __init__(self, command, stdout=subprocess.DEVNULL):
+        self.command = list(command)
+        self._stdout = stdout
+        self.process = None
+        self._start()
+
+    def _start(self):
+        self.process = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=self._stdout,
+                                        stderr=subprocess.DEVNULL, text=True, encoding="utf-8", bufsize=1)
+
+    def speak(self, text):
+        line = " ".join(str(text).split()) + "\n"
+        try:
+            self.process.stdin.write(line)
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError, ValueError):
+            self._start()
+            self.process.stdin.write(line)
+            self.process.stdin.flush()
+
+    def close(self):
+        """Let the program finish what it was given, then stop it"""
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+
+def find_command():
+    """The first speech program from SUBPROCESS_COMMANDS on the PATH, or None"""
+    for command in SUBPROCESS_COMMANDS:
+        if shutil.which(command[0]):
+            return command
+    return None
+
+
+def create_backend(name="auto"):
+    """A backend by name; "auto" picks cytolk, then a speech program, then silence"""
+    if name not in BACKEND_NAMES:
+        raise SpeechError(f"Unknown speech backend {name!r}")
+    if name in ("auto", "tolk") and tolk is not None:
+        return TolkBackend()
+    if name in ("auto", "subprocess"):
+        command = find_command()
+        if command is not None:
+            return SubprocessBackend(command)
+    if name == "auto" or name == "null":
+        return NullBackend()
+    raise SpeechError(f"The {name} speech backend is not available on this computer")
+
+
+def create_backend_or_fallback(name="auto"):
+    """create_backend(name), or the "auto" choice with the reason printed if
+    that backend cannot be used here"""
+    try:
+        return create_backend(name)
+    except SpeechError as e:
+        backend = create_backend("auto")
+        print(f"Speech error: {e}. Using {backend.name} speech instead.")
+        return backend
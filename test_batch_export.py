@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Test the batch export command"""
+
+import os
+import tempfile
+
+import batch_export
+import vtf_format
+
+
+def test_batch_export():
+    """Every worksheet is exported in each format; the text matches Ctrl+E"""
+    with tempfile.TemporaryDirectory() as tmp:
+        grid = vtf_format.new_grid(4, 6)
+        grid[0, :4] = list("  23")
+        grid[1, :4] = list("+ 34")
+        for name in ("amina", "ben"):
+            vtf_format.write_vtf(os.path.join(tmp, f"{name}.vtf"), grid, (0, 0))
+        out = os.path.join(tmp, "out")
+
+        status = batch_export.main([tmp, "--output", out, "--formats", "txt,csv,json", "--workers", "2"])
+        assert status == 0, "Export should succeed"
+        assert sorted(os.listdir(out)) == [
+            "amina.csv", "amina.json", "amina.txt", "ben.csv", "ben.json", "ben.txt"
+        ]
+        with open(os.path.join(out, "amina.txt"), encoding="utf-8") as f:
+            assert f.read() == "\n".join(vtf_format.grid_to_text_lines(grid))
+        reloaded, _ = vtf_format.read_vtf(os.path.join(out, "ben.json"))
+        assert (reloaded == grid).all(), "JSON export should load as a version 1 file"
+    print("✓ Batch export writes every format")
+
+
+def test_recursive_keeps_subfolders():
+    """Same-named worksheets in different subfolders export to different files"""
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "homework")
+        for folder, text in (("a", "1+1"), ("b", "2+2"), (os.path.join("b", "c"), "3+3")):
+            os.makedirs(os.path.join(source, folder))
+            grid = vtf_format.new_grid(2, 4)
+            grid[0, :3] = list(text)
+            vtf_format.write_vtf(os.path.join(source, folder, "x.vtf"), grid, (0, 0))
+        out = os.path.join(tmp, "out")
+
+        status = batch_export.main([source, "--output", out, "--recursive", "--workers", "2"])
+        assert status == 0, "Export should succeed"
+        for folder, text in (("a", "1+1"), ("b", "2+2"), (os.path.join("b", "c"), "3+3")):
+            with open(os.path.join(out, folder, "x.txt"), encoding="utf-8") as f:
+                assert f.read().startswith(text), folder
+    print("✓ Recursive export mirrors subfolders")
+
+
+if __name__ == "__main__":
+    test_batch_export()
+    test_recursive_keeps_subfolders()
+    print("\n✓ All batch export tests passed!")
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Test the batch grader"""
+
+import csv
+import json
+import os
+import tempfile
+
+import batch_grade
+import vtf_format
+
+
+def test_batch_grade():
+    """Each worksheet is credited with the challenges whose answers it holds"""
+    with tempfile.TemporaryDirectory() as tmp:
+        # Two Digit Addition starts with 12 + 15 = 27, then 23 + 34 = 57
+        complete = vtf_format.new_grid(6, 8)
+        complete[0, :4] = list("  12")
+        complete[1, :4] = list("+ 15")
+        complete[3, :4] = list("  27")
+        complete[5, :4] = list("  57")
+        partial = vtf_format.new_grid(6, 8)
+        partial[3, :4] = list("  27")
+        partial[5, :2] = list("75")
+        vtf_format.write_vtf(os.path.join(tmp, "amina.vtf"), complete, (0, 0))
+        vtf_format.write_vtf(os.path.join(tmp, "ben.vtf"), partial, (0, 0))
+        with open(os.path.join(tmp, "broken.vtf"), "wb") as f:
+            f.write(b"not a worksheet")
+
+        report = os.path.join(tmp, "grades.json")
+        status = batch_grade.main([tmp, "--tutorial", "Two Digit Addition", "--report", report, "--workers", "2"])
+        assert status == 1, "An unreadable worksheet should be reported as a failure"
+        with open(report, encoding="utf-8") as f:
+            results = {r["student"]: r for r in json.load(f)}
+        assert results["amina"]["answers"][:2] == [True, True]
+        assert results["ben"]["answers"][:2] == [True, False]
+        assert "error" in results["broken"]
+        print("✓ Grader credits answers found on each worksheet")
+
+        csv_report = os.path.join(tmp, "grades.csv")
+        batch_grade.main([tmp, "--tutorial", "4", "--report", csv_report, "--workers", "1"])
+        with open(csv_report, encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert [r["student"] for r in rows] == ["amina", "ben", "broken"]
+        assert rows[1]["challenge 1"] == "yes" and rows[1]["challenge 2"] == "no"
+        print("✓ Grader writes a CSV report")
+
+
+if __name__ == "__main__":
+    test_batch_grade()
+    print("\n✓ All batch grader tests passed!")
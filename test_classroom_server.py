@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Test the classroom server with a scripted client"""
+
+import asyncio
+import json
+import os
+import tempfile
+
+import pygame
+
+from classroom_server import ClassroomServer, Session
+from progress_store import ProgressStore
+
+
+async def send(reader, writer, message):
+    writer.write(json.dumps(message).encode("utf-8") + b"\n")
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+async def scripted_session(port):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    welcome = await send(reader, writer, {"type": "hello", "student": "amina", "menu": False})
+    assert welcome["cues"] == [], "Grid session should start silently"
+
+    reply = await send(reader, writer, {"type": "keydown", "seq": 1, "key": pygame.K_2, "unicode": "2"})
+    assert reply["seq"] == 1
+    assert ["sound", "content"] in reply["cues"] and ["speech", "2"] in reply["cues"]
+    print("✓ Typed character is echoed as sound and speech")
+
+    await send(reader, writer, {"type": "keydown", "seq": 2, "key": pygame.K_RIGHT, "unicode": ""})
+    for i, ch in enumerate("+3"):
+        await send(reader, writer, {"type": "keydown", "seq": 3 + i, "key": ord(ch), "unicode": ch})
+        await send(reader, writer, {"type": "keydown", "seq": 5 + i, "key": pygame.K_RIGHT, "unicode": ""})
+    await send(reader, writer, {"type": "keydown", "seq": 7, "key": pygame.K_LCTRL, "unicode": ""})
+    reply = await send(reader, writer, {"type": "keydown", "seq": 8, "key": pygame.K_RETURN, "unicode": "\r"})
+    assert ["speech", "equals 5"] in reply["cues"], reply
+    print("✓ Ctrl+Enter evaluates the row on the server")
+
+    await send(reader, writer, {"type": "keyup", "seq": 9, "key": pygame.K_LCTRL})
+    await send(reader, writer, {"type": "keydown", "seq": 10, "key": pygame.K_ESCAPE, "unicode": "\x1b"})
+    reply = await send(reader, writer, {"type": "keydown", "seq": 11, "key": pygame.K_RETURN, "unicode": "\r"})
+    assert reply.get("closed"), "Confirming exit should close the session"
+    print("✓ Exiting closes the session")
+    writer.close()
+
+
+async def run_server_test(progress):
+    server = ClassroomServer(port=0, progress=progress)
+    await server.start()
+    try:
+        await asyncio.gather(*[scripted_session(server.port) for _ in range(5)])
+        assert not server.sessions, "Closed sessions should be released"
+    finally:
+        server.close()
+
+
+def test_classroom_server():
+    """Several scripted clients share one server process"""
+    with tempfile.TemporaryDirectory() as tmp:
+        progress = ProgressStore(os.path.join(tmp, "progress.db"))
+        try:
+            asyncio.run(run_server_test(progress))
+        finally:
+            progress.close()
+
+
+def test_sessions_have_no_file_access():
+    """File commands are refused and nothing is written on the server"""
+    with tempfile.TemporaryDirectory() as tmp:
+        progress = ProgressStore(os.path.join(tmp, "progress.db"))
+        home = os.environ.get("HOME")
+        os.environ["HOME"] = tmp
+        try:
+            session = Session(5, 8, "amina", progress, show_menu=False)
+            for command in ("save", "load", "export", "paste_file"):
+                session.frame.run_command(command)
+                assert session.take_cues() == [("speech", "Files are not available in this session.")]
+                assert session.frame.screens.top.__class__.__name__ == "GridScreen", "No prompt opens"
+            session.handle({"type": "keydown", "key": pygame.K_F12, "unicode": ""})
+            assert session.take_cues(), "The memory summary is still spoken"
+            assert not os.path.exists(os.path.join(tmp, ".virtual_taylor_frame", "memory-report.txt"))
+            session.close()
+            try:
+                session.frame.io_worker.submit(print)
+                assert False, "The worker should be shut down"
+            except RuntimeError:
+                pass
+        finally:
+            if home is None:
+                del os.environ["HOME"]
+            else:
+                os.environ["HOME"] = home
+            progress.close()
+    print("✓ Sessions have no file access")
+
+
+if __name__ == "__main__":
+    test_classroom_server()
+    test_sessions_have_no_file_access()
+    print("\n✓ All classroom server tests passed!")
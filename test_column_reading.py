@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Test column reading and the cached column views behind it"""
+
+import time
+
+import numpy as np
+
+import vtf_format
+from grid_model import GridModel
+from progress_store import ProgressStore
+from virtual_taylor_frame import VirtualTaylorFrame
+
+
+def test_column_views():
+    model = GridModel(5, 8)
+    model.paste([" 47", "+ 5", "", " 52"])
+    assert model.column_text(1) == "4  5 " and model.column_text(0) == " +   "
+    assert model.column_text(1) is model.column_text(1), "Unchanged columns come from the cache"
+    assert model.column_filled().tolist() == [True, True, True] + [False] * 5
+    assert model.next_content_column(0, 1) == 1
+    assert model.next_content_column(2, 1) is None
+    assert model.next_content_column(7, -1) == 2
+
+    model.set_cell(4, 1, "9")
+    assert model.column_text(1) == "4  59"
+    model.set_cells([0, 1], [6, 6], [ord("1"), ord("2")])
+    assert model.next_content_column(2, 1) == 6 and model.column_text(6) == "12   "
+    model.undo()
+    assert model.next_content_column(2, 1) is None and model.column_text(6).strip() == ""
+    model.replace_area((slice(0, 1), slice(4, 5)), np.array([["x"]]))
+    assert model.next_content_column(2, 1) == 4
+    model.clear()
+    assert model.next_content_column(-1, 1) is None and model.column_text(1).strip() == ""
+    model.paste(["123"])
+    model.resize(6, 2)
+    assert model.column_text(1) == "2     " and model.column_filled().tolist() == [True, True]
+    model.load(vtf_format.new_grid(3, 3), (0, 0))
+    assert model.column_text(1) == "   "
+    print("✓ Column views")
+
+
+def test_tall_grid_reads_from_cache():
+    """Reading a column again after an edit elsewhere does not rescan the grid"""
+    model = GridModel(2000, 200)
+    for y in range(0, 2000, 3):
+        model.set_cell(y, 100, "7")
+    model.column_filled()
+    model.column_text(100)
+    start = time.perf_counter()
+    for x in range(50):
+        model.set_cell(0, x, "1")
+        assert model.next_content_column(99, 1) == 100
+        assert model.column_text(100)[3] == "7"
+    elapsed = (time.perf_counter() - start) / 50
+    assert elapsed < 0.0005, f"{elapsed * 1e6:.0f} µs per edit and read"
+    print(f"✓ Tall grid: {elapsed * 1e6:.0f} µs per edit and read")
+
+
+def test_frame_commands():
+    speech = []
+    progress = ProgressStore(":memory:")
+    frame = VirtualTaylorFrame(5, 8, headless=True, progress=progress,
+                               output=lambda kind, value: kind == "speech" and speech.append(value))
+    frame.paste_text(" 47\n+ 5\n\n 52")
+    frame.run_command("next_content_column")
+    assert tuple(frame.model.cursor) == (1, 0) and speech[-1] == "4 blank 5"
+    frame.run_command("next_content_column")
+    assert speech[-1] == "7 5 blank 2"
+    frame.run_command("next_content_column")
+    assert speech[-1] == "No more content" and tuple(frame.model.cursor) == (2, 0)
+    frame.model.move_to(5, 2)
+    frame.run_command("read_column")
+    assert speech[-1] == "Blank"
+    frame.run_command("previous_content_column")
+    assert tuple(frame.model.cursor) == (2, 0)
+    frame.io_worker.shutdown(wait=True)
+    progress.close()
+    print("✓ Frame column commands")
+
+
+if __name__ == "__main__":
+    test_column_views()
+    test_tall_grid_reads_from_cache()
+    test_frame_commands()
+    print("\n✓ All column reading tests passed!")
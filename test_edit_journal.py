@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Test the autosave edit journal"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+
+import vtf_format
+from edit_journal import EditJournal
+
+
+def test_recover_snapshot_and_journal():
+    """Recovery replays journal records on top of the last snapshot"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "autosave.vtf")
+        journal = EditJournal(path)
+        assert journal.recover() is None, "Nothing to recover yet"
+
+        grid = vtf_format.new_grid(4, 6)
+        grid[0, :3] = list("2+3")
+        journal.snapshot(grid, (2, 0))
+        journal.record_cell(1, 0, "5")
+        journal.record_cell(1, 1, "7")
+        journal.record_cell(1, 1, " ")
+        journal.close()
+
+        recovered, cursor = EditJournal(path).recover()
+        assert vtf_format.grid_to_text_lines(recovered) == ["2+3", "5", "", ""], recovered
+        assert cursor == (2, 0)
+    print("✓ Snapshot plus journal recovers the last session")
+
+
+def test_clear_and_partial_record():
+    """A clear wipes earlier edits and a torn final record is ignored"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "autosave.vtf")
+        journal = EditJournal(path)
+        journal.snapshot(vtf_format.new_grid(3, 3), (0, 0))
+        journal.record_cell(0, 0, "9")
+        journal.record_clear()
+        journal.record_cell(2, 2, "4")
+        journal.close()
+        with open(path + ".journal", "ab") as f:
+            f.write(b"\x01\x00\x00")
+
+        recovered, _ = EditJournal(path).recover()
+        assert vtf_format.grid_to_text_lines(recovered) == ["", "", "  4"]
+    print("✓ Clears and torn records are handled")
+
+
+def test_journal_without_snapshot():
+    """Edits from a session that crashed before its first snapshot are kept"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "autosave.vtf")
+        journal = EditJournal(path)
+        journal.record_cell(0, 1, "8")
+        journal.record_cell(2, 0, "3")
+        journal.close()
+        assert not os.path.exists(path)
+
+        assert EditJournal(path).recover() is None, "No size to replay onto"
+        recovered, cursor = EditJournal(path).recover((3, 4))
+        assert vtf_format.grid_to_text_lines(recovered) == [" 8", "", "3"] and cursor == (0, 0)
+
+        journal = EditJournal(path)
+        journal.snapshot(recovered, cursor)
+        journal.record_cell(1, 1, "1")
+        journal.close()
+        recovered, _ = EditJournal(path).recover((3, 4))
+        assert vtf_format.grid_to_text_lines(recovered) == [" 8", " 1", "3"], "Stale records are not replayed twice"
+    print("✓ A journal with no snapshot is replayed onto a blank grid")
+
+
+def test_compaction_empties_journal():
+    """A snapshot replaces the journal so recovery stays fast"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "autosave.vtf")
+        journal = EditJournal(path, compact_every=100)
+        grid = vtf_format.new_grid(200, 200)
+        journal.snapshot(grid, (0, 0))
+        for i in range(150):
+            grid[i, i] = "x"
+            journal.record_cell(i, i, "x")
+        assert journal.needs_compaction()
+        journal.snapshot(grid, (5, 5))
+        journal.flush()
+        assert os.path.getsize(path + ".journal") == 0, "Journal should be empty after compaction"
+        journal.close()
+
+        start = time.perf_counter()
+        recovered, cursor = EditJournal(path).recover()
+        elapsed = (time.perf_counter() - start) * 1000
+        assert np.array_equal(recovered, grid) and cursor == (5, 5)
+    print(f"✓ Compacted session recovered in {elapsed:.2f} ms")
+
+
+if __name__ == "__main__":
+    test_recover_snapshot_and_journal()
+    test_clear_and_partial_record()
+    test_journal_without_snapshot()
+    test_compaction_empties_journal()
+    print("\n✓ All edit journal tests passed!")
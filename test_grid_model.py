@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Test the display-independent grid model"""
+
+import sys
+
+import grid_model
+from grid_model import GridModel
+
+
+def make_model(rows=6, cols=10, lines=()):
+    model = GridModel(rows, cols)
+    for y, line in enumerate(lines):
+        for x, ch in enumerate(line):
+            if ch != ' ':
+                model.set_cell(y, x, ch)
+    model.history.clear()
+    return model
+
+
+def test_model_runs_without_pygame():
+    """Importing and using the model never loads pygame"""
+    loaded = "pygame" in sys.modules
+    model = make_model(lines=["12 + 34"])
+    assert model.row_text(0) == "12 + 34   "
+    if not loaded:
+        assert "pygame" not in sys.modules
+    assert not hasattr(model.cursor, "__dict__"), "Cursor should use __slots__"
+    print("✓ Model works without pygame")
+
+
+def test_navigation():
+    """Cursor moves stay on the grid and use integers"""
+    model = make_model(lines=["", "   5 6", "", "", "x"])
+    assert model.move(1, 0) and tuple(model.cursor) == (1, 0)
+    assert not model.move(0, -1) and tuple(model.cursor) == (1, 0)
+
+    model.move_to(0, 1)
+    assert model.snap(1, 0) and tuple(model.cursor) == (3, 1)
+    assert model.snap(1, 0) and tuple(model.cursor) == (5, 1)
+    assert not model.snap(1, 0) and tuple(model.cursor) == (9, 1), "No content: stop at the edge"
+    assert type(model.cursor.x) is int
+
+    model.move_to(5, 1)
+    assert model.first_run(1) == "5"
+    model.move_to_next_stack()
+    assert tuple(model.cursor) == (3, 3)
+
+    assert model.move_to_next_content_row(1) == 4 and tuple(model.cursor) == (0, 4)
+    assert model.move_to_next_content_row(1) is None
+    assert model.move_to_next_content_row(-1) == 1
+
+    model.move_to_edge(1, 0)
+    assert tuple(model.cursor) == (9, 1)
+    model.move_to_edge(0, 1)
+    assert tuple(model.cursor) == (9, 5)
+
+    big = make_model(rows=100, cols=3)
+    big.set_cell(70, 1, "7")
+    assert big.next_content_row(0, 1) == 70
+    assert big.next_content_row(99, -1) == 70
+    assert big.next_content_row(70, 1) is None
+    print("✓ Navigation")
+
+
+def test_editing_events_and_undo():
+    """Edits are announced to subscribers and can be undone"""
+    model = make_model()
+    events = []
+    model.subscribe(lambda event, *args: events.append(event))
+
+    model.write_at_cursor("7")
+    assert model.cell(0, 0) == "7"
+    assert model.erase_at_cursor() and not model.erase_at_cursor()
+    model.move_to(2, 3)
+    assert model.undo() is not None and model.cell(0, 0) == "7"
+    assert tuple(model.cursor) == (0, 0), "Undoing one cell moves the cursor to it"
+    assert model.clear() and model.row_text(0).strip() == ""
+    assert model.undo() is not None and model.cell(0, 0) == "7"
+    assert events[:4] == [grid_model.CELL_CHANGED, grid_model.CELL_CHANGED,
+                          grid_model.CURSOR_MOVED, grid_model.CELLS_CHANGED]
+    assert grid_model.GRID_CLEARED in events
+
+    model.resize(3, 4)
+    assert events[-1] == grid_model.GRID_REPLACED
+    assert model.grid.shape == (3, 4) and not model.history.can_undo
+    print("✓ Editing, events and undo")
+
+
+def test_evaluate_row():
+    model = make_model(cols=16, lines=["12 + 34", "123456 * 654321", "import os", "1 +"])
+    assert model.evaluate_row(0) == (grid_model.EVAL_WRITTEN, 46)
+    assert model.row_text(0).rstrip() == "12 + 34 = 46"
+    assert model.evaluate_row(1)[0] == grid_model.EVAL_NO_SPACE
+    assert model.evaluate_row(2)[0] == grid_model.EVAL_ERROR
+    assert model.evaluate_row(3)[0] == grid_model.EVAL_ERROR
+    model.set_cell(5, 0, "$")
+    assert model.evaluate_row(5)[0] == grid_model.EVAL_INVALID
+    print("✓ Row evaluation")
+
+
+def test_row_cache():
+    """Row views are shared and rebuilt only for rows changed since they were read"""
+    model = make_model(lines=["12 + 3", "", "  7"])
+    rows = model.row_strings()
+    assert model.row_text(0) is rows[0] and model.text_lines()[:3] == ["12 + 3", "", "  7"]
+    before = model.version
+    model.set_cell(1, 4, "x")
+    assert model.changed_rows(before).tolist() == [1]
+    assert model.row_version(1) == model.version > max(model.row_version(0), model.row_version(2))
+    after = model.row_strings()
+    assert after[0] is rows[0] and after[2] is rows[2], "Unchanged rows are not rebuilt"
+    assert after[1] == "    x     " and model.text_lines()[1] == "    x"
+    assert model.row_filled().tolist() == [True, True, True, False, False, False]
+    assert model.next_content_row(2, 1) is None and model.next_content_row(5, -1) == 2
+
+    model.set_cells([4, 4], [0, 1], [ord("9"), ord("9")])
+    assert model.text_lines()[4] == "99" and model.next_content_row(2, 1) == 4
+    model.undo()
+    assert model.text_lines()[4] == "" and model.next_content_row(2, 1) is None
+    model.clear()
+    assert not model.row_filled().any() and model.text_lines() == [""] * 6
+    model.paste(["abc"])
+    model.resize(3, 2)
+    assert model.row_strings() == ["ab", "  ", "  "] and model.row_filled().tolist() == [True, False, False]
+    print("✓ Row cache")
+
+
+if __name__ == "__main__":
+    test_model_runs_without_pygame()
+    test_navigation()
+    test_editing_events_and_undo()
+    test_evaluate_row()
+    test_row_cache()
+    print("\n✓ All grid model tests passed!")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Test find and the row index behind it"""
+
+import time
+
+import pygame
+
+import vtf_format
+from grid_model import GridModel
+from grid_search import FindError, GridSearch, compile_query
+from progress_store import ProgressStore
+from virtual_taylor_frame import VirtualTaylorFrame
+
+
+def make_search(lines, rows=5, cols=12):
+    model = GridModel(rows, cols)
+    model.paste(lines)
+    return model, GridSearch(model)
+
+
+def test_queries():
+    assert compile_query("1+2").search("x1+2")
+    assert compile_query(r"/\d+ \+").search("12 + 3")
+    for bad in ("", "/(", "/a*"):
+        try:
+            compile_query(bad)
+            assert False, f"{bad!r} should be rejected"
+        except FindError:
+            pass
+    print("✓ Queries")
+
+
+def test_find_both_ways():
+    model, search = make_search(["12 + 12", "", "3 * 12"])
+    search.set_query("12")
+    assert search.find(0, 0, include_start=True) == (0, 0, "12", False)
+    assert search.find(0, 0) == (5, 0, "12", False)
+    assert search.find(5, 0) == (4, 2, "12", False)
+    assert search.find(4, 2) == (0, 0, "12", True), "Wraps to the top"
+    assert search.find(0, 0, -1) == (4, 2, "12", True), "Wraps to the bottom"
+    assert search.find(4, 2, -1) == (5, 0, "12", False)
+    search.set_query(r"/\d \*")
+    assert search.find(0, 0)[:3] == (0, 2, "3 *")
+    search.set_query("7")
+    assert search.find(0, 0) is None
+    print("✓ Find next and previous")
+
+
+def test_index_follows_edits():
+    model, search = make_search(["12", "34"])
+    search.set_query("9")
+    assert search.find(0, 0) is None
+    model.set_cell(1, 5, "9")
+    assert search.find(0, 0)[:2] == (5, 1)
+    model.clear()
+    assert search.find(0, 0) is None
+    model.paste(["", "", "  99"])
+    assert search.find(0, 0)[:2] == (2, 2)
+    model.resize(2, 12)
+    assert search.find(0, 0) is None
+    print("✓ Index follows edits")
+
+
+def test_large_grid_speed():
+    """After the first query a search over 1000 rows takes well under a millisecond"""
+    model = GridModel(1000, 100)
+    model.load(vtf_format.new_grid(1000, 100), (0, 0))
+    model.set_cell(999, 50, "#")
+    search = GridSearch(model)
+    search.set_query("#")
+    search.find(0, 0)
+    best = min(_timed(search) for _ in range(20))
+    assert best < 0.001, f"Search took {best * 1000:.2f} ms"
+    print(f"✓ 1000-row search in {best * 1e6:.0f} µs")
+
+
+def _timed(search):
+    start = time.perf_counter()
+    assert search.find(0, 0)[:2] == (50, 999)
+    return time.perf_counter() - start
+
+
+def test_frame_find():
+    """Incremental find moves the cursor as you type; Escape goes back"""
+    speech = []
+    progress = ProgressStore(":memory:")
+    frame = VirtualTaylorFrame(5, 12, headless=True, progress=progress,
+                               output=lambda kind, value: kind == "speech" and speech.append(value))
+    frame.paste_text("27 + 45\n\n45 - 27")
+    frame.model.move_to(0, 4)
+
+    def key(code, unicode="", mod=0):
+        frame.handle_event(pygame.event.Event(pygame.KEYDOWN, key=code, mod=mod, unicode=unicode))
+
+    frame.run_command("find")
+    key(pygame.K_4, "4")
+    assert speech[-1] == "Wrapped. 4, row 1, column 6: 27 + 45"
+    key(pygame.K_5, "5")
+    key(pygame.K_RETURN, "\r")
+    assert tuple(frame.model.cursor) == (5, 0)
+    key(pygame.K_g, mod=pygame.KMOD_LCTRL)
+    assert speech[-1] == "45, row 3, column 1: 45 - 27"
+    key(pygame.K_g, mod=pygame.KMOD_LCTRL | pygame.KMOD_LSHIFT)
+    assert tuple(frame.model.cursor) == (5, 0)
+
+    frame.run_command("find")
+    key(pygame.K_SLASH, "/")
+    key(pygame.K_9, "9")
+    assert speech[-1] == "Not found"
+    key(pygame.K_ESCAPE, "\x1b")
+    assert tuple(frame.model.cursor) == (5, 0) and speech[-1] == "Find canceled."
+    frame.io_worker.shutdown(wait=True)
+    progress.close()
+    print("✓ Frame find")
+
+
+if __name__ == "__main__":
+    test_queries()
+    test_find_both_ways()
+    test_index_follows_edits()
+    test_large_grid_speed()
+    test_frame_find()
+    print("\n✓ All find tests passed!")
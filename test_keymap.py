@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Test the keymap and command dispatch"""
+
+import json
+import os
+import tempfile
+
+import pygame
+
+import keymap
+from progress_store import ProgressStore
+from virtual_taylor_frame import VirtualTaylorFrame
+
+
+def key(frame, code, mod=0, unicode=""):
+    frame.handle_event(pygame.event.Event(pygame.KEYDOWN, key=code, mod=mod, unicode=unicode))
+
+
+def test_bindings():
+    """Bindings parse, round-trip and fall back past Shift"""
+    assert keymap.parse_binding("Ctrl+Shift+V") == (pygame.K_v, keymap.CTRL | keymap.SHIFT)
+    assert keymap.parse_binding("ctrl+page up") == (pygame.K_PAGEUP, keymap.CTRL)
+    km = keymap.KeyMap()
+    assert km.bindings()["ctrl+z"] == "undo"
+    assert km.lookup(pygame.K_DOWN, keymap.SHIFT) == "next_stack"
+    assert km.lookup(pygame.K_UP, keymap.SHIFT) == "move_up", "Unbound Shift falls back to the plain key"
+    assert km.lookup(pygame.K_UP, keymap.CTRL | keymap.SHIFT) == "snap_up"
+    assert km.lookup(pygame.K_z, 0) is None
+    assert keymap.modifier_mask(pygame.KMOD_RCTRL | pygame.KMOD_LSHIFT) == keymap.CTRL | keymap.SHIFT
+    for binding, command in keymap.DEFAULT_BINDINGS.items():
+        assert command in keymap.COMMANDS, f"{binding} is bound to an unknown command"
+    for bad in ("hyper+a", "ctrl+nosuchkey"):
+        try:
+            keymap.parse_binding(bad)
+            assert False, f"{bad} should be rejected"
+        except keymap.KeymapError:
+            pass
+    print("✓ Bindings")
+
+
+def test_config_file():
+    """keymap.json adds, changes and removes bindings"""
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "keymap.json")
+        assert keymap.KeyMap.load(path).table == keymap.KeyMap().table
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"f9": "read_row", "ctrl+z": "redo", "escape": None}, f)
+        km = keymap.KeyMap.load(path)
+        assert km.lookup(pygame.K_F9, 0) == "read_row"
+        assert km.lookup(pygame.K_z, keymap.CTRL) == "redo"
+        assert km.lookup(pygame.K_ESCAPE, 0) is None
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"f9": "fly"}, f)
+        try:
+            keymap.KeyMap.load(path)
+            assert False, "Unknown commands should be rejected"
+        except keymap.KeymapError:
+            pass
+    print("✓ Config file")
+
+
+def test_frame_dispatch():
+    """Key events and command names reach the same frame methods"""
+    spoken = []
+    progress = ProgressStore(":memory:")
+    frame = VirtualTaylorFrame(5, 10, headless=True, progress=progress,
+                               output=lambda kind, value: kind == "speech" and spoken.append(value))
+    key(frame, pygame.K_7, unicode="7")
+    key(frame, pygame.K_TAB, unicode="\t")
+    key(frame, pygame.K_F7)
+    assert frame.model.row_text(0).rstrip() == "7", "Tab and keys without text type nothing"
+    key(frame, pygame.K_z, mod=pygame.KMOD_LCTRL, unicode="\x1a")
+    assert frame.model.cell(0, 0) == " " and spoken[-2] == "Undo"
+    frame.run_command("redo")
+    assert frame.model.cell(0, 0) == "7"
+
+    frame.run_command("grid_end")
+    assert tuple(frame.model.cursor) == (9, 4)
+    key(frame, pygame.K_HOME, mod=pygame.KMOD_LCTRL)
+    assert tuple(frame.model.cursor) == (0, 0)
+    try:
+        frame.run_command("fly")
+        assert False, "Unknown commands should raise"
+    except keymap.KeymapError:
+        pass
+
+    key(frame, pygame.K_ESCAPE, unicode="\x1b")
+    assert spoken[-1].startswith("Do you want to exit?")
+    frame.io_worker.shutdown(wait=True)
+    progress.close()
+    print("✓ Frame dispatch")
+
+
+if __name__ == "__main__":
+    test_bindings()
+    test_config_file()
+    test_frame_dispatch()
+    print("\n✓ All keymap tests passed!")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Test the memory report and soak test"""
+
+import time
+import tracemalloc
+
+import memory_report
+import soak_memory
+from progress_store import ProgressStore
+from virtual_taylor_frame import VirtualTaylorFrame
+
+
+def test_accounting():
+    """The report counts the grid exactly and does not walk back into the frame"""
+    progress = ProgressStore(":memory:")
+    frame = VirtualTaylorFrame(100, 50, headless=True, progress=progress)
+    assert memory_report.account(frame)["tutorial library"] == 0, "Tutorials load on first use"
+    frame.tutorial_library.get_all_tutorials()
+    tracemalloc.start()
+    try:
+        report = memory_report.memory_report(frame)
+    finally:
+        tracemalloc.stop()
+    components = report["components"]
+    assert components["grid"] == 100 * 50 * 4
+    assert components["undo history"] == frame.history.nbytes
+    assert 0 < components["tutorial library"] < 1024 * 1024
+    assert components["screens"] < components["grid"], "Screens should not count the frame's grid"
+    assert report["tracemalloc"]["top"], "Allocation sites should be listed while tracing"
+    assert components["workbook pages"] == components["mirror"] == 0
+
+    frame.add_page("two")
+    frame.model.paste(["12+3"])
+    frame.model.row_strings()
+    frame.model.column_filled()
+    frame.start_mirror(port=0)
+    frame.service_background_tasks()
+    deadline = time.monotonic() + 5
+    while not frame.mirror.backlog_bytes:
+        assert time.monotonic() < deadline, "The snapshot should reach the sender"
+        time.sleep(0.01)
+    components = memory_report.account(frame)
+    assert components["grid caches"] > 100 * 50, "Every row's text is cached"
+    assert components["workbook pages"] == 2 * 100 * 50 * 4, "Both pages are decoded"
+    assert components["mirror"] >= frame.mirror.backlog_bytes > 0
+    frame.stop_mirror()
+    assert "grid" in memory_report.format_report(report)
+    assert memory_report.spoken_summary(report).startswith("Memory accounted")
+    frame.io_worker.shutdown(wait=True)
+    progress.close()
+    print("✓ Memory report accounts for the frame's parts")
+
+
+def test_short_soak():
+    """A short soak run completes tutorials and stays flat"""
+    soak_memory.soak(cycles=20, warmup=5, verbose=False)
+    print("✓ Short soak run stays flat")
+
+
+if __name__ == "__main__":
+    test_accounting()
+    test_short_soak()
+    print("\n✓ All memory report tests passed!")
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Test mirror mode: deltas, late joiners and a viewer in another process"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pygame
+
+import vtf_format
+from grid_model import GridModel
+from mirror import MirrorPublisher, MirrorViewer, connect
+from progress_store import ProgressStore
+from virtual_taylor_frame import VirtualTaylorFrame
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out"
+        time.sleep(0.01)
+
+
+def test_deltas_follow_edits_not_grid_size():
+    model = GridModel(1000, 1000)
+    publisher = MirrorPublisher(model, port=0)
+    publisher.flush()
+    sock, lines = connect(*publisher.address)
+    snapshot = lines.readline()
+    assert json.loads(snapshot)["type"] == "snapshot"
+
+    model.set_cell(500, 500, "7")
+    model.move_to(501, 500)
+    publisher.flush()
+    delta = lines.readline() + lines.readline()
+    assert len(delta) < 100, f"{len(delta)} bytes for one cell and a cursor move"
+    assert [json.loads(line)["type"] for line in delta.splitlines()] == ["cells", "cursor"]
+
+    publisher.flush()  # nothing changed: nothing is sent
+    model.set_cells([1, 1], [2, 3], [ord("4"), ord("2")])
+    publisher.flush()
+    assert json.loads(lines.readline()) == {"type": "cells", "y": [1, 1], "x": [2, 3], "text": "42"}
+    publisher.close()
+    assert json.loads(lines.readline())["type"] == "end"
+    sock.close()
+    print("✓ Deltas follow edits")
+
+
+def test_late_joiner():
+    """A viewer that joins late sees the same grid as one that watched from the start"""
+    model = GridModel(6, 10)
+    publisher = MirrorPublisher(model, port=0, snapshot_cells=8)
+    early_sock, early_lines = connect(*publisher.address)
+    wait_for(lambda: publisher.viewer_count == 1)
+    for x, char in enumerate("123+456=579"[:10]):
+        model.set_cell(0, x, char)
+        publisher.flush()
+    model.clear()
+    model.paste(["9-4"], 2, 3)
+    model.move_to(4, 3)
+    publisher.flush()
+    late_sock, late_lines = connect(*publisher.address)
+    wait_for(lambda: publisher.viewer_count == 2)
+    model.set_cell(5, 9, "#")
+    model.resize(7, 12)
+    model.set_cell(6, 11, "$")
+    publisher.close()
+
+    grids = []
+    for sock, lines in ((early_sock, early_lines), (late_sock, late_lines)):
+        viewer = MirrorViewer()
+        viewer.follow(lines)
+        sock.close()
+        assert viewer.ended
+        grids.append((viewer.model.row_strings(), tuple(viewer.model.cursor)))
+    assert grids[0] == grids[1] == (model.row_strings(), tuple(model.cursor))
+    print("✓ Late joiner")
+
+
+def test_periodic_snapshots_are_not_sent():
+    """Connected viewers get only edits; the periodic snapshot waits for late joiners"""
+    model = GridModel(50, 50)
+    publisher = MirrorPublisher(model, port=0, snapshot_cells=8)
+    sock, lines = connect(*publisher.address)
+    wait_for(lambda: publisher.viewer_count == 1)
+    publisher.flush()
+    assert json.loads(lines.readline())["type"] == "snapshot"
+    for x in range(20):
+        model.set_cell(0, x, "1")
+        publisher.flush()
+    model.resize(60, 50)
+    publisher.flush()
+    publisher.close()
+    kinds = [json.loads(line)["type"] for line in lines]
+    sock.close()
+    assert kinds == ["cells"] * 20 + ["snapshot", "end"], kinds
+    print("✓ Periodic snapshots are kept, not sent")
+
+
+def test_viewer_process():
+    """A viewer in its own process follows a frame's edits and speech"""
+    speech = []
+    progress = ProgressStore(":memory:")
+    frame = VirtualTaylorFrame(4, 12, headless=True, progress=progress,
+                               output=lambda kind, value: kind == "speech" and speech.append(value))
+    host, port = frame.start_mirror(port=0)
+    viewer = subprocess.Popen(
+        [sys.executable, "mirror.py", "--text", "--host", host, "--port", str(port)],
+        cwd=os.path.dirname(os.path.abspath(__file__)), stdout=subprocess.PIPE, text=True)
+    try:
+        assert viewer.stdout.readline().strip() == "connected"
+        wait_for(lambda: frame.mirror.viewer_count == 1)
+        for char in "12+30":
+            frame.handle_event(pygame.event.Event(pygame.KEYDOWN, key=0, mod=0, unicode=char))
+            frame.service_background_tasks()
+        frame.run_command("evaluate")
+        frame.service_background_tasks()
+        frame.stop_mirror()
+        out, _ = viewer.communicate(timeout=10)
+    finally:
+        if viewer.poll() is None:
+            viewer.kill()
+    rows = [line[len("row: "):] for line in out.splitlines() if line.startswith("row: ")]
+    spoken = [line[len("speech: "):] for line in out.splitlines() if line.startswith("speech: ")]
+    assert rows == frame.model.row_strings()
+    assert speech and spoken == speech, (spoken, speech)
+    assert f"cursor: {frame.model.cursor.x},{frame.model.cursor.y}" in out
+    frame.io_worker.shutdown(wait=True)
+    progress.close()
+    print("✓ Viewer process")
+
+
+if __name__ == "__main__":
+    test_deltas_follow_edits_not_grid_size()
+    test_late_joiner()
+    test_periodic_snapshots_are_not_sent()
+    test_viewer_process()
+    print("\n✓ All mirror tests passed!")
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Test pasting text blocks into the grid"""
+
+import os
+import tempfile
+
+from grid_model import GridModel, text_to_lines
+from progress_store import ProgressStore
+from virtual_taylor_frame import VirtualTaylorFrame
+
+
+def test_text_to_lines():
+    assert text_to_lines("12\t+ 3\r\n\n45\x07\n\n\n") == ["12  + 3", "", "45"]
+    assert text_to_lines("") == []
+    print("✓ Text is split into grid lines")
+
+
+def test_paste_block():
+    """A block is written in one step, clipped to the grid and undone at once"""
+    model = GridModel(4, 6)
+    model.set_cell(1, 5, "z")
+    model.move_to(2, 1)
+    events = []
+    model.subscribe(lambda event, *args: events.append(event))
+    assert model.paste(["123", "", "45678"]) == (3, 4, True)
+    assert model.row_strings() == ["      ", "  123 ", "      ", "  4567"]
+    assert events == ["cells"], "One change event for the whole block"
+    model.undo()
+    assert model.row_strings() == ["      ", "     z", "      ", "      "]
+    assert model.paste(["1"], x=0, y=4) == (0, 0, True)
+    print("✓ Block paste")
+
+
+def test_frame_paste():
+    """Pasting speaks one summary and nothing else"""
+    cues = []
+    progress = ProgressStore(":memory:")
+    frame = VirtualTaylorFrame(60, 20, headless=True, progress=progress,
+                               output=lambda kind, value: cues.append((kind, value)))
+    sheet = "\n".join(f"{n} + {n}" for n in range(50))
+    frame.paste_text(sheet)
+    assert cues == [("speech", "Pasted 50 lines, 7 wide")]
+    assert frame.model.row_text(49).rstrip() == "49 + 49"
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "sheet.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("x" * 30)
+        frame.model.move_to(0, 55)
+        frame._paste_from_path(path)
+    assert cues[-1] == ("speech", "Pasted 1 line, 20 wide, cut to fit the grid")
+    frame.io_worker.shutdown(wait=True)
+    progress.close()
+    print("✓ Frame paste")
+
+
+if __name__ == "__main__":
+    test_text_to_lines()
+    test_paste_block()
+    test_frame_paste()
+    print("\n✓ All paste tests passed!")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Test the frame profiler"""
+
+import json
+import os
+import tempfile
+
+import profiler
+
+
+class Worker:
+    def step(self, n):
+        return sum(range(n))
+
+    def outer(self):
+        return self.step(10)
+
+
+def test_disabled_profiler_is_free():
+    """Nothing is wrapped or recorded until capture starts"""
+    prof = profiler.Profiler()
+    worker = Worker()
+    with prof.span("phase"):
+        worker.outer()
+    assert prof.span("phase") is profiler._NULL_SPAN
+    assert prof.count == 0 and "step" not in worker.__dict__
+    print("✓ Disabled profiler records nothing")
+
+
+def test_capture_and_export():
+    """Spans around blocks and wrapped methods nest in the Chrome trace"""
+    prof = profiler.Profiler()
+    worker = Worker()
+    prof.start(worker, ["outer", "step"])
+    with prof.span("frame"):
+        assert worker.outer() == 45
+    prof.stop()
+    assert "outer" not in worker.__dict__ and "step" not in worker.__dict__, "Methods should be restored"
+    assert worker.step(3) == 3
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "trace.json")
+        profiler.write_chrome_trace(path, prof.spans())
+        with open(path, encoding="utf-8") as f:
+            events = {e["name"]: e for e in json.load(f)["traceEvents"]}
+    assert set(events) == {"frame", "outer", "step"}
+    frame, step = events["frame"], events["step"]
+    assert all(e["ph"] == "X" for e in events.values())
+    assert frame["ts"] <= step["ts"] and step["ts"] + step["dur"] <= frame["ts"] + frame["dur"]
+    print("✓ Captured spans export as a nested Chrome trace")
+
+
+def test_ring_buffer_keeps_newest():
+    """A full buffer overwrites the oldest spans"""
+    prof = profiler.Profiler(capacity=4)
+    prof.start()
+    for i in range(10):
+        prof.record(f"span {i}", i * 100, 10)
+    prof.stop()
+    names, name_ids, starts, _ = prof.spans()
+    assert [names[i] for i in name_ids] == ["span 6", "span 7", "span 8", "span 9"]
+    assert list(starts) == [600, 700, 800, 900]
+    print("✓ Ring buffer keeps the newest spans")
+
+
+if __name__ == "__main__":
+    test_disabled_profiler_is_free()
+    test_capture_and_export()
+    test_ring_buffer_keeps_newest()
+    print("\n✓ All profiler tests passed!")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Test the SQLite progress store"""
+
+import os
+import tempfile
+import time
+
+from progress_store import ProgressStore
+
+
+def test_resume_point():
+    """Resume point follows the last saved challenge and resets when finished"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ProgressStore(os.path.join(tmp, "progress.db"))
+        assert store.resume_point("amina", "Division Basics") == 0, "New tutorial should start at 0"
+
+        store.set_progress("amina", "Division Basics", 2, 4)
+        store.flush()
+        assert store.resume_point("amina", "Division Basics") == 2, "Should resume at challenge 2"
+        assert store.resume_point("ben", "Division Basics") == 0, "Progress is per student"
+
+        store.set_progress("amina", "Division Basics", 4, 4)
+        store.flush()
+        assert store.resume_point("amina", "Division Basics") == 0, "Finished tutorial restarts at 0"
+        store.close()
+    print("✓ Resume point works")
+
+
+def test_summaries_survive_reopen():
+    """Results written in batches are visible after the store is reopened"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "progress.db")
+        store = ProgressStore(path, batch_size=8)
+        for i in range(20):
+            store.record_result("amina", "Two Digit Addition", i % 4, 2, 1, 30.0)
+        store.record_result("ben", "Two Digit Addition", 0, 1, 0, 12.5)
+        store.close()
+
+        store = ProgressStore(path)
+        summary = store.student_summary("amina")
+        assert len(summary) == 1, "Should have one tutorial"
+        assert summary[0]["solved"] == 4, "Should count distinct challenges"
+        assert summary[0]["attempts"] == 40, "Should sum attempts"
+        assert summary[0]["hints"] == 20, "Should sum hints"
+
+        students = [row["student"] for row in store.class_summary()]
+        assert students == ["amina", "ben"], "Class summary should list every student"
+        store.close()
+    print("✓ Batched writes and summaries work")
+
+
+def test_writes_do_not_block():
+    """Queuing a result returns immediately; the writer thread commits it"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ProgressStore(os.path.join(tmp, "progress.db"))
+        start = time.perf_counter()
+        for i in range(1000):
+            store.record_result("amina", "Multiplication Tables", i, 1, 0, 5.0)
+        queued = time.perf_counter() - start
+        store.flush()
+        assert queued < 0.5, f"Queuing 1000 results took {queued:.3f}s"
+        assert store.student_summary("amina")[0]["solved"] == 1000
+        store.close()
+    print(f"✓ 1000 results queued in {queued * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    test_resume_point()
+    test_summaries_survive_reopen()
+    test_writes_do_not_block()
+    print("\n✓ All progress store tests passed!")
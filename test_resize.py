@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Test content-preserving grid resize"""
+
+import pygame
+
+from grid_model import GridModel
+from progress_store import ProgressStore
+from virtual_taylor_frame import VirtualTaylorFrame
+
+
+def test_model_resize():
+    """Content that fits survives; growth reuses the buffer"""
+    model = GridModel(4, 5)
+    model.paste(["12", "+34"])
+    model.move_to(4, 3)
+    model.resize(6, 8)
+    assert model.row_strings()[:2] == ["12      ", "+34     "]
+    assert tuple(model.cursor) == (4, 3)
+    assert model.history.can_undo, "Growing keeps the undo history"
+
+    big = GridModel(20, 20)
+    big.resize(21, 22)
+    assert big.capacity == (30, 30)
+    big.resize(28, 25)
+    assert big.capacity == (30, 30), "Later growth fits in the spare capacity"
+
+    assert model.cells_outside(2, 2) == 1
+    model.resize(2, 2)
+    assert model.row_strings() == ["12", "+3"]
+    assert tuple(model.cursor) == (1, 1), "Cursor is clamped onto the grid"
+    assert not model.history.can_undo
+    model.resize(4, 5)
+    assert model.row_strings() == ["12   ", "+3   ", "     ", "     "], "Truncated cells stay blank"
+    try:
+        model.resize(0, 3)
+        assert False, "Empty grids are rejected"
+    except ValueError:
+        pass
+    print("✓ Model resize")
+
+
+def test_frame_resize_confirmation():
+    """Shrinking over content asks first"""
+    speech = []
+    progress = ProgressStore(":memory:")
+    frame = VirtualTaylorFrame(5, 8, headless=True, progress=progress,
+                               output=lambda kind, value: kind == "speech" and speech.append(value))
+    frame.paste_text("1234\n5678")
+    frame._resize_from_input("10, 12")
+    assert speech[-1] == "Grid resized to 10 by 12" and frame.model.row_text(1).startswith("5678")
+
+    frame._resize_from_input("1,2")
+    assert speech[-1] == "Resizing to 1 by 2 removes 6 filled cells. Resize anyway? No"
+    frame.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN, mod=0, unicode="\r"))
+    assert speech[-1] == "Grid size not changed." and frame.rows == 10
+
+    frame._resize_from_input("1,2")
+    frame.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_DOWN, mod=0, unicode=""))
+    frame.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN, mod=0, unicode="\r"))
+    assert speech[-1] == "Grid resized to 1 by 2" and frame.model.row_strings() == ["12"]
+    frame._resize_from_input("0,4")
+    assert speech[-1] == "Invalid input. Grid size not changed."
+    frame.io_worker.shutdown(wait=True)
+    progress.close()
+    print("✓ Frame resize confirmation")
+
+
+if __name__ == "__main__":
+    test_model_resize()
+    test_frame_resize_confirmation()
+    print("\n✓ All resize tests passed!")
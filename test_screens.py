@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Test the screen stack that drives every menu, prompt and the grid"""
+
+from screens import Screen, ScreenManager
+
+
+class RecordingScreen(Screen):
+    def __init__(self, name, calls):
+        super().__init__(frame=None)
+        self.name = name
+        self.calls = calls
+
+    def on_enter(self):
+        self.calls.append(("enter", self.name))
+
+    def on_resume(self):
+        self.calls.append(("resume", self.name))
+
+
+def test_push_pop_order():
+    calls = []
+    screens = ScreenManager()
+    grid, menu, prompt = (RecordingScreen(name, calls) for name in ("grid", "menu", "prompt"))
+    screens.push(grid)
+    screens.push(menu)
+    assert screens.top is menu
+    assert screens.pop() is menu and screens.top is grid
+    screens.push(menu)
+    screens.push(prompt)
+    screens.pop()
+    assert calls == [("enter", "grid"), ("enter", "menu"), ("resume", "grid"),
+                     ("enter", "menu"), ("enter", "prompt"), ("resume", "menu")]
+    print("✓ Push and pop")
+
+
+def test_replace_and_pop_to_root():
+    calls = []
+    screens = ScreenManager()
+    grid, menu, prompt, confirm = (RecordingScreen(name, calls)
+                                   for name in ("grid", "menu", "prompt", "confirm"))
+    screens.push(grid)
+    screens.push(menu)
+    screens.replace(prompt)
+    assert screens.stack == [grid, prompt]
+    assert calls[-1] == ("enter", "prompt"), "Replace resumes nothing below"
+    screens.push(confirm)
+    del calls[:]
+    screens.pop_to_root()
+    assert screens.stack == [grid] and calls == [("resume", "grid")]
+    screens.pop_to_root()
+    assert calls == [("resume", "grid")], "Nothing to close, nothing resumed"
+    screens.replace(menu)
+    assert screens.stack == [menu]
+    screens.clear()
+    assert screens.top is None
+    print("✓ Replace and pop to root")
+
+
+def test_empty_stack():
+    screens = ScreenManager()
+    assert screens.top is None
+    assert screens.pop() is None
+    screens.pop_to_root()
+    screens.clear()
+    calls = []
+    only = RecordingScreen("only", calls)
+    screens.push(only)
+    assert screens.pop() is only and screens.top is None
+    assert calls == [("enter", "only")], "Popping the last screen resumes nothing"
+    print("✓ Empty stack")
+
+
+if __name__ == "__main__":
+    test_push_pop_order()
+    test_replace_and_pop_to_root()
+    test_empty_stack()
+    print("\n✓ All screen tests passed!")
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Test region selection, copy, fill and row and column shifts"""
+
+import pygame
+
+import vtf_format
+from grid_model import GridModel
+from progress_store import ProgressStore
+from undo_history import UndoHistory
+from virtual_taylor_frame import VirtualTaylorFrame
+
+
+def make_model(lines, rows=5, cols=6):
+    model = GridModel(rows, cols)
+    model.put_block(0, 0, vtf_format.lines_to_grid(lines, len(lines), cols))
+    model.history.clear()
+    return model
+
+
+def test_regions():
+    """Selections are rectangles whatever the corner order; fills are one edit"""
+    model = make_model(["123", "456"])
+    model.move_to(2, 1)
+    model.start_selection()
+    model.move_to(1, 0)
+    area = model.selection()
+    assert model.copy_area(area).tolist() == [["2", "3"], ["5", "6"]]
+    assert model.fill_area(area, "x") == 4
+    assert model.row_strings()[:2] == ["1xx   ", "4xx   "]
+    assert model.fill_area(area, "x") == 0, "Unchanged cells are not edits"
+    model.undo()
+    assert model.row_strings()[:2] == ["123   ", "456   "]
+    model.load(model.grid, (0, 0))
+    assert model.selection() is None
+    print("✓ Regions")
+
+
+def test_row_and_column_shifts():
+    model = make_model(["12", "34", "", "", "5"])
+    assert not model.insert_rows(1), "Content on the last row would be lost"
+    model.delete_rows(2, 2)
+    assert model.row_strings() == ["12    ", "34    ", "5     ", "      ", "      "]
+    assert model.insert_rows(1)
+    assert model.row_strings() == ["12    ", "      ", "34    ", "5     ", "      "]
+    assert model.insert_columns(0, 2)
+    assert model.row_strings()[0] == "  12  "
+    model.delete_columns(0, 3)
+    assert model.row_strings()[0] == "2     "
+    for _ in range(3):
+        model.undo()
+    assert model.row_strings() == ["12    ", "34    ", "5     ", "      ", "      "]
+    print("✓ Row and column shifts")
+
+
+def test_too_large_to_undo():
+    """Shifts and fills bigger than the undo history say they cannot be undone"""
+    model = GridModel(5, 6, history=UndoHistory(capacity=6))
+    model.put_block(0, 0, vtf_format.lines_to_grid(["12", "34"], 2, 6))
+    assert model.undoable
+    assert model.insert_rows(0, 2) and not model.undoable, "Eight cells change"
+    assert model.undo() is None, "The history was cleared"
+    model.fill_area((slice(0, 1), slice(0, 2)), "x")
+    assert model.undoable
+    model.undo()
+    assert model.row_strings()[0] == "      "
+
+    speech = []
+    progress = ProgressStore(":memory:")
+    frame = VirtualTaylorFrame(5, 8, headless=True, progress=progress,
+                               output=lambda kind, value: kind == "speech" and speech.append(value))
+    frame.model.history = UndoHistory(capacity=6)
+    frame.paste_text("27\n+45")
+    frame.model.move_to(0, 0)
+    frame.run_command("insert_rows")
+    assert speech[-1] == "Inserted 1 row, too large to undo"
+    frame.run_command("delete_rows")
+    assert speech[-1] == "Deleted 1 row, too large to undo"
+    frame.model.move_to(0, 0)
+    frame.run_command("clear_selection")
+    assert speech[-1] == "Cleared 1 cell"
+    frame.run_command("clear_grid")
+    assert speech[-1] == "Grid cleared"
+    frame.io_worker.shutdown(wait=True)
+    progress.close()
+    print("✓ Edits too large to undo are announced")
+
+
+def test_frame_commands():
+    """Each command is one edit with one confirmation"""
+    speech = []
+    progress = ProgressStore(":memory:")
+    frame = VirtualTaylorFrame(5, 8, headless=True, progress=progress,
+                               output=lambda kind, value: kind == "speech" and speech.append(value))
+    frame.paste_text("27\n+45")
+    for insert, delete in (("insert_rows", "delete_rows"), ("insert_columns", "delete_columns")):
+        frame.run_command("toggle_selection")
+        frame.run_command(insert)
+        assert frame.model.anchor is None, "The selected cells moved, so the selection ends"
+        frame.run_command(delete)
+    assert frame.model.row_strings()[:2] == ["27      ", "+45     "]
+    frame.run_command("toggle_selection")
+    frame.model.move_to(2, 1)
+    frame.run_command("copy")
+    assert speech[-1] == "Copied 2 rows by 3 columns"
+    frame.model.move_to(6, 2)
+    del speech[:]
+    frame.run_command("paste_selection")
+    assert speech == ["Pasted 2 rows by 2 columns, cut to fit the grid"]
+    assert frame.model.row_strings()[2:4] == ["      27", "      +4"]
+
+    frame.model.move_to(0, 1)
+    frame.run_command("insert_rows")
+    assert speech[-1] == "Inserted 1 row"
+    assert frame.model.row_strings() == ["27      ", "        ", "+45     ", "      27", "      +4"]
+
+    frame.run_command("toggle_selection")
+    frame.model.move_to(1, 2)
+    frame.run_command("fill_selection")
+    frame.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_0, mod=0, unicode="0"))
+    frame.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN, mod=0, unicode="\r"))
+    assert speech[-1] == "Filled 2 rows by 2 columns with 0"
+    assert frame.model.row_strings()[1:3] == ["00      ", "005     "]
+    frame.run_command("clear_selection")
+    assert speech[-1] == "Cleared 1 cell"
+    frame.io_worker.shutdown(wait=True)
+    progress.close()
+    print("✓ Frame selection commands")
+
+
+if __name__ == "__main__":
+    test_regions()
+    test_row_and_column_shifts()
+    test_too_large_to_undo()
+    test_frame_commands()
+    print("\n✓ All selection tests passed!")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Test recording and replaying keystroke sessions"""
+
+import os
+import tempfile
+import time
+
+import pygame
+
+import session_recorder
+import vtf_format
+
+
+def key_events(text):
+    events = []
+    for ch in text:
+        key = ord(ch.lower()) if ch.isalnum() else pygame.K_SPACE
+        events.append(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode=ch))
+        events.append(pygame.event.Event(pygame.KEYUP, key=key, mod=0, unicode=""))
+    return events
+
+
+def test_record_and_replay():
+    """A replay starts from the recorded grid and reproduces the spoken cues"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "session.vtfk")
+        grid = vtf_format.new_grid(5, 8)
+        grid[0, :2] = list("42")
+        recorder = session_recorder.SessionRecorder(path, grid, (0, 1))
+        events = key_events("7")
+        events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_UP, mod=0, unicode=""))
+        events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RIGHT, mod=pygame.KMOD_LSHIFT, unicode=""))
+        events.append(pygame.event.Event(pygame.MOUSEMOTION, pos=(1, 1)))
+        for event in events:
+            recorder.record(event)
+        recorder.close()
+        assert recorder.count == 4, "Mouse events should not be recorded"
+
+        loaded_grid, cursor, flags, replayed = session_recorder.read_recording(path)
+        assert (loaded_grid == grid).all() and cursor == (0, 1) and flags == 0
+        assert [e.type for _, e in replayed] == [pygame.KEYDOWN, pygame.KEYUP, pygame.KEYDOWN, pygame.KEYDOWN]
+        assert replayed[3][1].mod == pygame.KMOD_LSHIFT
+        assert all(a <= b for (a, _), (b, _) in zip(replayed, replayed[1:])), "Timestamps should be monotonic"
+        print("✓ Recording stores the grid and key events")
+
+        first = session_recorder.replay(path)
+        second = session_recorder.replay(path, realtime=True)
+        speech = [value for _, kind, value in first.cues if kind == "speech"]
+        assert "7" in speech, f"Typed digit should be spoken, got {speech}"
+        assert first.cues == second.cues, "Replays should be repeatable"
+        assert first.summary()["events"] == 4
+        print("✓ Replay reproduces the session's cues")
+
+        with open(path, "ab") as f:
+            f.write(b"\x01\x02")
+        assert len(session_recorder.read_recording(path)[3]) == 4, "A partial record should be ignored"
+        print("✓ Partial records from a crash are ignored")
+
+
+def test_replay_fast_move():
+    """Fast move repeats follow the recorded key presses and times"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "fast.vtfk")
+        recorder = session_recorder.SessionRecorder(path, vtf_format.new_grid(3, 20), (0, 0))
+        recorder.record(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F4, mod=0, unicode=""))
+        recorder.record(pygame.event.Event(pygame.KEYUP, key=pygame.K_F4, mod=0, unicode=""))
+        recorder.record(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RIGHT, mod=0, unicode=""))
+        for _ in range(3):
+            time.sleep(0.15)
+            recorder.record(pygame.event.Event(pygame.KEYUP, key=pygame.K_LSHIFT, mod=0, unicode=""))
+        recorder.record(pygame.event.Event(pygame.KEYUP, key=pygame.K_RIGHT, mod=0, unicode=""))
+        time.sleep(0.15)
+        recorder.record(pygame.event.Event(pygame.KEYUP, key=pygame.K_LSHIFT, mod=0, unicode=""))
+        recorder.close()
+
+        first = session_recorder.replay(path)
+        second = session_recorder.replay(path)
+        assert first.cues == second.cues, "Replays should be repeatable"
+        moved = {index for index, kind, value in first.cues if kind == "sound" and index >= 3}
+        assert moved == {3, 4, 5}, f"One repeat per held 100 ms, none after release: {first.cues}"
+    print("✓ Replay repeats fast move from the recording")
+
+
+if __name__ == "__main__":
+    test_record_and_replay()
+    test_replay_fast_move()
+    print("\n✓ All session recorder tests passed!")
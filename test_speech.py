@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Test the speech backends"""
+
+import os
+import sys
+import tempfile
+import time
+
+import speech
+from progress_store import ProgressStore
+from virtual_taylor_frame import VirtualTaylorFrame
+
+
+# Stands in for espeak: writes each line it reads to a file
+ECHO_ENGINE = "import sys\nsys.stdin.reconfigure(encoding='utf-8')\n" \
+              "with open(sys.argv[1], 'a', encoding='utf-8') as f:\n" \
+              "    for line in sys.stdin:\n        f.write(line)\n        f.flush()\n"
+
+
+def read_lines(path, count, timeout=5):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with open(path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            lines = []
+        if len(lines) >= count or time.monotonic() > deadline:
+            return lines
+        time.sleep(0.01)
+
+
+def test_subprocess_backend():
+    """One process speaks every utterance in order and is restarted if it exits"""
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "spoken.txt")
+        backend = speech.SubprocessBackend([sys.executable, "-c", ECHO_ENGINE, path])
+        first = backend.process.pid
+        for text in ("12 plus 30", "equals\n42", "½ left paren"):
+            backend.speak(text)
+        assert backend.process.pid == first, "Utterances go to the running process"
+        assert len(read_lines(path, 3)) == 3
+        backend.process.kill()
+        backend.process.wait()
+        backend.speak("after a crash")
+        assert backend.process.pid != first
+        backend.close()
+        lines = read_lines(path, 4)
+        assert lines == ["12 plus 30", "equals 42", "½ left paren", "after a crash"], lines
+    print("✓ Subprocess backend")
+
+
+def test_create_backend():
+    assert isinstance(speech.create_backend("null"), speech.NullBackend)
+    assert speech.create_backend("auto").name in ("tolk", "subprocess", "null")
+    try:
+        speech.create_backend("braille")
+        assert False, "Unknown backends are rejected"
+    except speech.SpeechError:
+        pass
+    if speech.tolk is None:
+        try:
+            speech.create_backend("tolk")
+            assert False, "tolk needs cytolk"
+        except speech.SpeechError:
+            pass
+    fallback = speech.create_backend_or_fallback("braille")
+    assert fallback.name in ("tolk", "subprocess", "null"), "An unusable backend falls back to auto"
+    fallback.close()
+    print("✓ Create backend")
+
+
+def test_frame_records_speech():
+    backend = speech.RecordingBackend()
+    progress = ProgressStore(":memory:")
+    frame = VirtualTaylorFrame(4, 10, headless=True, progress=progress, speech_backend=backend)
+    frame.input_value("(")
+    frame.run_command("toggle_fast_move")
+    assert backend.spoken[-2:] == ["left paren", "Fast move on"], backend.spoken
+    frame.io_worker.shutdown(wait=True)
+    progress.close()
+    print("✓ Frame speaks through its backend")
+
+
+if __name__ == "__main__":
+    test_subprocess_backend()
+    test_create_backend()
+    test_frame_records_speech()
+    print("\n✓ All speech tests passed!")
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Test the undo/redo ring buffer"""
+
+import numpy as np
+
+from undo_history import UndoHistory
+
+
+def test_undo_redo_cells():
+    """Single-cell edits undo and redo in order"""
+    history = UndoHistory(capacity=16)
+    history.record_cell(0, 0, " ", "1")
+    history.record_cell(0, 1, " ", "2")
+
+    ys, xs, codes = history.undo()
+    assert (ys[0], xs[0], chr(codes[0])) == (0, 1, " "), "Should undo the last edit first"
+    ys, xs, codes = history.undo()
+    assert (ys[0], xs[0], chr(codes[0])) == (0, 0, " ")
+    assert history.undo() is None, "Nothing left to undo"
+
+    ys, xs, codes = history.redo()
+    assert chr(codes[0]) == "1", "Redo should reapply the new value"
+    history.record_cell(3, 3, " ", "9")
+    assert not history.can_redo, "A new edit discards the redo stack"
+    print("✓ Undo and redo work")
+
+
+def test_group_stores_only_changed_cells():
+    """Clearing a large grid stores one delta per occupied cell"""
+    history = UndoHistory(capacity=1000)
+    grid = np.full((1000, 1000), ' ', dtype='<U1')
+    grid[10, :5] = list("12+34")
+    grid[900, 7] = "x"
+    ys, xs = np.nonzero(grid != ' ')
+    assert history.record(ys, xs, grid[ys, xs].view(np.uint32), np.full(len(ys), ord(' ')))
+    grid[:] = ' '
+
+    ys, xs, codes = history.undo()
+    assert len(ys) == 6, "Only the six occupied cells are stored"
+    grid[ys, xs] = codes.view('<U1')
+    assert "".join(grid[10, :5]) == "12+34" and grid[900, 7] == "x"
+    print("✓ Undoing a clear restores only the changed cells")
+
+
+def test_memory_is_bounded():
+    """Old edits are dropped once the ring buffer is full"""
+    history = UndoHistory(capacity=64)
+    for i in range(10000):
+        history.record_cell(i % 20, i % 25, " ", "7")
+    undone = 0
+    while history.undo() is not None:
+        undone += 1
+    assert undone == 64, f"Should keep the newest 64 edits, kept {undone}"
+    assert not history.record(np.zeros(65), np.zeros(65), np.zeros(65), np.zeros(65)), \
+        "An edit larger than the buffer cannot be kept"
+    assert not history.can_undo
+    print("✓ History stays within its capacity")
+
+
+if __name__ == "__main__":
+    test_undo_redo_cells()
+    test_group_stores_only_changed_cells()
+    test_memory_is_bounded()
+    print("\n✓ All undo history tests passed!")
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Test the .vtf file formats"""
+
+import io
+import json
+import os
+import tempfile
+
+import numpy as np
+
+import vtf_format
+
+
+def make_grid(rows, cols):
+    grid = vtf_format.new_grid(rows, cols)
+    grid[0, :5] = list("  23 ")
+    grid[1, :4] = list("+ 34")
+    grid[2, :4] = list("----")
+    grid[3, :4] = list("  57")
+    grid[rows - 1, cols - 1] = "^"
+    return grid
+
+
+def test_v2_round_trip():
+    """Binary files load back the same grid and cursor, with and without zlib"""
+    grid = make_grid(18, 25)
+    for compress in (True, False):
+        blob = vtf_format.encode_v2(grid, (3, 2), compress=compress)
+        loaded, cursor = vtf_format.decode(blob)
+        assert np.array_equal(loaded, grid), "Grid should round-trip"
+        assert cursor == (3, 2), "Cursor should round-trip"
+    print("✓ Version 2 round trip works")
+
+
+def test_v2_is_compact():
+    """A mostly empty grid stores a handful of runs"""
+    grid = vtf_format.new_grid(1000, 1000)
+    grid[500, 10:14] = list("1+1=")
+    blob = vtf_format.encode_v2(grid, (0, 0), compress=False)
+    assert len(blob) < 200, f"Sparse grid should be tiny, got {len(blob)} bytes"
+    assert np.array_equal(vtf_format.decode(blob)[0], grid)
+    print(f"✓ Sparse 1000x1000 grid stored in {len(blob)} bytes")
+
+
+def test_wide_characters():
+    """Characters outside Latin-1 are kept"""
+    grid = vtf_format.new_grid(2, 3)
+    grid[1, 2] = "√"
+    loaded, _ = vtf_format.decode(vtf_format.encode_v2(grid, (0, 0)))
+    assert loaded[1, 2] == "√"
+    print("✓ Wide characters round-trip")
+
+
+def test_v1_compatibility():
+    """Version 1 JSON files written by older releases still load"""
+    data = {
+        "version": 1,
+        "rows": 4,
+        "cols": 6,
+        "grid": ["  23", ["+", " ", "3", "4"], "------too long"],
+        "cursor": {"x": 5, "y": 3}
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "old.vtf")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        grid, cursor = vtf_format.read_vtf(path)
+
+        assert grid.shape == (4, 6)
+        assert vtf_format.grid_to_text_lines(grid) == ["  23", "+ 34", "------", ""]
+        assert cursor == (5, 3)
+
+        # Size given after the rows still loads
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"grid": data["grid"], "rows": 4, "cols": 6}, f)
+        assert vtf_format.read_vtf(path)[0].shape == (4, 6)
+
+        path_v2 = os.path.join(tmp, "new.vtf")
+        vtf_format.write_vtf(path_v2, grid, cursor)
+        assert np.array_equal(vtf_format.read_vtf(path_v2)[0], grid)
+    print("✓ Version 1 files load and re-save as version 2")
+
+
+def test_v1_streaming():
+    """Version 1 rows split across read chunks load intact, with progress reported"""
+    grid = make_grid(40, 30)
+    grid[7, 3] = "√"
+    blob = vtf_format.encode_v1(grid, (4, 9))
+    for chunk_size in (1, 7, 4096):
+        stream = io.BytesIO(blob)
+        fractions = []
+        loaded, cursor = vtf_format.read_v1_stream(stream, fractions.append, len(blob), chunk_size)
+        assert np.array_equal(loaded, grid), f"Grid should stream with {chunk_size}-byte chunks"
+        assert cursor == (4, 9)
+        assert fractions and fractions[-1] == 1.0, "Progress should reach the end of the file"
+    print("✓ Version 1 files stream in chunks")
+
+
+def test_bad_files():
+    """Garbage and truncated files raise VtfFormatError"""
+    grid = make_grid(5, 5)
+    blob = vtf_format.encode_v2(grid, (0, 0), compress=False)
+    json_blob = vtf_format.encode_v1(grid, (0, 0))
+    for bad in (b"not a grid", blob[:10], blob[:-3], json_blob[:-20]):
+        try:
+            vtf_format.decode(bad)
+        except vtf_format.VtfFormatError:
+            pass
+        else:
+            raise AssertionError(f"Should reject {bad[:12]!r}")
+        if bad[:len(vtf_format.MAGIC)] != vtf_format.MAGIC:
+            try:
+                vtf_format.read_v1_stream(io.BytesIO(bad))
+            except vtf_format.VtfFormatError:
+                continue
+            raise AssertionError(f"Streaming reader should reject {bad[:12]!r}")
+    print("✓ Bad files are rejected")
+
+
+if __name__ == "__main__":
+    test_v2_round_trip()
+    test_v2_is_compact()
+    test_wide_characters()
+    test_v1_compatibility()
+    test_v1_streaming()
+    test_bad_files()
+    print("\n✓ All .vtf format tests passed!")
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Test .vtw workbooks and page switching"""
+
+import os
+import tempfile
+
+import numpy as np
+
+import vtf_format
+from progress_store import ProgressStore
+from virtual_taylor_frame import VirtualTaylorFrame
+from workbook import Workbook, WorkbookError
+
+
+def page(text, rows=3, cols=8):
+    grid = vtf_format.new_grid(rows, cols)
+    grid[0, :len(text)] = list(text)
+    return grid
+
+
+def test_round_trip_and_lazy_open():
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "book.vtw")
+        workbook = Workbook.from_grid("Sums", page("1+1"), (2, 0))
+        workbook.add_page("Carry", page("19+3", rows=4), (0, 3))
+        workbook.add_page("Ünïcode ½", page("½"), (0, 0))
+        workbook.active = 1
+        workbook.save(path)
+
+        opened = Workbook.open(path)
+        assert opened.names == ["Sums", "Carry", "Ünïcode ½"] and opened.active == 1
+        assert opened.resident == [], "Opening decodes no page"
+        grid, cursor = opened.read(1)
+        assert grid.shape == (4, 8) and "".join(grid[0]).rstrip() == "19+3" and cursor == (0, 3)
+        assert opened.resident == ["Carry"]
+
+        with open(path, "wb") as f:
+            f.write(b"VTF\x00 not a workbook at all")
+        try:
+            Workbook.open(path)
+            assert False, "A .vtf file is not a workbook"
+        except WorkbookError:
+            pass
+    print("✓ Round trip and lazy open")
+
+
+def test_cache_and_edits():
+    """Only a few pages stay decoded; edited pages survive eviction and saves"""
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "book.vtw")
+        workbook = Workbook.from_grid("Page 1", page("p1"), (0, 0), cache_pages=2)
+        for n in range(2, 11):
+            workbook.add_page(f"Page {n}", page(f"p{n}"), (0, 0))
+        assert len(workbook.resident) == 2
+        workbook.save(path)
+
+        workbook = Workbook.open(path, cache_pages=2)
+        grid, cursor = workbook.read(4)
+        edited = grid.copy()
+        edited[1, 0] = "x"
+        workbook.write(4, edited, (0, 1))
+        for index in (0, 1, 2):
+            workbook.read(index)
+        assert "Page 5" not in workbook.resident
+        assert workbook.read(4)[0][1, 0] == "x", "Evicted edits are kept until saved"
+        same, cursor = workbook.read(2)
+        workbook.write(2, same.copy(), cursor)
+        assert not workbook.pages[2].changed, "Writing back an unchanged page changes nothing"
+
+        workbook.save(path)
+        assert not any(p.changed for p in workbook.pages)
+        reopened = Workbook.open(path)
+        assert reopened.read(4)[0][1, 0] == "x" and reopened.read(4)[1] == (0, 1)
+        assert "".join(reopened.read(9)[0][0]).rstrip() == "p10"
+    print("✓ Cache and edits")
+
+
+def test_many_pages_open_fast():
+    """Opening a 500-page workbook reads the table of contents and nothing else"""
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "big.vtw")
+        workbook = Workbook.from_grid("Page 1", page("first", rows=50, cols=50), (0, 0))
+        for n in range(2, 501):
+            workbook.add_page(f"Page {n}", page(f"page {n}", rows=50, cols=50), (0, 0))
+        workbook.save(path)
+        opened = Workbook.open(path)
+        assert len(opened) == 500 and opened.resident == []
+        assert "".join(opened.read(499)[0][0]).rstrip() == "page 500"
+    print("✓ 500-page workbook")
+
+
+def test_frame_pages():
+    speech = []
+    progress = ProgressStore(":memory:")
+    frame = VirtualTaylorFrame(3, 8, headless=True, progress=progress,
+                               output=lambda kind, value: kind == "speech" and speech.append(value))
+    frame.run_command("next_page")
+    assert speech[-1].startswith("There is only one page")
+    frame.model.paste(["12+3"])
+    frame.add_page("Lesson two")
+    assert speech[-1] == "Page 2 of 2, Lesson two" and frame.model.row_text(0).strip() == ""
+    frame.model.paste(["7*6"])
+    frame.run_command("previous_page")
+    assert speech[-1] == "Page 1 of 2, Page 1" and frame.model.row_text(0).rstrip() == "12+3"
+    frame.run_command("previous_page")
+    assert speech[-1] == "First page. Page 1 of 2, Page 1"
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "lessons")
+        frame._save_to_path(path)
+        assert speech[-1] == "Saved workbook, 2 pages." and os.path.exists(path + ".vtw")
+        frame.workbook = None
+        frame._load_from_path(path + ".vtw")
+        assert speech[-1] == "Loaded workbook, 2 pages. Page 1 of 2, Page 1"
+        frame.run_command("next_page")
+        assert frame.model.row_text(0).rstrip() == "7*6"
+        assert np.array_equal(frame.workbook.read(0)[0][0, :4], list("12+3"))
+    frame.io_worker.shutdown(wait=True)
+    progress.close()
+    print("✓ Frame pages")
+
+
+def test_frame_leaves_workbook():
+    """Loading a .vtf closes the workbook and a save waits for the one running"""
+    speech = []
+    progress = ProgressStore(":memory:")
+    frame = VirtualTaylorFrame(3, 8, headless=True, progress=progress,
+                               output=lambda kind, value: kind == "speech" and speech.append(value))
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "lessons.vtw")
+        frame.model.paste(["one"])
+        frame.add_page("two")
+        frame.model.paste(["two"])
+        frame._save_to_path(path)
+        single = os.path.join(folder, "single.vtf")
+        vtf_format.write_vtf(single, page("single"), (0, 0))
+
+        frame._load_from_path(single)
+        assert frame.workbook is None and frame.model.row_text(0).rstrip() == "single"
+        frame.run_command("previous_page")
+        assert speech[-1].startswith("There is only one page")
+        frame._save_to_path(os.path.join(folder, "single"))
+        opened = Workbook.open(path)
+        assert "".join(opened.read(1)[0][0]).rstrip() == "two", "The workbook's pages are untouched"
+
+        frame._load_from_path(path)
+        pending = []
+        frame.run_in_background = lambda work, done: pending.append((work, done))
+        frame._save_to_path(path)
+        frame.run_command("next_page")
+        frame.model.paste(["2"])
+        frame._save_to_path(path)
+        assert speech[-1] == "Still saving, try again in a moment." and len(pending) == 1
+        work, done = pending.pop()
+        future = frame.io_worker.submit(work)
+        done(future)
+        assert speech[-1] == "Saved workbook, 2 pages."
+        frame._save_to_path(path)
+        work, done = pending.pop()
+        done(frame.io_worker.submit(work))
+        opened = Workbook.open(path)
+        assert ["".join(opened.read(i)[0][0]).rstrip() for i in range(2)] == ["one", "2wo"]
+    frame.io_worker.shutdown(wait=True)
+    progress.close()
+    print("✓ Frame leaves the workbook alone")
+
+
+if __name__ == "__main__":
+    test_round_trip_and_lazy_open()
+    test_cache_and_edits()
+    test_many_pages_open_fast()
+    test_frame_pages()
+    test_frame_leaves_workbook()
+    print("\n✓ All workbook tests passed!")
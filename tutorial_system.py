@@ -36,6 +36,14 @@ class Tutorial:
     def get_progress(self):
         """Get progress as a tuple (current, total)"""
         return (self.current_challenge, len(self.challenges))
+        
+    def restart(self, from_challenge=0):
+        """Start the tutorial again, optionally resuming at a later challenge"""
+        self.current_challenge = from_challenge
+        self.score = 0
+        for challenge in self.challenges:
+            challenge.attempts = 0
+            challenge.hints_used = 0
 
 
 class Challenge:
@@ -47,18 +55,43 @@ class Challenge:
         self.hint = hint
         self.explanation = explanation
         self.attempts = 0
+        self.hints_used = 0
         self.max_attempts = 3
         
-    def check_answer(self, user_answer):
-        """Check if the user's answer is correct"""
-        self.attempts += 1
+    def matches(self, user_answer):
+        """Compare an answer without counting it as an attempt"""
         # Normalize the answer (remove spaces, handle different formats)
         normalized_user = str(user_answer).strip().replace(" ", "")
         normalized_correct = self.answer.replace(" ", "")
         return normalized_user == normalized_correct
         
+    def check_answer(self, user_answer):
+        """Check if the user's answer is correct"""
+        self.attempts += 1
+        return self.matches(user_answer)
+        
+    def find_in_rows(self, rows):
+        """Return the first row content matching the answer, or None.
+        
+        Does not count as an attempt, so it can be used for grading.
+        """
+        for row in rows:
+            row_content = row.strip()
+            if row_content and self.matches(row_content):
+                return row_content
+        return None
+        
+    def find_answer(self, rows):
+        """Scan rows of work for the answer, counting a single attempt.
+        
+        Returns the matching row content, or None if no row matches.
+        """
+        self.attempts += 1
+        return self.find_in_rows(rows)
+        
     def get_hint(self):
         """Get a hint for this challenge"""
+        self.hints_used += 1
         return self.hint if self.hint else "Think carefully about the problem."
         
     def needs_hint(self):
@@ -0,0 +1,100 @@
+# Undo/redo history for Virtual Taylor Frame
+# Cell changes are stored as packed (y, x, old, new) deltas in fixed-size
+# NumPy ring buffers, so memory stays bounded however long the session runs.
+# An edit that touches many cells, such as clearing the grid, is one group
+# holding only the cells that actually changed.
+
+from collections import deque
+
+import numpy as np
+
+
+DEFAULT_CAPACITY = 1 << 18  # deltas; 16 bytes each
+
+
+class UndoHistory:
+    """Bounded undo/redo stack of grouped cell deltas"""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.ys = np.zeros(capacity, dtype=np.uint32)
+        self.xs = np.zeros(capacity, dtype=np.uint32)
+        self.olds = np.zeros(capacity, dtype=np.uint32)
+        self.news = np.zeros(capacity, dtype=np.uint32)
+        # Each group is (start, end) in a running delta count; slot = index % capacity
+        self.groups = deque()
+        self.position = 0  # groups before this index are applied, the rest can be redone
+        self.head = 0
+
+    def clear(self):
+        self.groups.clear()
+        self.position = 0
+        self.head = 0
+
+    @property
+    def can_undo(self):
+        return self.position > 0
+
+    @property
+    def can_redo(self):
+        return self.position < len(self.groups)
+
+    def record(self, ys, xs, olds, news):
+        """Store one undoable edit; returns False if it is too large to keep"""
+        ys = np.atleast_1d(np.asarray(ys, dtype=np.uint32))
+        xs = np.atleast_1d(np.asarray(xs, dtype=np.uint32))
+        olds = np.atleast_1d(np.asarray(olds, dtype=np.uint32))
+        news = np.atleast_1d(np.asarray(news, dtype=np.uint32))
+        count = ys.size
+        if count == 0:
+            return True
+
+        # A new edit discards anything that could have been redone
+        while len(self.groups) > self.position:
+            self.groups.pop()
+        self.head = self.groups[-1][1] if self.groups else 0
+
+        if count > self.capacity:
+            self.clear()
+            return False
+        # Drop the oldest groups until the new one fits
+        while self.groups and self.head + count - self.groups[0][0] > self.capacity:
+            self.groups.popleft()
+            self.position -= 1
+
+        slots = np.arange(self.head, self.head + count) % self.capacity
+        self.ys[slots] = ys
+        self.xs[slots] = xs
+        self.olds[slots] = olds
+        self.news[slots] = news
+        self.groups.append((self.head, self.head + count))
+        self.head += count
+        self.position += 1
+        return True
+
+    def record_cell(self, y, x, old, new):
+        return self.record(y, x, ord(old) if old else 0, ord(new) if new else 0)
+
+    def _slots(self, group):
+        start, end = group
+        return np.arange(start, end) % self.capacity
+
+    def undo(self):
+        """Return (ys, xs, codes) to write to revert the last edit, or None"""
+        if not self.can_undo:
+            return None
+        self.position -= 1
+        slots = self._slots(self.groups[self.position])
+        return self.ys[slots], self.xs[slots], self.olds[slots]
+
+    def redo(self):
+        """Return (ys, xs, codes) to write to repeat the last undone edit, or None"""
+        if not self.can_redo:
+            return None
+        slots = self._slots(self.groups[self.position])
+        self.position += 1
+        return self.ys[slots], self.xs[slots], self.news[slots]
+
+    @property
+    def nbytes(self):
+        return self.ys.nbytes + self.xs.nbytes + self.olds.nbytes + self.news.nbytes
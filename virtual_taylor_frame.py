@@ -0,0 +1,1315 @@
+# Python
+import os
+import sys
+import pygame
+import pygame.mixer
+import traceback
+import time
+import getpass
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from screens import (ScreenManager, GridScreen, MainMenuScreen, ConfirmExitScreen,
+                     ConfirmScreen, TextInputScreen, FinishTutorialScreen)
+import vtf_format
+from edit_journal import EditJournal
+from workbook import Workbook, write_workbook
+from grid_model import GridModel
+import grid_model
+import keymap
+import speech
+from profiler import Profiler, write_chrome_trace
+
+LOAD_PROGRESS_BYTES = 2 * 1024 * 1024  # files at least this big announce load progress
+# Methods timed while profiling (F11) is on
+PROFILED_METHODS = [
+    "handle_event", "handle_grid_event", "speak", "play_sound", "draw", "move",
+    "snap_to_content", "read_content_stack", "speak_row", "move_to_next_content_row",
+    "speak_column", "move_to_next_content_column", "move_down_to_next_stack",
+    "input_value", "delete_value", "clear_grid", "evaluate_row",
+    "check_tutorial_answer", "undo", "redo", "service_background_tasks", "run_command",
+]
+
+# Arrow keys repeated by fast move (F4) while held, and the step each takes
+FAST_MOVE_KEYS = {
+    pygame.K_UP: (0, -1),
+    pygame.K_DOWN: (0, 1),
+    pygame.K_LEFT: (-1, 0),
+    pygame.K_RIGHT: (1, 0),
+}
+
+class VirtualTaylorFrame:
+    def __init__(self, rows, cols, headless=False, output=None, progress=None, student=None,
+                 speech_backend=None, file_access=True, speech_name="auto"):
+        # Headless frames have no window, mixer or screen reader; speech and
+        # sound cues are passed to output(kind, value) instead
+        self.headless = headless
+        # Without file access nothing the user types is used as a path, for
+        # sessions hosted on someone else's machine
+        self.file_access = file_access
+        self.output = output
+        # Grid contents, cursor and undo history live in the model; the frame
+        # presents its changes through the window, sounds and speech
+        self.model = GridModel(rows, cols)
+        self.model.subscribe(self._on_model_change)
+        self.cell_size = 30
+        self._sound_loader = None
+        if headless:
+            self.screen = None
+            self.font = None
+            self.empty_sound = "empty"
+            self.content_sound = "content"
+            self.move_sound = "move"
+        else:
+            # Only what the first menu needs is set up here; sound files are
+            # decoded on a helper thread while the screen reader starts. SDL
+            # subsystems are only initialised on this thread.
+            pygame.display.init()
+            pygame.font.init()
+            self.screen = pygame.display.set_mode((cols * self.cell_size, rows * self.cell_size))
+            pygame.display.set_caption("Virtual Taylor Frame")
+            self.font = pygame.font.Font(None, 36)
+            self.empty_sound = self.content_sound = self.move_sound = None
+            try:
+                pygame.mixer.init()
+            except pygame.error as e:
+                print(f"Error loading sounds: {e}")
+            else:
+                self._sound_loader = threading.Thread(target=self._load_sounds, name="vtf-sounds", daemon=True)
+                self._sound_loader.start()
+        # Started after the sound loader, so the two overlap
+        if speech_backend is None:
+            quiet = headless or output is not None
+            speech_backend = speech.NullBackend() if quiet else speech.create_backend_or_fallback(speech_name)
+        self.speech_backend = speech_backend
+        self.keymap = keymap.KeyMap() if headless else self._load_keymap()
+        self.copied = None  # block of cells from the last copy or cut
+        self._search = None
+        self.workbook = None  # set while a multi-page workbook is open
+        self._workbook_saving = False  # a save copies pages from the file it will replace
+        self.mirror = None  # MirrorPublisher while a teacher can follow along
+        self.auto_shift = False
+        self.smart_delete = False
+        self.fast_move = False
+        self.last_move_time = 0
+        # Held arrow keys come from key events, not the keyboard, so replays
+        # repeat the same moves; clock is replaced by the recorded time there
+        self.held_keys = set()
+        self.clock = time.monotonic
+        self.tutorial_mode = False
+        self.current_tutorial = None
+        self._tutorial_library = None
+        self.awaiting_tutorial_answer = False
+        self.challenge_started_at = 0
+        self.student = student or os.environ.get("VTF_STUDENT") or getpass.getuser()
+        self._progress = progress
+        # Disk work runs on one worker thread; its results are applied on the UI thread
+        self.io_worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vtf-io")
+        self._ui_callbacks = queue.Queue()
+        self.profiler = Profiler()
+        # Headless sessions are hosted many to a process and do not autosave
+        self.journal = None
+        self.restored_session = False
+        if not headless:
+            self.journal = EditJournal(self.user_data_path("autosave.vtf"))
+            recovered = self.journal.recover((self.rows, self.cols))
+            if recovered is not None:
+                self._apply_loaded_state(*recovered)
+                self.restored_session = True
+            else:
+                # Edits journaled before the first compaction need a snapshot to replay onto
+                self.snapshot_autosave()
+        self.screens = ScreenManager()
+        self.screens.push(GridScreen(self))
+
+
+    @property
+    def grid(self):
+        return self.model.grid
+
+    @property
+    def rows(self):
+        return self.model.rows
+
+    @property
+    def cols(self):
+        return self.model.cols
+
+    @property
+    def history(self):
+        return self.model.history
+
+    def _on_model_change(self, event, *args):
+        if event == grid_model.CELL_CHANGED:
+            if self.journal is not None:
+                self.journal.record_cell(*args)
+        elif event == grid_model.CELLS_CHANGED:
+            if self.journal is not None:
+                self.journal.record_cells(*args)
+        elif event == grid_model.GRID_CLEARED:
+            if self.journal is not None:
+                self.journal.record_clear()
+        elif event == grid_model.GRID_REPLACED:
+            self.resize_window()
+            self.snapshot_autosave()
+
+    @property
+    def tutorial_library(self):
+        """The tutorial catalog, built the first time it is needed"""
+        if self._tutorial_library is None:
+            from tutorial_system import TutorialLibrary
+            self._tutorial_library = TutorialLibrary()
+        return self._tutorial_library
+
+    @property
+    def progress(self):
+        """The progress store, opened the first time it is needed"""
+        if self._progress is None:
+            from progress_store import ProgressStore
+            self._progress = ProgressStore(self.user_data_path("progress.db"))
+        return self._progress
+
+    def _load_sounds(self):
+        try:
+            empty = pygame.mixer.Sound(self.resource_path("empty.wav"))
+            content = pygame.mixer.Sound(self.resource_path("content.wav"))
+            move = pygame.mixer.Sound(self.resource_path("move.wav"))
+        except Exception as e:
+            print(f"Error loading sounds: {e}")
+            return
+        self.empty_sound, self.content_sound, self.move_sound = empty, content, move
+
+    def resource_path(self, relative_path):
+        try:
+            base_path = sys._MEIPASS
+        except AttributeError:
+            base_path = os.path.abspath(".")
+        return os.path.join(base_path, relative_path)
+
+    def user_data_path(self, filename):
+        base_path = os.path.join(os.path.expanduser("~"), ".virtual_taylor_frame")
+        os.makedirs(base_path, exist_ok=True)
+        return os.path.join(base_path, filename)
+
+    def speak(self, text):
+        try:
+            if text in '()[]{}':
+                text = self.bracket_to_word(text)
+            elif text == '-':
+                text = "minus"
+            elif text == '^':
+                text = "power"
+            elif text=='*':
+                text = " times"
+            else:
+                text = str(text)
+            if self.mirror is not None:
+                self.mirror.speech(text)
+            if self.output is not None:
+                self.output("speech", text)
+            else:
+                self.speech_backend.speak(text)
+        except Exception as e:
+            print(f"Error in speak: {e}")
+
+    def bracket_to_word(self, bracket):
+        bracket_words = {
+            '(': 'left paren',
+            ')': 'right paren',
+            '[': 'left bracket',
+            ']': 'right bracket',
+            '{': 'left brace',
+            '}': 'right brace'
+        }
+        return bracket_words.get(bracket, bracket)
+
+    def play_sound(self, sound):
+        if self.headless:
+            if self.output is not None:
+                self.output("sound", sound)
+            return
+        if sound is None:  # still loading, or no audio device
+            return
+        try:
+            pygame.mixer.Sound.play(sound)
+        except Exception as e:
+            print(f"Error playing sound: {e}")
+
+    def move(self, dx, dy):
+        if self.model.move(dx, dy):
+            self.play_sound(self.move_sound)
+            self.play_cell_sound()
+            self.speak_cell_content()
+
+    def snap_to_content(self, dx, dy):
+        if self.model.snap(dx, dy):
+            self.play_cell_sound()
+            self.speak_content_stack()
+
+    def read_content_stack(self):
+        """The first group of filled cells in the cursor's row, as it is spoken"""
+        content = ''
+        for cell_content in self.model.first_run(self.model.cursor.y):
+            if cell_content in '()[]{}':
+                content += f" {self.bracket_to_word(cell_content)} "
+            elif cell_content == '-':
+                content += " minus "
+            elif cell_content == '^':
+                content += " power "
+            elif cell_content=='*':
+                content += " times"
+            else:
+                content += cell_content
+        return content.strip()
+
+    def speak_content_stack(self):
+        content = self.read_content_stack()
+        self.speak(content)
+
+    def set_cell(self, y, x, value):
+        """Change one cell; every edit to the grid goes through the model"""
+        self.model.set_cell(y, x, value)
+
+    def set_cells(self, ys, xs, codes, record=True):
+        """Change many cells at once from arrays of positions and character codes"""
+        self.model.set_cells(ys, xs, codes, record)
+
+    def undo(self):
+        self._announce_history_step(self.model.undo(), "Undo", "Nothing to undo")
+
+    def redo(self):
+        self._announce_history_step(self.model.redo(), "Redo", "Nothing to redo")
+
+    def _announce_history_step(self, step, label, empty_message):
+        if step is None:
+            self.speak(empty_message)
+            return
+        ys = step[0]
+        self.play_sound(self.move_sound)
+        if len(ys) == 1:
+            self.speak(label)
+            self.speak_cell_content()
+        else:
+            self.speak(f"{label}, {len(ys)} cells changed")
+
+    def input_value(self, value):
+        self.model.write_at_cursor(value)
+        self.play_cell_sound()
+        self.speak(value)
+        if self.auto_shift:
+            self.move(1, 0)
+
+    def delete_value(self):
+        if self.model.erase_at_cursor():
+            self.play_sound(self.empty_sound)
+            self.speak("Deleted")
+        elif self.smart_delete:
+            self.move(-1, 0)
+            if self.model.erase_at_cursor():
+                self.play_sound(self.empty_sound)
+                self.speak("Deleted")
+            else:
+                self.play_sound(self.empty_sound)
+                self.speak(",")
+        else:
+            self.play_sound(self.empty_sound)
+            self.speak(",")
+
+    def paste_clipboard(self):
+        """Ctrl+Shift+V: paste the clipboard text as a block at the cursor"""
+        text = self._clipboard_text()
+        if not text:
+            self.speak("Clipboard is empty")
+            return
+        self.paste_text(text)
+
+    def _clipboard_text(self):
+        if self.headless:
+            return ""
+        import pygame.scrap
+        try:
+            if not pygame.scrap.get_init():
+                pygame.scrap.init()
+            data = pygame.scrap.get(pygame.SCRAP_TEXT)
+        except pygame.error as e:
+            print(f"Clipboard error: {e}")
+            return ""
+        return data.decode("utf-8", errors="replace").rstrip("\x00") if data else ""
+
+    def paste_text(self, text):
+        """Write a block of text at the cursor as one edit with a single announcement"""
+        height, width, clipped = self.model.paste(grid_model.text_to_lines(text))
+        if not height:
+            self.speak("Nothing pasted" + (", no room at the cursor" if clipped else ""))
+            return
+        lines = "line" if height == 1 else "lines"
+        summary = f"Pasted {height} {lines}, {width} wide"
+        self._speak_edit(summary + (", cut to fit the grid" if clipped else ""))
+
+    def prompt_paste_file(self):
+        if self._files_unavailable():
+            return
+        self.prompt_text_input(
+            "Paste text file: ",
+            "Type the name of a text file to paste at the cursor, then press Enter. Escape cancels.",
+            self._paste_from_path
+        )
+
+    def _paste_from_path(self, user_path):
+        if not user_path:
+            return
+        path = user_path.strip().strip("\"")
+
+        def work():
+            with open(path, encoding="utf-8", errors="replace") as f:
+                return f.read()
+
+        def done(future):
+            if future.exception() is None:
+                self.paste_text(future.result())
+            else:
+                self.speak("Error reading file.")
+                print(f"Paste error: {future.exception()}")
+
+        self.run_in_background(work, done)
+
+    def toggle_selection(self):
+        """F7: start selecting at the cursor, or drop the selection"""
+        if self.model.anchor is None:
+            self.model.start_selection()
+            self.speak("Selection started")
+        else:
+            self.model.end_selection()
+            self.speak("Selection cleared")
+
+    def _selected_area(self):
+        """The selection, or the cell under the cursor without one"""
+        area = self.model.selection()
+        if area is None:
+            x, y = self.model.cursor
+            area = slice(y, y + 1), slice(x, x + 1)
+        return area
+
+    def _speak_edit(self, text):
+        """Announce an edit, adding when it was too large to keep for undo"""
+        self.speak(text if self.model.undoable else text + ", too large to undo")
+
+    @staticmethod
+    def _describe_size(rows, cols):
+        if rows == cols == 1:
+            return "1 cell"
+        return f"{rows} {'row' if rows == 1 else 'rows'} by {cols} {'column' if cols == 1 else 'columns'}"
+
+    def copy_selection(self, cut=False):
+        area = self._selected_area()
+        self.copied = self.model.copy_area(area)
+        if cut:
+            self.model.fill_area(area, ' ')
+            self.play_sound(self.empty_sound)
+        self.model.end_selection()
+        self._speak_edit(f"{'Cut' if cut else 'Copied'} {self._describe_size(*self.copied.shape)}")
+
+    def cut_selection(self):
+        self.copy_selection(cut=True)
+
+    def paste_selection(self):
+        """Ctrl+V: write the copied block with its corner at the cursor"""
+        if self.copied is None:
+            self.speak("Nothing copied")
+            return
+        rows, cols = self.model.put_block(self.model.cursor.y, self.model.cursor.x, self.copied)
+        clipped = (rows, cols) != self.copied.shape
+        self.play_sound(self.content_sound)
+        summary = f"Pasted {self._describe_size(rows, cols)}"
+        self._speak_edit(summary + (", cut to fit the grid" if clipped else ""))
+
+    def clear_selection(self):
+        """Delete: blank the selection, or the cell under the cursor"""
+        changed = self.model.fill_area(self._selected_area(), ' ')
+        self.model.end_selection()
+        self.play_sound(self.empty_sound)
+        self._speak_edit(f"Cleared {changed} {'cell' if changed == 1 else 'cells'}" if changed
+                         else "Nothing to clear")
+
+    def prompt_fill_selection(self):
+        if self.model.anchor is None:
+            self.speak("Nothing selected. Press F7 to start a selection.")
+            return
+        self.prompt_text_input(
+            "Fill with: ",
+            "Type the character to fill the selection with, then press Enter. Escape cancels.",
+            self._fill_selection
+        )
+
+    def _fill_selection(self, text):
+        area = self.model.selection()
+        if not text or area is None:
+            return
+        self.model.fill_area(area, text[0])
+        self.model.end_selection()
+        rows, cols = area
+        self.play_sound(self.content_sound)
+        size = self._describe_size(rows.stop - rows.start, cols.stop - cols.start)
+        self._speak_edit(f"Filled {size} with {text[0]}")
+
+    def insert_rows(self):
+        """Open blank rows at the cursor, one per selected row"""
+        rows, _ = self._selected_area()
+        count = rows.stop - rows.start
+        if self.model.insert_rows(rows.start, count):
+            self.model.end_selection()  # the selected cells have moved
+            self.play_sound(self.move_sound)
+            self._speak_edit(f"Inserted {count} {'row' if count == 1 else 'rows'}")
+        else:
+            self.speak("No room to insert, the bottom of the grid has content")
+
+    def delete_rows(self):
+        rows, _ = self._selected_area()
+        count = rows.stop - rows.start
+        self.model.delete_rows(rows.start, count)
+        self.model.end_selection()
+        self.play_sound(self.empty_sound)
+        self._speak_edit(f"Deleted {count} {'row' if count == 1 else 'rows'}")
+
+    def insert_columns(self):
+        """Open blank columns at the cursor, one per selected column"""
+        _, cols = self._selected_area()
+        count = cols.stop - cols.start
+        if self.model.insert_columns(cols.start, count):
+            self.model.end_selection()  # the selected cells have moved
+            self.play_sound(self.move_sound)
+            self._speak_edit(f"Inserted {count} {'column' if count == 1 else 'columns'}")
+        else:
+            self.speak("No room to insert, the right edge of the grid has content")
+
+    def delete_columns(self):
+        _, cols = self._selected_area()
+        count = cols.stop - cols.start
+        self.model.delete_columns(cols.start, count)
+        self.model.end_selection()
+        self.play_sound(self.empty_sound)
+        self._speak_edit(f"Deleted {count} {'column' if count == 1 else 'columns'}")
+
+    @property
+    def search(self):
+        """Find over the grid, set up the first time it is needed"""
+        if self._search is None:
+            from grid_search import GridSearch
+            self._search = GridSearch(self.model)
+        return self._search
+
+    def start_find(self):
+        """Ctrl+F: search as you type; Enter stays at the match, Escape goes back"""
+        origin = tuple(self.model.cursor)
+        self.screens.push(TextInputScreen(
+            self,
+            "Find: ",
+            "Find. Type to search, Enter to stay at the match, Escape to go back. "
+            "Start with a slash for a pattern.",
+            lambda text: self.speak("Find closed."),
+            allow_empty=True,
+            cancel_speech="Find canceled.",
+            on_change=lambda text: self._find_as_you_type(text, origin),
+            on_cancel=lambda: self.model.move_to(*origin)
+        ))
+
+    def _find_as_you_type(self, text, origin):
+        if not text:
+            self.model.move_to(*origin)
+            return
+        self._find_and_announce(text, *origin, direction=1, include_start=True)
+
+    def find_next(self):
+        self._find_again(1)
+
+    def find_previous(self):
+        self._find_again(-1)
+
+    def _find_again(self, direction):
+        if not self.search.query:
+            self.speak("Nothing to find. Press Ctrl+F to search.")
+            return
+        x, y = self.model.cursor
+        self._find_and_announce(None, x, y, direction)
+
+    def _find_and_announce(self, query, x, y, direction, include_start=False):
+        from grid_search import FindError
+        try:
+            if query is not None:
+                self.search.set_query(query)
+        except FindError as e:
+            self.speak(str(e))
+            return
+        found = self.search.find(x, y, direction, include_start)
+        if found is None:
+            self.play_sound(self.empty_sound)
+            self.speak("Not found")
+            return
+        x, y, text, wrapped = found
+        self.model.move_to(x, y)
+        self.play_sound(self.content_sound)
+        row = " ".join(self.model.row_text(y).split())
+        self.speak(f"{'Wrapped. ' if wrapped else ''}{text}, row {y + 1}, column {x + 1}: {row}")
+
+    def clear_grid(self):
+        self.model.clear()
+        self.play_sound(self.empty_sound)
+        self._speak_edit("Grid cleared")
+
+    def play_cell_sound(self):
+        if self.model.cell_at_cursor() == ' ':
+            self.play_sound(self.empty_sound)
+        else:
+            self.play_sound(self.content_sound)
+
+    def speak_cell_content(self):
+        content = self.model.cell_at_cursor()
+        if content == ' ':
+            self.speak(",")
+        else:
+            self.speak(content)
+
+    def speak_row(self, row_index):
+        if 0 <= row_index < self.rows:
+            # Normalize spaces: split by whitespace and join with single space
+            cleaned_content = " ".join(self.model.row_text(row_index).split())
+            if not cleaned_content:
+                self.speak("Blank")
+            else:
+                self.speak(cleaned_content)
+        else:
+            self.speak("No row")
+
+    def speak_current_row(self):
+        self.speak_row(self.model.cursor.y)
+
+    def move_to_next_content_row(self, direction):
+        # direction: -1 for Up (Previous), 1 for Down (Next)
+        y = self.model.move_to_next_content_row(direction)
+        if y is None:
+            self.speak("No more content")
+            return
+        self.play_sound(self.move_sound)
+        self.speak_row(y)
+
+    def speak_column(self, column_index):
+        """Read a column top to bottom, one cell at a time, saying "blank" for gaps"""
+        if not 0 <= column_index < self.cols:
+            self.speak("No column")
+            return
+        runs = self.model.column_text(column_index).split()
+        if not runs:
+            self.speak("Blank")
+        else:
+            self.speak(" blank ".join(" ".join(run) for run in runs))
+
+    def speak_current_column(self):
+        self.speak_column(self.model.cursor.x)
+
+    def move_to_next_content_column(self, direction):
+        # direction: -1 for Left (Previous), 1 for Right (Next)
+        x = self.model.move_to_next_content_column(direction)
+        if x is None:
+            self.speak("No more content")
+            return
+        self.play_sound(self.move_sound)
+        self.speak_column(x)
+
+    def evaluate_or_check_answer(self):
+        """Ctrl+Enter: check a tutorial answer, otherwise evaluate the row"""
+        if self.tutorial_mode and self.awaiting_tutorial_answer:
+            self.check_tutorial_answer()
+        else:
+            self.evaluate_row()
+
+    def evaluate_row(self):
+        outcome, result = self.model.evaluate_row(self.model.cursor.y)
+        if outcome == grid_model.EVAL_WRITTEN:
+            self.speak(f"equals {result}")
+            self.play_sound(self.content_sound)
+        elif outcome == grid_model.EVAL_NO_SPACE:
+            self.speak(f"Result is {result}, but no space to write it correctly.")
+        elif outcome == grid_model.EVAL_INVALID:
+            self.speak("Error: Invalid characters in expression")
+        else:
+            self.speak("Error evaluating expression")
+            print(f"Eval error: {result}")
+
+    def move_to_edge(self, dx, dy):
+        self.model.move_to_edge(dx, dy)
+        self.play_sound(self.move_sound)
+        self.speak_cell_content()
+
+    def move_down_to_next_stack(self):
+        self.model.move_to_next_stack()
+        self.play_sound(self.move_sound)
+        self.speak_cell_content()
+
+    def toggle_auto_shift(self):
+        self.auto_shift = not self.auto_shift
+        self.speak("Auto shift " + ("on" if self.auto_shift else "off"))
+
+    def toggle_smart_delete(self):
+        self.smart_delete = not self.smart_delete
+        self.speak("Smart delete " + ("on" if self.smart_delete else "off"))
+
+    def toggle_fast_move(self):
+        self.fast_move = not self.fast_move
+        self.speak("Fast move " + ("on" if self.fast_move else "off"))
+
+    def show_help(self):
+        help_text = """
+        F1: Show this help message.
+        F2: Toggle auto-shift cursor.
+        F3: Toggle smart delete.
+        F4: Toggle fast move.
+        F5: Resize grid.
+        F6: Get hint (Tutorial Mode only).
+        F11: Start or stop profiling.
+        F12: Memory report.
+        Ctrl + S: Save (writes .vtf and .txt, or all pages of a .vtw workbook).
+        Ctrl + O: Load (.vtf or .vtw workbook).
+        Alt + Page Up / Alt + Page Down: Previous / next workbook page.
+        Alt + Insert: Add a workbook page.
+        Ctrl + E: Export text (.txt).
+        Ctrl + Shift + V: Paste text at the cursor.
+        Ctrl + Shift + I: Paste a text file at the cursor.
+        F7: Start or clear a selection.
+        Ctrl + C / Ctrl + X / Ctrl + V: Copy, cut and paste the selection.
+        Ctrl + Shift + F: Fill the selection with a character.
+        Delete: Clear the selection or the current cell.
+        Ctrl + Insert / Ctrl + Delete: Insert or delete rows.
+        Ctrl + Shift + Insert / Ctrl + Shift + Delete: Insert or delete columns.
+        Ctrl + F: Find; start with a slash for a pattern.
+        Ctrl + G / Ctrl + Shift + G: Find next / previous.
+        Ctrl + Z: Undo.
+        Ctrl + Y: Redo.
+        Arrow keys: Move cursor.
+        Alt + Arrows (Up/Down): Read previous/next content line.
+        Alt + L: Read current line.
+        Alt + C: Read current column.
+        Alt + Arrows (Left/Right): Read previous/next content column.
+        Ctrl + Enter: Evaluate math expression or check tutorial answer.
+        Enter: Move to next stack (same as Shift + Down).
+        Ctrl + Arrow keys: Snap to content.
+        Shift + Down: Move to next stack.
+        Home/End: Move to start/end of row.
+        Ctrl + Home/End: Move to start/end of grid.
+        Ctrl + PageUp/PageDown: Move to top/bottom of column.
+        Backspace: Delete content.
+        Ctrl + Backspace: Clear entire grid.
+        Escape: Exit program (with confirmation).
+        """
+        self.speak(help_text)
+
+    def resize_window(self):
+        if not self.headless:
+            self.screen = pygame.display.set_mode((self.cols * self.cell_size, self.rows * self.cell_size))
+
+    def pause(self, milliseconds):
+        """Let speech finish before moving on; headless frames never block"""
+        if not self.headless:
+            pygame.time.wait(milliseconds)
+
+    def handle_event(self, event):
+        """Send an event to the active screen"""
+        if event.type == pygame.KEYDOWN and event.key in FAST_MOVE_KEYS:
+            self.held_keys.add(event.key)
+        elif event.type == pygame.KEYUP:
+            self.held_keys.discard(event.key)
+        elif event.type == pygame.WINDOWFOCUSLOST:
+            self.held_keys.clear()
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F11:
+            self.toggle_profiling()
+            return
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F12:
+            self.show_memory_report()
+            return
+        screen = self.screens.top
+        if screen is not None:
+            screen.handle_event(event)
+
+    def show_memory_report(self):
+        """Speak a memory summary and save the full report"""
+        import memory_report
+        report = memory_report.memory_report(self)
+        self.speak(memory_report.spoken_summary(report))
+        if not self.file_access:
+            return
+        path = self.user_data_path("memory-report.txt")
+
+        def work():
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(memory_report.format_report(report))
+
+        def done(future):
+            if future.exception() is not None:
+                print(f"Memory report error: {future.exception()}")
+
+        self.run_in_background(work, done)
+
+    def toggle_profiling(self):
+        """Start a capture, or stop it and save a Chrome trace"""
+        if not self.profiler.enabled:
+            self.profiler.start(self, PROFILED_METHODS)
+            self.speak("Profiling on")
+            return
+        self.profiler.stop()
+        if not self.file_access:
+            self.speak("Profiling off")
+            return
+        spans = self.profiler.spans()
+        thread_id = self.profiler.thread_id
+        path = self.user_data_path(time.strftime("trace-%Y%m%d-%H%M%S.json"))
+
+        def done(future):
+            if future.exception() is None:
+                self.speak(f"Profiling off. {len(spans[1])} spans saved to {os.path.basename(path)}")
+            else:
+                self.speak("Profiling off. Error saving trace.")
+                print(f"Trace error: {future.exception()}")
+
+        self.run_in_background(lambda: write_chrome_trace(path, spans, thread_id), done)
+
+    def quit(self):
+        """Close every screen so the event loop in run() ends"""
+        self.screens.clear()
+
+    def prompt_text_input(self, prompt_text, spoken_prompt, on_submit, allow_empty=False):
+        """Open a text prompt; on_submit receives the stripped input on Enter"""
+        self.screens.push(TextInputScreen(self, prompt_text, spoken_prompt, on_submit, allow_empty=allow_empty))
+
+    def _derive_save_paths(self, user_path):
+        path = user_path.strip().strip("\"")
+        base, ext = os.path.splitext(path)
+        if ext.lower() in [".vtf", ".txt"]:
+            base_path = base
+        else:
+            base_path = path
+        return base_path + ".vtf", base_path + ".txt"
+
+    def _grid_to_text_lines(self):
+        return self.model.text_lines()
+
+    def save_state(self):
+        if self._files_unavailable():
+            return
+        self.prompt_text_input(
+            "Save base filename (no extension): ",
+            "Type a filename to save, then press Enter. Escape cancels.",
+            self._save_to_path
+        )
+
+    def _files_unavailable(self):
+        """True, after saying so, when this frame may not read or write files"""
+        if self.file_access:
+            return False
+        self.speak("Files are not available in this session.")
+        return True
+
+    def run_in_background(self, work, on_done):
+        """Run work() on the I/O worker and call on_done(future) on the UI thread"""
+        future = self.io_worker.submit(work)
+        if self.headless:
+            # Hosted sessions have no UI loop to hand the result back to
+            wait([future])
+            on_done(future)
+            return
+        future.add_done_callback(lambda f: self._ui_callbacks.put(lambda: on_done(f)))
+
+    def service_background_tasks(self):
+        """Apply finished background work and compact the autosave journal"""
+        while True:
+            try:
+                callback = self._ui_callbacks.get_nowait()
+            except queue.Empty:
+                break
+            callback()
+        if self.mirror is not None:
+            self.mirror.flush()
+        if self.journal is not None and self.journal.needs_compaction():
+            self.snapshot_autosave()
+
+    def start_mirror(self, host="127.0.0.1", port=None):
+        """Publish grid changes, cursor moves and speech for mirror.py viewers"""
+        from mirror import DEFAULT_PORT, MirrorPublisher
+        self.mirror = MirrorPublisher(self.model, host, DEFAULT_PORT if port is None else port)
+        return self.mirror.address
+
+    def stop_mirror(self):
+        if self.mirror is not None:
+            self.mirror.close()
+            self.mirror = None
+
+    def snapshot_autosave(self):
+        if self.journal is not None:
+            self.journal.snapshot(self.grid, tuple(self.model.cursor))
+
+    def _save_to_path(self, user_path):
+        if not user_path:
+            return
+        path = user_path.strip().strip("\"")
+        ext = os.path.splitext(path)[1].lower()
+        if ext == ".vtw" or (self.workbook is not None and not ext):
+            self._save_workbook(path if ext else path + ".vtw")
+            return
+        vtf_path, txt_path = self._derive_save_paths(user_path)
+        grid = self.grid.copy()
+        cursor = tuple(self.model.cursor)
+        lines = self._grid_to_text_lines()
+
+        def work():
+            vtf_format.write_vtf(vtf_path, grid, cursor)
+            with open(txt_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines))
+
+        def done(future):
+            if future.exception() is None:
+                self.speak("Saved.")
+            else:
+                self.speak("Error saving file.")
+                print(f"Save error: {future.exception()}")
+
+        self.run_in_background(work, done)
+
+    def _save_workbook(self, path):
+        """Save every page; the current grid becomes a one-page workbook if none is open"""
+        if self._workbook_saving:
+            # The running save still has to move its file over the one this one would read
+            self.speak("Still saving, try again in a moment.")
+            return
+        if self.workbook is None:
+            self.workbook = Workbook.from_grid("Page 1", self.grid.copy(), tuple(self.model.cursor))
+        else:
+            self._store_page()
+        workbook = self.workbook
+        entries = workbook.snapshot()
+        source_path, active = workbook.path, workbook.active
+        temp_path = path + ".tmp"
+
+        def done(future):
+            self._workbook_saving = False
+            if future.exception() is None:
+                workbook.saved(path, temp_path, future.result(), entries)
+                self.speak(f"Saved workbook, {len(entries)} pages.")
+            else:
+                self.speak("Error saving file.")
+                print(f"Save error: {future.exception()}")
+
+        self._workbook_saving = True
+        self.run_in_background(lambda: write_workbook(temp_path, entries, source_path, active), done)
+
+    def export_text(self):
+        if self._files_unavailable():
+            return
+        self.prompt_text_input(
+            "Export filename (.txt): ",
+            "Type a text filename to export, then press Enter. Escape cancels.",
+            self._export_to_path
+        )
+
+    def _export_to_path(self, user_path):
+        if not user_path:
+            return
+        base, ext = os.path.splitext(user_path.strip().strip("\""))
+        txt_path = user_path if ext else base + ".txt"
+        lines = self._grid_to_text_lines()
+
+        def work():
+            with open(txt_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines))
+
+        def done(future):
+            if future.exception() is None:
+                self.speak("Exported.")
+            else:
+                self.speak("Error exporting file.")
+                print(f"Export error: {future.exception()}")
+
+        self.run_in_background(work, done)
+
+    def load_state(self):
+        if self._files_unavailable():
+            return
+        self.prompt_text_input(
+            "Load filename (.vtf or .vtw): ",
+            "Type a filename to load, then press Enter. Escape cancels.",
+            self._load_from_path
+        )
+
+    def _load_from_path(self, user_path):
+        if not user_path:
+            return
+        base, ext = os.path.splitext(user_path.strip().strip("\""))
+        if ext.lower() == ".vtw":
+            self._open_workbook(base + ext)
+            return
+        vtf_path = user_path if ext else base + ".vtf"
+        if ext and ext.lower() != ".vtf":
+            self.speak("Please load a .vtf or .vtw file.")
+            return
+
+        def done(future):
+            if future.exception() is None:
+                self._apply_loaded_state(*future.result())
+                self.speak("Loaded.")
+            else:
+                self.speak("Error loading file.")
+                print(f"Load error: {future.exception()}")
+
+        progress = None
+        try:
+            large = os.path.getsize(vtf_path) >= LOAD_PROGRESS_BYTES
+        except OSError:
+            large = False
+        if large and not self.headless:
+            self.speak("Loading large file.")
+            announced = [0]
+
+            def progress(fraction):
+                # Called on the worker; speech is handed back to the UI thread
+                percent = int(fraction * 4) * 25
+                if announced[0] < percent < 100:
+                    announced[0] = percent
+                    self._ui_callbacks.put(lambda: self.speak(f"{percent} percent loaded"))
+
+        self.run_in_background(lambda: vtf_format.read_vtf(vtf_path, progress), done)
+
+    def _apply_loaded_state(self, grid, cursor):
+        """Show a single grid; an open workbook is closed so its pages are left alone"""
+        self.workbook = None
+        self.model.load(grid, cursor)
+
+    def _open_workbook(self, path):
+        def work():
+            # Only the table of contents and the page to show are read
+            workbook = Workbook.open(path)
+            return workbook, workbook.read(workbook.active)
+
+        def done(future):
+            if future.exception() is None:
+                self.workbook, (grid, cursor) = future.result()
+                self.model.load(grid.copy(), cursor)
+                self.speak(f"Loaded workbook, {len(self.workbook)} pages. {self._describe_page()}")
+            else:
+                self.speak("Error loading file.")
+                print(f"Load error: {future.exception()}")
+
+        self.run_in_background(work, done)
+
+    def _describe_page(self):
+        workbook = self.workbook
+        return f"Page {workbook.active + 1} of {len(workbook)}, {workbook.pages[workbook.active].name}"
+
+    def _store_page(self):
+        """Hand the grid back to the workbook before another page is shown"""
+        self.workbook.write(self.workbook.active, self.grid.copy(), tuple(self.model.cursor))
+
+    def _show_page(self, index):
+        self._store_page()
+        grid, cursor = self.workbook.read(index)
+        self.workbook.active = index
+        self.model.load(grid.copy(), cursor)
+        self.play_sound(self.move_sound)
+        self.speak(self._describe_page())
+
+    def switch_page(self, direction):
+        if self.workbook is None:
+            self.speak("There is only one page. Press Alt + Insert to add a page.")
+            return
+        index = self.workbook.active + direction
+        if not 0 <= index < len(self.workbook):
+            self.play_sound(self.empty_sound)
+            self.speak(("First page. " if direction < 0 else "Last page. ") + self._describe_page())
+            return
+        self._show_page(index)
+
+    def prompt_new_page(self):
+        self.prompt_text_input(
+            "New page name: ",
+            "Type a name for the new page, then press Enter. Leave it empty for a numbered page. Escape cancels.",
+            self.add_page,
+            allow_empty=True
+        )
+
+    def add_page(self, name=""):
+        """Add a blank page of the current size after this one and show it"""
+        if self.workbook is None:
+            self.workbook = Workbook.from_grid("Page 1", self.grid.copy(), tuple(self.model.cursor))
+        name = name or f"Page {len(self.workbook) + 1}"
+        index = self.workbook.add_page(name, vtf_format.new_grid(self.rows, self.cols), (0, 0),
+                                       self.workbook.active + 1)
+        self._show_page(index)
+
+    def prompt_grid_resize(self):
+        self.screens.push(TextInputScreen(
+            self,
+            "Enter new grid size (rows,cols): ",
+            "Type in the values to resize and hit enter. Press Escape to cancel.",
+            self._resize_from_input,
+            cancel_speech="Resizing canceled, returning to main window.",
+            on_empty=lambda: self.speak("Returning to main window.")
+        ))
+
+    def _resize_from_input(self, input_str):
+        try:
+            parts = input_str.split(",")
+            if len(parts) == 2:
+                new_rows = int(parts[0].strip())
+                new_cols = int(parts[1].strip())
+                if new_rows < 1 or new_cols < 1:
+                    raise ValueError("Grid size must be positive")
+                lost = self.model.cells_outside(new_rows, new_cols)
+                if lost:
+                    self.screens.push(ConfirmScreen(
+                        self,
+                        f"Resizing to {new_rows} by {new_cols} removes {lost} filled "
+                        f"{'cell' if lost == 1 else 'cells'}. Resize anyway?",
+                        lambda: self.resize_grid(new_rows, new_cols),
+                        cancel_speech="Grid size not changed."
+                    ))
+                else:
+                    self.resize_grid(new_rows, new_cols)
+            else:
+                self.speak("Invalid input. Grid size not changed.")
+        except Exception as e:
+            self.speak("Invalid input. Grid size not changed.")
+
+    def resize_grid(self, rows, cols):
+        """Change the grid size, keeping the content that fits"""
+        self.model.resize(rows, cols)
+        self.speak(f"Grid resized to {rows} by {cols}")
+
+    def confirm_exit(self):
+        self.screens.push(ConfirmExitScreen(self))
+
+    def show_main_menu(self):
+        """Show main menu to choose between Normal and Tutorial mode"""
+        self.screens.push(MainMenuScreen(self))
+
+    def start_tutorial(self):
+        """Start the selected tutorial"""
+        self.workbook = None  # tutorial work is not a page of the open workbook
+        self.clear_grid()
+        self.model.move_to(0, 0)
+        self.awaiting_tutorial_answer = False
+        
+        resume_at = self.progress.resume_point(self.student, self.current_tutorial.title)
+        self.current_tutorial.restart(resume_at)
+        if resume_at:
+            self.speak(f"Resuming tutorial: {self.current_tutorial.title} at challenge {resume_at + 1}.")
+        else:
+            self.speak(f"Starting tutorial: {self.current_tutorial.title}. {self.current_tutorial.description}")
+        self.pause(1000)
+        self.present_next_challenge()
+        
+    def present_next_challenge(self):
+        """Present the next challenge in the tutorial"""
+        challenge = self.current_tutorial.get_current_challenge()
+        if challenge:
+            self.clear_grid()
+            self.model.move_to(0, 0)
+            
+            current, total = self.current_tutorial.get_progress()
+            self.speak(f"Challenge {current + 1} of {total}. {challenge.question}")
+            self.awaiting_tutorial_answer = True
+            self.challenge_started_at = time.monotonic()
+        else:
+            self.finish_tutorial()
+            
+    def check_tutorial_answer(self):
+        """Check the user's answer for the current challenge"""
+        if not self.awaiting_tutorial_answer:
+            return
+            
+        challenge = self.current_tutorial.get_current_challenge()
+        if not challenge:
+            return
+            
+        # Scan the entire grid for the answer
+        # Students may work through problems step-by-step across multiple rows
+        if not self.model.row_filled().any():
+            self.speak("Please enter your answer and press Ctrl+Enter to check.")
+            return
+            
+        if not challenge.find_answer(self.model.text_lines()):
+            self.play_sound(self.empty_sound)
+            if challenge.needs_hint():
+                self.speak("Not quite. Here's a hint: " + challenge.get_hint())
+            else:
+                self.speak("Not quite. Try again!")
+            return
+            
+        # Answer found and is correct
+        elapsed = time.monotonic() - self.challenge_started_at
+        self.play_sound(self.content_sound)
+        self.speak("Correct! " + (challenge.explanation if challenge.explanation else "Well done!"))
+        self.pause(2000)
+        
+        tutorial = self.current_tutorial
+        current, total = tutorial.get_progress()
+        self.progress.record_result(
+            self.student, tutorial.title, current, challenge.attempts, challenge.hints_used, elapsed
+        )
+        self.progress.set_progress(self.student, tutorial.title, current + 1, total)
+        
+        tutorial.next_challenge()
+        self.awaiting_tutorial_answer = False
+        
+        if not self.current_tutorial.is_complete():
+            self.present_next_challenge()
+        else:
+            self.finish_tutorial()
+                
+    def offer_hint(self):
+        """Offer a hint for the current challenge"""
+        if not (self.tutorial_mode and self.awaiting_tutorial_answer):
+            return
+            
+        challenge = self.current_tutorial.get_current_challenge()
+        if challenge:
+            hint = challenge.get_hint()
+            self.speak("Hint: " + hint)
+            
+    def finish_tutorial(self):
+        """Finish the current tutorial"""
+        self.tutorial_mode = False
+        self.awaiting_tutorial_answer = False
+        self.screens.push(FinishTutorialScreen(self))
+
+    def draw(self):
+
+        self.screen.fill((255, 255, 255))
+        selection = self.model.selection()
+        if selection is not None:
+            ys, xs = selection
+            size = self.cell_size
+            self.screen.fill((200, 220, 255), pygame.Rect(xs.start * size, ys.start * size,
+                                                          (xs.stop - xs.start) * size,
+                                                          (ys.stop - ys.start) * size))
+        grid = self.model.grid
+        rows, cols = grid.shape
+        size = self.cell_size
+        for y in range(rows):
+            for x in range(cols):
+                rect = pygame.Rect(x * size, y * size, size, size)
+                pygame.draw.rect(self.screen, (0, 0, 0), rect, 1)
+                if grid[y][x] != ' ':
+                    text = self.font.render(str(grid[y][x]), True, (0, 0, 0))
+                    text_rect = text.get_rect(center=rect.center)
+                    self.screen.blit(text, text_rect)
+        cursor = self.model.cursor
+        current_rect = pygame.Rect(cursor.x * self.cell_size, cursor.y * self.cell_size,
+                                   self.cell_size, self.cell_size)
+        pygame.draw.rect(self.screen, (255, 0, 0), current_rect, 3)
+
+    def handle_grid_event(self, event):
+        if event.type == pygame.QUIT:
+            self.confirm_exit()
+        elif event.type == pygame.KEYDOWN:
+            mask = keymap.modifier_mask(event.mod)
+            command = self.keymap.lookup(event.key, mask)
+            if command is not None:
+                self.run_command(command)
+            elif keymap.is_text_input(event, mask):
+                self.input_value(event.unicode)
+
+    def run_command(self, name):
+        """Run a keymap command by name"""
+        try:
+            method, args = keymap.COMMANDS[name]
+        except KeyError:
+            raise keymap.KeymapError(f"Unknown command {name!r}") from None
+        getattr(self, method)(*args)
+
+    def _load_keymap(self):
+        try:
+            return keymap.KeyMap.load(self.user_data_path("keymap.json"))
+        except (OSError, ValueError) as e:
+            print(f"Keymap error, using the default keys: {e}")
+            return keymap.KeyMap()
+
+    def update_fast_move(self):
+        if self.fast_move and self.held_keys:
+            current_time = self.clock()
+            if current_time - self.last_move_time > 0.1: # 100ms delay
+                for key, (dx, dy) in FAST_MOVE_KEYS.items():
+                    if key in self.held_keys:
+                        self.move(dx, dy)
+                self.last_move_time = current_time
+
+    def run(self, record_path=None):
+        """Single dispatch loop: the top screen handles events, updates and draws
+
+        With record_path, every key and quit event is also written to a
+        recording that session_recorder.py can replay.
+        """
+        recorder = None
+        if record_path:
+            from session_recorder import SessionRecorder
+            recorder = SessionRecorder(record_path, self.grid,
+                                       tuple(self.model.cursor),
+                                       main_menu=isinstance(self.screens.top, MainMenuScreen))
+        profiler = self.profiler
+        while self.screens.top is not None:
+            try:
+                with profiler.span("frame"):
+                    with profiler.span("events"):
+                        for event in pygame.event.get():
+                            if recorder is not None:
+                                recorder.record(event)
+                            self.handle_event(event)
+                    with profiler.span("background"):
+                        self.service_background_tasks()
+
+                    screen = self.screens.top
+                    if screen is not None:
+                        with profiler.span("update"):
+                            screen.update()
+                        with profiler.span("draw"):
+                            screen.draw()
+                        with profiler.span("flip"):
+                            pygame.display.flip()
+            except Exception as e:
+                print(f"An error occurred: {e}")
+                print(traceback.format_exc())
+                break
+
+        if recorder is not None:
+            recorder.close()
+        self.stop_mirror()
+        if self.profiler.enabled:
+            self.toggle_profiling()
+        self.io_worker.shutdown(wait=True)
+        self.service_background_tasks()
+        self.snapshot_autosave()
+        if self.journal is not None:
+            self.journal.close()
+        if self._progress is not None:
+            self._progress.close()
+        self.speech_backend.close()
+        if self._sound_loader is not None:
+            self._sound_loader.join()
+        pygame.quit()
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Virtual Taylor Frame")
+    parser.add_argument("--record", metavar="PATH", help="record keystrokes for session_recorder.py")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="track allocations for the F12 memory report")
+    parser.add_argument("--speech", choices=speech.BACKEND_NAMES, default="auto",
+                        help="speech output: cytolk, a speech program such as espeak, or none")
+    parser.add_argument("--mirror", metavar="PORT", type=int,
+                        help="let a teacher follow the grid with mirror.py")
+    parser.add_argument("--mirror-host", default="127.0.0.1",
+                        help="address to accept mirror viewers on, e.g. 0.0.0.0 for the local network")
+    args = parser.parse_args()
+    if args.trace_memory:
+        import tracemalloc
+        tracemalloc.start()
+    frame = VirtualTaylorFrame(18, 25, speech_name=args.speech)
+    if args.mirror is not None:
+        frame.start_mirror(args.mirror_host, args.mirror)
+    frame.show_main_menu()
+    frame.run(record_path=args.record)
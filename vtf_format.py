@@ -0,0 +1,292 @@
+# .vtf file format for Virtual Taylor Frame
+#
+# Version 1 is JSON: {"version": 1, "rows", "cols", "grid": [row strings],
+# "cursor": {"x", "y"}}. Version 2 is a binary container:
+#
+#   header  "<4sHHIIIII": magic, version, flags, rows, cols, cursor x,
+#           cursor y, number of runs
+#   payload run lengths (uint32 x runs) followed by run values
+#           (uint8 x runs, or uint32 x runs with FLAG_WIDE), zlib-compressed
+#           when FLAG_ZLIB is set
+#
+# The grid is run-length encoded row-major, so a row of spaces costs one run.
+# All conversions between rows, runs and the grid array are bulk NumPy
+# operations. Readers accept both versions; version 1 files are parsed in
+# chunks straight into the grid, so the whole document is never held twice.
+
+import codecs
+import json
+import os
+import re
+import struct
+import zlib
+
+import numpy as np
+
+
+MAGIC = b"VTF\x00"
+VERSION = 2
+FLAG_ZLIB = 1
+FLAG_WIDE = 2
+HEADER = struct.Struct("<4sHHIIIII")
+STREAM_CHUNK = 1 << 20  # characters of JSON decoded at a time
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class VtfFormatError(ValueError):
+    """Raised when a file is not a readable .vtf file"""
+
+
+def new_grid(rows, cols):
+    """An empty grid of single-character cells"""
+    return np.full((rows, cols), ' ', dtype='<U1')
+
+
+def grid_to_row_strings(grid):
+    """Each grid row as one string, converted in a single NumPy view"""
+    rows, cols = grid.shape
+    if cols == 0:
+        return [""] * rows
+    return np.ascontiguousarray(grid, dtype='<U1').view(f'<U{cols}').ravel().tolist()
+
+
+def grid_to_text_lines(grid):
+    """Each grid row as a string with trailing spaces removed"""
+    return [row.rstrip() for row in grid_to_row_strings(grid)]
+
+
+def lines_to_grid(lines, rows, cols):
+    """Build a rows x cols grid from row strings in one bulk conversion"""
+    padded = []
+    for row in lines[:rows]:
+        row_str = "".join(row) if isinstance(row, list) else str(row)
+        padded.append(row_str[:cols].ljust(cols))
+    text = "".join(padded).ljust(rows * cols)
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    return codes.view('<U1').reshape(rows, cols).copy()
+
+
+def clamp_cursor(cursor, rows, cols):
+    """Return the cursor if it lies on the grid, otherwise the origin"""
+    x, y = cursor
+    if 0 <= x < cols and 0 <= y < rows:
+        return x, y
+    return 0, 0
+
+
+def encode_v1(grid, cursor):
+    rows, cols = grid.shape
+    data = {
+        "version": 1,
+        "rows": rows,
+        "cols": cols,
+        "grid": grid_to_text_lines(grid),
+        "cursor": {"x": int(cursor[0]), "y": int(cursor[1])}
+    }
+    return json.dumps(data, ensure_ascii=True, indent=2).encode("utf-8")
+
+
+def decode_v1(data):
+    """Grid and cursor from a parsed version 1 JSON document"""
+    lines = data.get("grid", [])
+    rows = int(data.get("rows", len(lines)))
+    cols = int(data.get("cols", max((len(row) for row in lines), default=0)))
+    grid = lines_to_grid(lines, rows, cols)
+    return grid, _v1_cursor(data, rows, cols)
+
+
+def _v1_cursor(data, rows, cols):
+    cursor = data.get("cursor", {})
+    return clamp_cursor((int(cursor.get("x", 0)), int(cursor.get("y", 0))), rows, cols)
+
+
+class _JsonStream:
+    """Just enough of an incremental JSON reader to walk a version 1 document"""
+
+    def __init__(self, f, progress=None, total=0, chunk_size=STREAM_CHUNK):
+        self.f = f
+        self.progress = progress
+        self.total = total
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.json = json.JSONDecoder()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+        self.bytes_read = 0
+
+    def fill(self):
+        """Append the next chunk, dropping consumed text; False at end of file"""
+        if self.eof:
+            return False
+        # Grow the read when a single value spans chunks, so it is not rescanned forever
+        data = self.f.read(max(self.chunk_size, len(self.text) - self.pos))
+        self.bytes_read += len(data)
+        try:
+            text = self.decoder.decode(data, final=not data)
+        except UnicodeDecodeError as e:
+            raise VtfFormatError(f"Not a .vtf file: {e}")
+        self.eof = not data
+        self.text = self.text[self.pos:] + text
+        self.pos = 0
+        if self.progress and self.total:
+            self.progress(min(1.0, self.bytes_read / self.total))
+        return True
+
+    def peek(self):
+        """The next character after whitespace, or "" at end of file"""
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise VtfFormatError(f"Not a .vtf file: expected {char!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.json.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError as e:
+                if self.fill():
+                    continue
+                raise VtfFormatError(f"Not a .vtf file: {e}")
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.text) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def _stream_rows(stream, grid):
+    """Write each row of a JSON grid array into grid as it is parsed"""
+    rows, cols = grid.shape
+    codes = grid.view(np.uint32)
+    stream.expect("[")
+    y = 0
+    while stream.peek() != "]":
+        if y:
+            stream.expect(",")
+        row = stream.value()
+        if y < rows:
+            row_str = "".join(row) if isinstance(row, list) else str(row)
+            row_codes = np.frombuffer(row_str[:cols].encode("utf-32-le"), dtype=np.uint32)
+            codes[y, :row_codes.size] = row_codes
+        y += 1
+    stream.pos += 1
+
+
+def read_v1_stream(f, progress=None, total=0, chunk_size=STREAM_CHUNK):
+    """Grid and cursor from a version 1 file object, parsed chunk by chunk
+
+    progress(fraction) is called after every chunk when total (the file
+    size in bytes) is known. Peak memory is about one grid plus one chunk.
+    """
+    stream = _JsonStream(f, progress, total, chunk_size)
+    stream.expect("{")
+    fields = {}
+    grid = None
+    first = True
+    while stream.peek() != "}":
+        if not first:
+            stream.expect(",")
+        first = False
+        key = stream.value()
+        stream.expect(":")
+        if key == "grid" and "rows" in fields and "cols" in fields:
+            grid = new_grid(int(fields["rows"]), int(fields["cols"]))
+            _stream_rows(stream, grid)
+        else:
+            fields[key] = stream.value()
+    if grid is None:
+        # No size before the rows: fall back to reading the whole list
+        try:
+            return decode_v1(fields)
+        except (TypeError, ValueError, AttributeError) as e:
+            raise VtfFormatError(f"Not a .vtf file: {e}")
+    rows, cols = grid.shape
+    return grid, _v1_cursor(fields, rows, cols)
+
+
+def encode_v2(grid, cursor, compress=True):
+    rows, cols = grid.shape
+    flat = np.ascontiguousarray(grid, dtype='<U1').reshape(-1).view(np.uint32)
+    if flat.size:
+        starts = np.concatenate(([0], np.flatnonzero(flat[1:] != flat[:-1]) + 1))
+        lengths = np.diff(np.append(starts, flat.size)).astype('<u4')
+        values = flat[starts]
+    else:
+        lengths = np.zeros(0, dtype='<u4')
+        values = np.zeros(0, dtype=np.uint32)
+
+    flags = 0
+    if values.size and values.max() > 0xFF:
+        flags |= FLAG_WIDE
+        values = values.astype('<u4')
+    else:
+        values = values.astype(np.uint8)
+    payload = lengths.tobytes() + values.tobytes()
+    if compress:
+        flags |= FLAG_ZLIB
+        payload = zlib.compress(payload)
+    header = HEADER.pack(MAGIC, VERSION, flags, rows, cols, int(cursor[0]), int(cursor[1]), lengths.size)
+    return header + payload
+
+
+def decode_v2(blob):
+    if len(blob) < HEADER.size:
+        raise VtfFormatError("Truncated .vtf header")
+    magic, version, flags, rows, cols, cx, cy, runs = HEADER.unpack_from(blob)
+    if magic != MAGIC or version != VERSION:
+        raise VtfFormatError(f"Unsupported .vtf version {version}")
+    payload = blob[HEADER.size:]
+    if flags & FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+
+    value_type = np.dtype('<u4') if flags & FLAG_WIDE else np.dtype(np.uint8)
+    if len(payload) != runs * (4 + value_type.itemsize):
+        raise VtfFormatError("Corrupt .vtf payload")
+    lengths = np.frombuffer(payload, dtype='<u4', count=runs)
+    values = np.frombuffer(payload, dtype=value_type, count=runs, offset=runs * 4)
+    if int(lengths.sum(dtype=np.int64)) != rows * cols:
+        raise VtfFormatError("Corrupt .vtf payload")
+
+    codes = np.repeat(values.astype(np.uint32), lengths)
+    grid = codes.view('<U1').reshape(rows, cols)
+    return grid, clamp_cursor((cx, cy), rows, cols)
+
+
+def decode(blob):
+    """Grid and cursor from the bytes of a version 1 or version 2 file"""
+    if blob[:len(MAGIC)] == MAGIC:
+        return decode_v2(blob)
+    try:
+        data = json.loads(blob.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise VtfFormatError(f"Not a .vtf file: {e}")
+    return decode_v1(data)
+
+
+def read_vtf(path, progress=None):
+    """Load (grid, (cursor_x, cursor_y)) from a .vtf file of any version
+
+    progress(fraction) is called while a version 1 file is read.
+    """
+    with open(path, "rb") as f:
+        head = f.read(len(MAGIC))
+        if head == MAGIC:
+            return decode_v2(head + f.read())
+        f.seek(0)
+        return read_v1_stream(f, progress, os.fstat(f.fileno()).st_size)
+
+
+def write_vtf(path, grid, cursor, compress=True):
+    """Save a grid and cursor as a version 2 .vtf file"""
+    with open(path, "wb") as f:
+        f.write(encode_v2(grid, cursor, compress))
@@ -0,0 +1,221 @@
+# Workbooks for Virtual Taylor Frame
+#
+# A .vtw file holds many named pages, each one a version 2 .vtf blob:
+#
+#   header  "<4sHHIIQ": magic, version, flags, number of pages, active page,
+#           offset of the table of contents
+#   pages   .vtf version 2 blobs, back to back
+#   toc     per page "<QIH" offset, length, name length, then the UTF-8 name
+#
+# Opening a workbook reads only the header and the table of contents. Pages
+# are decoded when they are first shown and kept in a small LRU; pages that
+# fall out of it are read again from the file, or, if they were edited, kept
+# as encoded blobs until the next save. Saving copies unchanged pages from
+# the old file byte for byte into a new file, which then replaces the old one.
+
+import os
+import struct
+from collections import OrderedDict
+
+import numpy as np
+
+import vtf_format
+
+
+MAGIC = b"VTW\x00"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIQ")
+TOC_ENTRY = struct.Struct("<QIH")
+CACHE_PAGES = 4  # decoded pages kept in memory, the active one included
+
+
+class WorkbookError(ValueError):
+    """Raised when a file is not a readable .vtw file"""
+
+
+class Page:
+    """One named page; its content lives in the file, in blob, or in the cache"""
+    __slots__ = ("name", "offset", "length", "blob", "version", "saved_version")
+
+    def __init__(self, name, offset=0, length=0):
+        self.name = name
+        self.offset = offset  # where the page is in the workbook's file
+        self.length = length
+        self.blob = None  # encoded page not yet saved to the file
+        self.version = 0  # bumped on every change
+        self.saved_version = 0
+
+    @property
+    def changed(self):
+        return self.version != self.saved_version
+
+
+class Workbook:
+    """Named pages loaded on demand, with the most recently used kept decoded"""
+
+    def __init__(self, path=None, pages=(), active=0, cache_pages=CACHE_PAGES):
+        self.path = path
+        self.pages = list(pages)
+        self.active = active
+        self.cache_pages = max(1, cache_pages)
+        self._cache = OrderedDict()  # Page -> (grid, cursor)
+
+    def __len__(self):
+        return len(self.pages)
+
+    @property
+    def names(self):
+        return [page.name for page in self.pages]
+
+    @property
+    def nbytes(self):
+        """Bytes held by decoded pages and by edited pages waiting to be saved"""
+        decoded = sum(grid.nbytes for grid, _cursor in self._cache.values())
+        return decoded + sum(len(page.blob) for page in self.pages if page.blob is not None)
+
+    @property
+    def resident(self):
+        """Names of the pages currently decoded in memory"""
+        return [page.name for page in self._cache]
+
+    @classmethod
+    def open(cls, path, cache_pages=CACHE_PAGES):
+        """Read the table of contents of a .vtw file; no page is decoded"""
+        with open(path, "rb") as f:
+            head = f.read(HEADER.size)
+            if len(head) < HEADER.size:
+                raise WorkbookError("Truncated .vtw header")
+            magic, version, _flags, count, active, toc_offset = HEADER.unpack(head)
+            if magic != MAGIC or version != VERSION:
+                raise WorkbookError(f"Not a version {VERSION} .vtw file")
+            f.seek(toc_offset)
+            toc = f.read()
+        pages = []
+        pos = 0
+        try:
+            for _ in range(count):
+                offset, length, name_length = TOC_ENTRY.unpack_from(toc, pos)
+                pos += TOC_ENTRY.size
+                name = toc[pos:pos + name_length].decode("utf-8")
+                pos += name_length
+                pages.append(Page(name, offset, length))
+        except (struct.error, UnicodeDecodeError) as e:
+            raise WorkbookError(f"Corrupt .vtw table of contents: {e}") from None
+        if not pages:
+            raise WorkbookError("The workbook has no pages")
+        return cls(path, pages, min(active, count - 1), cache_pages)
+
+    @classmethod
+    def from_grid(cls, name, grid, cursor, cache_pages=CACHE_PAGES):
+        """A new one-page workbook, e.g. to start one from the current grid"""
+        workbook = cls(cache_pages=cache_pages)
+        workbook.add_page(name, grid, cursor)
+        return workbook
+
+    def read(self, index):
+        """(grid, cursor) of a page. The grid is the cached copy, so callers
+        that edit it should work on a copy and hand it back with write()."""
+        page = self.pages[index]
+        if page in self._cache:
+            self._cache.move_to_end(page)
+            return self._cache[page]
+        if page.blob is not None:
+            grid, cursor = vtf_format.decode_v2(page.blob)
+        else:
+            with open(self.path, "rb") as f:
+                f.seek(page.offset)
+                grid, cursor = vtf_format.decode_v2(f.read(page.length))
+        self._cache[page] = (grid, cursor)
+        self._evict()
+        return grid, cursor
+
+    def write(self, index, grid, cursor):
+        """Store a page's new content; nothing is marked changed if it is the same"""
+        page = self.pages[index]
+        cursor = (int(cursor[0]), int(cursor[1]))
+        cached = self._cache.get(page)
+        if cached is not None and cached[1] == cursor and np.array_equal(cached[0], grid):
+            self._cache.move_to_end(page)
+            return
+        page.blob = None
+        page.version += 1
+        self._cache[page] = (grid, cursor)
+        self._cache.move_to_end(page)
+        self._evict()
+
+    def add_page(self, name, grid, cursor, index=None):
+        """Insert a page (at the end by default) and return its index"""
+        index = len(self.pages) if index is None else index
+        page = Page(name)
+        page.saved_version = -1
+        self.pages.insert(index, page)
+        self._cache[page] = (grid, (int(cursor[0]), int(cursor[1])))
+        self._evict()
+        if index <= self.active and len(self.pages) > 1:
+            self.active += 1
+        return index
+
+    def _evict(self):
+        while len(self._cache) > self.cache_pages:
+            page, (grid, cursor) = self._cache.popitem(last=False)
+            if page.changed and page.blob is None:
+                page.blob = vtf_format.encode_v2(grid, cursor)
+
+    def snapshot(self):
+        """What save needs, taken on the caller's thread so the workbook can
+        keep changing while the file is written: (page, name, version, blob
+        or None, offset, length) per page. Changed pages are encoded here."""
+        entries = []
+        for page in self.pages:
+            blob = page.blob
+            if blob is None and page.changed:
+                blob = vtf_format.encode_v2(*self._cache[page])
+            entries.append((page, page.name, page.version, blob, page.offset, page.length))
+        return entries
+
+    def save(self, path):
+        """Write the workbook to path and make it the file pages load from"""
+        entries = self.snapshot()
+        temp_path = path + ".tmp"
+        toc = write_workbook(temp_path, entries, self.path, self.active)
+        self.saved(path, temp_path, toc, entries)
+
+    def saved(self, path, temp_path, toc, entries):
+        """Move a file written by write_workbook into place and load pages
+        from it. Pages changed since the snapshot stay changed."""
+        os.replace(temp_path, path)
+        self.path = path
+        for (page, _name, version, *_rest), (offset, length) in zip(entries, toc):
+            page.offset, page.length = offset, length
+            if page.version == version:
+                page.saved_version = version
+                page.blob = None
+
+
+def write_workbook(path, entries, source_path=None, active=0):
+    """Write pages from Workbook.snapshot() and return their (offset, length).
+
+    Unchanged pages are copied from source_path, so path should not be the
+    source itself; Workbook.saved() moves the new file over it.
+    """
+    toc = []
+    source = open(source_path, "rb") if any(entry[3] is None for entry in entries) else None
+    try:
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, 0, len(entries), active, 0))
+            for _page, _name, _version, blob, offset, length in entries:
+                if blob is None:
+                    source.seek(offset)
+                    blob = source.read(length)
+                toc.append((f.tell(), len(blob)))
+                f.write(blob)
+            toc_offset = f.tell()
+            for (_page, name, *_rest), (offset, length) in zip(entries, toc):
+                encoded = name.encode("utf-8")
+                f.write(TOC_ENTRY.pack(offset, length, len(encoded)) + encoded)
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, VERSION, 0, len(entries), active, toc_offset))
+    finally:
+        if source is not None:
+            source.close()
+    return toc